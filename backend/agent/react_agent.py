@@ -1,17 +1,27 @@
+import asyncio
 import logging
 import re
 
-from typing import List
+from typing import Any, AsyncIterator, List, Optional, Set
 
-from langchain.agents import AgentType, initialize_agent
+from langchain.agents import AgentExecutor
+from langchain.chains import LLMChain
 from langchain.llms.base import BaseLLM
 from langchain.prompts import PromptTemplate
 from langchain.tools import Tool
+from langchain_core.agents import AgentAction
+from langchain_core.callbacks import AsyncCallbackHandler, BaseCallbackHandler
+
+from app.core.config import get_settings
 
 # Import LLMStudioClient model
 from app.services.llm.llm_studio_client import LLMStudioClient
 from app.services.redis_service import RedisService  # For interacting with Redis
 
+from .streaming import AgentEvent, AgentEventStream
+from .token_budget import BudgetedZeroShotAgent, TokenUsageHandler, get_token_stats
+from .tool_memo import get_tool_memo, request_scope
+
 # Import tools
 from .tools.search import SearchTool  # Tool for RAG search
 from .tools.video_processor import youtube_to_docx  # Tool for converting video to DOCX
@@ -20,10 +30,43 @@ from .tools.video_processor import youtube_to_docx  # Tool for converting video
 logger = logging.getLogger("agent.react_agent")
 logger.setLevel(logging.DEBUG)
 
+# Maximum number of terms searched by one RAGMultiSearch call
+MAX_SEARCH_TERMS = 8
+
+# Tools whose observations depend only on the question and the knowledge base
+SEARCH_TOOLS = frozenset({"RAGSearch", "RAGMultiSearch"})
+
+SINGLE_SEARCH_INSTRUCTIONS = """If you decide to use the RAGSearch tool, supply only one definition or concept at a time as the input to the tool.
+For each term, find relevant information in the knowledge base."""
+
+MULTI_SEARCH_INSTRUCTIONS = """If the question involves several terms or concepts, call the RAGMultiSearch tool once with all of them, separated by semicolons (for example: gradient descent; Fourier transform), instead of calling RAGSearch for each term.
+Use RAGSearch for a single term or for a follow-up search."""
+
+
+def parse_search_terms(text: str) -> List[str]:
+    """Split a RAGMultiSearch input into unique terms."""
+    terms = []
+    for term in re.split(r"[;\n]", text):
+        term = term.strip().strip("\"'").strip()
+        if term and term not in terms:
+            terms.append(term)
+    return terms[:MAX_SEARCH_TERMS]
+
+
+class ToolCallRecorder(AsyncCallbackHandler):
+    """Record the names of the tools called during an agent run."""
+
+    def __init__(self):
+        self.tools: Set[str] = set()
+
+    async def on_agent_action(self, action: AgentAction, **kwargs: Any) -> None:
+        self.tools.add(action.tool)
+
 
 class ReactAgent:
-    def __init__(self, llm: BaseLLM = None):
+    def __init__(self, llm: BaseLLM = None, multi_search: bool = True):
         self.llm = llm or LLMStudioClient()
+        self.multi_search = multi_search
         self.tools = self._initialize_tools()
         self.prompt = self._create_prompt()
         self.agent = self._initialize_agent()
@@ -58,8 +101,25 @@ class ReactAgent:
             ),
         )
 
-        logger.debug(f"Tools initialized: {search_tool.name}, {youtube_tool.name}")
-        return [search_tool, youtube_tool]
+        tools = [search_tool, youtube_tool]
+
+        # Define the multi-term search tool
+        if self.multi_search:
+            multi_search_tool = Tool(
+                name="RAGMultiSearch",
+                func=None,
+                coroutine=self._multi_search_tool_func,
+                description=(
+                    "Useful for obtaining information from the knowledge base on several terms at once. "
+                    "Use this tool when the user's question involves more than one term or concept. "
+                    "The input should be the terms separated by semicolons. "
+                    "This tool searches all terms concurrently and returns the results labelled by term."
+                ),
+            )
+            tools.insert(1, multi_search_tool)
+
+        logger.debug(f"Tools initialized: {', '.join(tool.name for tool in tools)}")
+        return tools
 
     def _create_prompt(self) -> PromptTemplate:
         """Create the prompt template for the agent."""
@@ -83,8 +143,7 @@ Model Parameters:
 {model_parameters}
 
 When searching the knowledge base, extract key terms or concepts from the user's question.
-If you decide to use the RAGSearch tool, supply only one definition or concept at a time as the input to the tool.
-For each term, find relevant information in the knowledge base.
+{search_instructions}
 If the information retrieved does not help answer the user's question, do not use it.
 
 If the user asks you to explain something, provide a clear and understandable explanation.
@@ -107,7 +166,7 @@ Thought: I now know the final answer.
 
 Final Answer: the final answer to the original question.
 
-If the user asked for definitions, format each definition as: "{term} - {definition}".
+If the user asked for definitions, format each definition as: "{{term}} - {{definition}}".
 
 As a reminder, all your reasoning and actions should be in English, but the final answer should be in Russian.
 
@@ -128,46 +187,101 @@ Question: {input}
                 "tools": tool_descriptions,
                 "tool_names": ", ".join([tool.name for tool in self.tools]),
                 "model_parameters": model_parameters,
+                "search_instructions": (
+                    MULTI_SEARCH_INSTRUCTIONS
+                    if self.multi_search
+                    else SINGLE_SEARCH_INSTRUCTIONS
+                ),
             },
         )
         logger.debug("Prompt template created.")
         return prompt
 
-    def _initialize_agent(self):
+    def _initialize_agent(self) -> AgentExecutor:
         """Initialize the agent executor."""
         logger.debug("Initializing the agent executor.")
-        agent = initialize_agent(
+        settings = get_settings()
+        # Observations are kept within a token budget; the prompt prefix is static
+        agent = BudgetedZeroShotAgent(
+            llm_chain=LLMChain(llm=self.llm, prompt=self.prompt),
+            allowed_tools=[tool.name for tool in self.tools],
+            max_observation_tokens=settings.AGENT_OBSERVATION_TOKEN_LIMIT,
+            max_scratchpad_tokens=settings.AGENT_SCRATCHPAD_TOKEN_BUDGET,
+        )
+        executor = AgentExecutor.from_agent_and_tools(
+            agent=agent,
             tools=self.tools,
-            llm=self.llm,
-            agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
-            prompt=self.prompt,
             handle_parsing_errors=True,
             verbose=True,
             max_iterations=5,
         )
         logger.debug("Agent executor initialized.")
-        return agent
+        return executor
 
     async def _search_tool_func(self, query: str) -> str:
         """Asynchronous function to obtain information from RAG."""
         logger.debug(f"Search tool called with query: {query}")
         try:
-            results = SearchTool.search(query)
-            # Format the results for each term
-            if results:
-                # Assuming results is a list of definitions
-                formatted_results = "\n".join(
-                    [f"{query} - {result}" for result in results]
-                )
-                logger.debug(f"Search tool retrieved results: {formatted_results}")
-                return formatted_results
-            else:
-                logger.debug(f"No information found on {query} in the knowledge base.")
-                return f"No information found on {query} in the knowledge base."
+            return await get_tool_memo().call(
+                "RAGSearch", query, lambda: self._rag_search(query), shared=True
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"RAGSearch timed out for query: {query}")
+            return (
+                f"RAGSearch timed out for {query}. Answer without it or try once more."
+            )
         except Exception as e:
             logger.exception("Error in RAGSearch tool.")
             return f"Error in RAGSearch: {str(e)}"
 
+    async def _rag_search(self, query: str) -> str:
+        """Search the knowledge base and format the observation."""
+        results = await SearchTool.asearch(query)
+        # Format the results for each term
+        if results:
+            # Assuming results is a list of definitions
+            formatted_results = "\n".join([f"{query} - {result}" for result in results])
+            logger.debug(f"Search tool retrieved results: {formatted_results}")
+            return formatted_results
+        else:
+            logger.debug(f"No information found on {query} in the knowledge base.")
+            return f"No information found on {query} in the knowledge base."
+
+    async def _multi_search_tool_func(self, query: str) -> str:
+        """Asynchronous function to obtain information on several terms from RAG."""
+        logger.debug(f"Multi-search tool called with query: {query}")
+        terms = parse_search_terms(query)
+        if not terms:
+            return "No search terms provided. Separate the terms with semicolons."
+        try:
+            return await get_tool_memo().call(
+                "RAGMultiSearch",
+                "; ".join(terms),
+                lambda: self._rag_multi_search(terms),
+                shared=True,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"RAGMultiSearch timed out for terms: {terms}")
+            return f"RAGMultiSearch timed out for {'; '.join(terms)}. Answer without it or try once more."
+        except Exception as e:
+            logger.exception("Error in RAGMultiSearch tool.")
+            return f"Error in RAGMultiSearch: {str(e)}"
+
+    async def _rag_multi_search(self, terms: List[str]) -> str:
+        """Search the knowledge base for several terms and format the observation."""
+        results = await SearchTool.asearch_many(terms)
+        observations = []
+        for term in terms:
+            if results.get(term):
+                observations.extend(f"{term} - {result}" for result in results[term])
+            else:
+                observations.append(
+                    f"No information found on {term} in the knowledge base."
+                )
+        formatted_results = "\n".join(observations)
+        logger.debug(f"Multi-search tool retrieved results: {formatted_results}")
+        return formatted_results
+
     async def _youtube_to_docx_tool_func(self, url: str) -> str:
         """Asynchronous function to generate a DOCX document from a YouTube video."""
         logger.debug(f"YouTubeToDocx tool called with URL: {url}")
@@ -182,37 +296,107 @@ Question: {input}
             logger.exception("Error in YouTubeToDocx tool.")
             return f"Error in YouTubeToDocx: {str(e)}"
 
-    async def ainvoke(self, input_question: str) -> str:
-        """Asynchronous agent invocation."""
-        logger.debug(f"Agent ainvoke called with input: {input_question}")
-        try:
-            response = await self.agent.ainvoke(input_question)
-            logger.debug(f"Agent ainvoke completed with response: {response}")
-            # Process agent's response
-            if isinstance(response, dict):
-                # Assume the final answer is in the 'output' key
-                final_answer = response.get("output", "No final answer provided.")
-                logger.debug(f"Extracted Final Answer from dict response: {final_answer}")
+    @staticmethod
+    def _extract_final_answer(response) -> str:
+        """Extract the final answer from the agent executor's response."""
+        if isinstance(response, dict):
+            # Assume the final answer is in the 'output' key
+            final_answer = response.get("output", "No final answer provided.")
+            logger.debug(f"Extracted Final Answer from dict response: {final_answer}")
+            return final_answer
+        elif isinstance(response, str):
+            # Attempt to extract 'Final Answer' from string
+            match = re.search(r"Final Answer:\s*(.*)", response, re.IGNORECASE)
+            if match:
+                final_answer = match.group(1).strip()
+                logger.debug(
+                    f"Extracted Final Answer from string response: {final_answer}"
+                )
                 return final_answer
-            elif isinstance(response, str):
-                # Attempt to extract 'Final Answer' from string
-                match = re.search(r"Final Answer:\s*(.*)", response, re.IGNORECASE)
-                if match:
-                    final_answer = match.group(1).strip()
-                    logger.debug(
-                        f"Extracted Final Answer from string response: {final_answer}"
-                    )
-                    return final_answer
-                else:
-                    logger.debug(
-                        "Final Answer not found in string response. Returning full response."
-                    )
-                    return response
             else:
                 logger.debug(
-                    f"Unexpected response type: {type(response)}. Returning string representation."
+                    "Final Answer not found in string response. Returning full response."
+                )
+                return response
+        else:
+            logger.debug(
+                f"Unexpected response type: {type(response)}. Returning string representation."
+            )
+            return str(response)
+
+    @staticmethod
+    def _record_usage(usage: TokenUsageHandler):
+        """Report the token counts of a finished agent run."""
+        get_token_stats().record_request(usage)
+        logger.info(
+            f"Agent run made {usage.llm_calls} LLM calls with "
+            f"{usage.prompt_tokens} prompt and {usage.completion_tokens} "
+            f"completion tokens."
+        )
+
+    async def ainvoke(
+        self,
+        input_question: str,
+        callbacks: Optional[List[BaseCallbackHandler]] = None,
+    ) -> str:
+        """Asynchronous agent invocation, with optional extra callback handlers."""
+        logger.debug(f"Agent ainvoke called with input: {input_question}")
+        try:
+            usage = TokenUsageHandler()
+            # Repeated tool calls within the run reuse their first observation
+            with request_scope():
+                response = await self.agent.ainvoke(
+                    input_question, config={"callbacks": [usage, *(callbacks or [])]}
                 )
-                return str(response)
+            self._record_usage(usage)
+            logger.debug(f"Agent ainvoke completed with response: {response}")
+            # Process agent's response
+            return self._extract_final_answer(response)
         except Exception as e:
             logger.exception("Agent ainvoke failed.")
             raise e
+
+    async def astream(self, input_question: str) -> AsyncIterator[AgentEvent]:
+        """
+        Run the agent and yield its events as they happen: "thought" and "token"
+        chunks of LLM output, "action" and "observation" for tool calls, and a
+        closing "final" (or "error") event with the whole answer.
+
+        Closing the iterator early, e.g. when the client disconnects, cancels the
+        agent run, including the pending LLM request.
+        """
+        logger.debug(f"Agent astream called with input: {input_question}")
+        stream = AgentEventStream()
+        usage = TokenUsageHandler()
+
+        async def run():
+            try:
+                with request_scope():
+                    response = await self.agent.ainvoke(
+                        input_question, config={"callbacks": [stream, usage]}
+                    )
+                self._record_usage(usage)
+                stream.finish(
+                    "final",
+                    {
+                        "response": self._extract_final_answer(response),
+                        "usage": usage.as_dict(),
+                    },
+                )
+            except Exception as e:
+                logger.exception("Agent astream failed.")
+                stream.finish("error", {"detail": str(e)})
+
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event = await stream.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            if not task.done():
+                logger.info(
+                    "Agent stream closed before the answer; cancelling the run."
+                )
+                task.cancel()
@@ -0,0 +1,98 @@
+# KONSPECTO/backend/agent/streaming.py
+
+import asyncio
+import logging
+
+from typing import Any, Dict, Optional, Tuple
+
+from langchain_core.agents import AgentAction, AgentFinish
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+
+logger = logging.getLogger("agent.streaming")
+
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+AgentEvent = Tuple[str, Dict[str, Any]]
+
+
+class AgentEventStream(AsyncCallbackHandler):
+    """
+    Callback handler that turns a running agent into a queue of events.
+
+    LLM tokens are emitted as "thought" events until the model writes
+    "Final Answer:", and as "token" events after it. Tool calls and their results
+    are emitted as "action" and "observation" events. The consumer reads the
+    events with get(); None marks the end of the stream.
+    """
+
+    def __init__(self):
+        self.queue: "asyncio.Queue[Optional[AgentEvent]]" = asyncio.Queue()
+        self._buffer = ""
+        self._emitted = 0
+        self._in_final_answer = False
+        self._answer_started = False
+
+    def _put(self, event: str, data: Dict[str, Any]):
+        self.queue.put_nowait((event, data))
+
+    def _reset(self):
+        self._buffer = ""
+        self._emitted = 0
+        self._in_final_answer = False
+        self._answer_started = False
+
+    def _emit_answer(self, text: str):
+        if not self._answer_started:
+            text = text.lstrip()
+            self._answer_started = bool(text)
+        if text:
+            self._put("token", {"text": text})
+
+    def _flush_thought(self, end: int):
+        if end > self._emitted:
+            self._put("thought", {"text": self._buffer[self._emitted : end]})
+            self._emitted = end
+
+    async def on_llm_start(self, serialized, prompts, **kwargs: Any) -> None:
+        self._reset()
+
+    async def on_chat_model_start(self, serialized, messages, **kwargs: Any) -> None:
+        self._reset()
+
+    async def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        if self._in_final_answer:
+            self._emit_answer(token)
+            return
+
+        self._buffer += token
+        marker_at = self._buffer.find(FINAL_ANSWER_MARKER, self._emitted)
+        if marker_at >= 0:
+            self._flush_thought(marker_at)
+            self._in_final_answer = True
+            self._emit_answer(self._buffer[marker_at + len(FINAL_ANSWER_MARKER) :])
+        else:
+            # Hold back a possible beginning of the marker until the next token
+            self._flush_thought(len(self._buffer) - len(FINAL_ANSWER_MARKER) + 1)
+
+    async def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        if not self._in_final_answer:
+            self._flush_thought(len(self._buffer))
+
+    async def on_agent_action(self, action: AgentAction, **kwargs: Any) -> None:
+        self._put("action", {"tool": action.tool, "tool_input": action.tool_input})
+
+    async def on_tool_end(self, output: Any, **kwargs: Any) -> None:
+        self._put("observation", {"text": str(output)})
+
+    async def on_agent_finish(self, finish: AgentFinish, **kwargs: Any) -> None:
+        logger.debug("Agent finished; closing the event stream.")
+
+    def finish(self, event: str, data: Dict[str, Any]):
+        """Put the final event and the end-of-stream marker."""
+        self._put(event, data)
+        self.queue.put_nowait(None)
+
+    async def get(self) -> Optional[AgentEvent]:
+        """Wait for the next event; None when the agent has finished."""
+        return await self.queue.get()
@@ -0,0 +1,210 @@
+# KONSPECTO/backend/agent/token_budget.py
+
+import logging
+import threading
+
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain.agents import ZeroShotAgent
+from langchain_core.agents import AgentAction
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+from llama_index.core.utils import get_tokenizer
+
+from app.core.metrics import Histogram, metrics_registry
+
+logger = logging.getLogger("agent.token_budget")
+
+TOKENS_PER_REQUEST_BUCKETS = (500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+OMITTED_OBSERVATION = "[Observation omitted to fit the token budget.]"
+TRUNCATION_MARKER = " ... [truncated]"
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens of a text with the tokenizer shared with LlamaIndex."""
+    return len(get_tokenizer()(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> Tuple[str, bool]:
+    """Cut a text to at most max_tokens tokens; return it and whether it was cut."""
+    tokens = get_tokenizer()(text)
+    if len(tokens) <= max_tokens:
+        return text, False
+    # Cut on characters in proportion, then back off until the text fits
+    length = len(text) * max_tokens // len(tokens)
+    while length > 0 and count_tokens(text[:length]) > max_tokens:
+        length = length * 9 // 10
+    return text[:length].rstrip() + TRUNCATION_MARKER, True
+
+
+class AgentTokenStats:
+    """Prompt and completion token counters of agent runs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.truncated_observations = 0
+        self.trimmed_scratchpads = 0
+        self._prompt_tokens = Histogram(TOKENS_PER_REQUEST_BUCKETS)
+        self._completion_tokens = Histogram(TOKENS_PER_REQUEST_BUCKETS)
+
+    def record_request(self, usage: "TokenUsageHandler"):
+        with self._lock:
+            self.requests += 1
+            self.llm_calls += usage.llm_calls
+            self.prompt_tokens += usage.prompt_tokens
+            self.completion_tokens += usage.completion_tokens
+        self._prompt_tokens.observe(usage.prompt_tokens)
+        self._completion_tokens.observe(usage.completion_tokens)
+
+    def record_scratchpad(self, truncated: bool, trimmed: bool):
+        with self._lock:
+            self.truncated_observations += truncated
+            self.trimmed_scratchpads += trimmed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return token totals and per-request token histograms."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "llm_calls": self.llm_calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "truncated_observations": self.truncated_observations,
+                "trimmed_scratchpads": self.trimmed_scratchpads,
+                "prompt_tokens_per_request": self._prompt_tokens.snapshot(),
+                "completion_tokens_per_request": self._completion_tokens.snapshot(),
+            }
+
+
+_token_stats: Optional[AgentTokenStats] = None
+_token_stats_lock = threading.Lock()
+
+
+def get_token_stats() -> AgentTokenStats:
+    """Return the process-wide agent token counters, creating them on first use."""
+    global _token_stats
+    if _token_stats is None:
+        with _token_stats_lock:
+            if _token_stats is None:
+                _token_stats = AgentTokenStats()
+                metrics_registry.register("agent_tokens", _token_stats.get_stats)
+    return _token_stats
+
+
+class BudgetedZeroShotAgent(ZeroShotAgent):
+    """
+    ZeroShotAgent whose scratchpad is kept within a token budget.
+
+    The prompt is resent on every iteration, so the scratchpad is built to keep
+    the longest possible prefix identical between iterations, which lets the LLM
+    server reuse its prompt cache. Every observation is cut to
+    max_observation_tokens when it is rendered, the same way on every iteration.
+    If the scratchpad still exceeds max_scratchpad_tokens, the oldest
+    observations are replaced by a placeholder, keeping the latest one.
+    """
+
+    max_observation_tokens: int = 600
+    max_scratchpad_tokens: int = 2000
+
+    def _construct_scratchpad(
+        self, intermediate_steps: List[Tuple[AgentAction, str]]
+    ) -> str:
+        logs = []
+        observations = []
+        truncated = 0
+        for action, observation in intermediate_steps:
+            logs.append(action.log)
+            observation, was_truncated = truncate_to_tokens(
+                str(observation), self.max_observation_tokens
+            )
+            observations.append(observation)
+            truncated += was_truncated
+
+        sizes = [
+            count_tokens(log) + count_tokens(observation)
+            for log, observation in zip(logs, observations)
+        ]
+        omitted = 0
+        placeholder_tokens = count_tokens(OMITTED_OBSERVATION)
+        while sum(sizes) > self.max_scratchpad_tokens and omitted < len(sizes) - 1:
+            sizes[omitted] = count_tokens(logs[omitted]) + placeholder_tokens
+            observations[omitted] = OMITTED_OBSERVATION
+            omitted += 1
+
+        if truncated or omitted:
+            # Earlier observations were counted when they were the latest one
+            get_token_stats().record_scratchpad(
+                truncated=observations[-1].endswith(TRUNCATION_MARKER),
+                trimmed=omitted > 0,
+            )
+            logger.debug(
+                f"Scratchpad of {len(intermediate_steps)} steps: {truncated} "
+                f"observations truncated, {omitted} omitted, {sum(sizes)} tokens."
+            )
+
+        thoughts = ""
+        for log, observation in zip(logs, observations):
+            thoughts += log
+            thoughts += f"\n{self.observation_prefix}{observation}\n{self.llm_prefix}"
+        return thoughts
+
+
+class TokenUsageHandler(AsyncCallbackHandler):
+    """
+    Callback handler counting the LLM calls and tokens of one agent run.
+
+    Token counts reported by the LLM server are used when present; streamed
+    responses carry none, so the prompt and the completion are counted with the
+    local tokenizer instead.
+    """
+
+    def __init__(self):
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._prompt_estimates: Dict[UUID, int] = {}
+
+    async def on_llm_start(
+        self, serialized, prompts: List[str], *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._prompt_estimates[run_id] = sum(count_tokens(text) for text in prompts)
+
+    async def on_chat_model_start(
+        self, serialized, messages, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._prompt_estimates[run_id] = sum(
+            count_tokens(str(message.content))
+            for batch in messages
+            for message in batch
+        )
+
+    async def on_llm_end(
+        self, response: LLMResult, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self.llm_calls += 1
+        estimate = self._prompt_estimates.pop(run_id, 0)
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage.get("prompt_tokens"):
+            self.prompt_tokens += usage["prompt_tokens"]
+            self.completion_tokens += usage.get("completion_tokens", 0)
+            return
+        self.prompt_tokens += estimate
+        self.completion_tokens += sum(
+            count_tokens(generation.text)
+            for generations in response.generations
+            for generation in generations
+        )
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the token counts of the run."""
+        return {
+            "llm_calls": self.llm_calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
@@ -0,0 +1,164 @@
+# KONSPECTO/backend/agent/tool_memo.py
+
+import asyncio
+import hashlib
+import logging
+import threading
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from redis import Redis
+
+from app.core.config import get_settings
+from app.core.metrics import metrics_registry
+from app.services.embedding_cache import normalize_query
+from app.services.index_sync import IndexGeneration
+from app.services.vector_db import IndexManager
+
+logger = logging.getLogger("agent.tool_memo")
+
+# Observations of the tool calls made by the current agent run
+_observations: ContextVar[Optional[Dict[Tuple[str, str], str]]] = ContextVar(
+    "tool_observations", default=None
+)
+
+
+@contextmanager
+def request_scope() -> Iterator[None]:
+    """Memoize tool calls for the duration of one agent run."""
+    token = _observations.set({})
+    try:
+        yield
+    finally:
+        _observations.reset(token)
+
+
+class ToolObservationCache:
+    """
+    Memoizes tool observations by tool name and normalized input.
+
+    Within an agent run (see request_scope) a repeated tool call returns the
+    observation of the first one. Shared calls are also cached in Redis across
+    runs for ttl seconds, keyed by the index generation, so observations never
+    outlive the index contents they were retrieved from. Redis errors are logged
+    and the call is computed as usual. Only observations of calls that returned
+    are cached; a call that raises is retried the next time.
+    """
+
+    KEY_PREFIX = "tool_observation"
+
+    def __init__(self, redis_client: Optional[Redis] = None, ttl: int = 3600):
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.request_hits = 0
+        self.shared_hits = 0
+        self.errors = 0
+
+    def _shared_key(self, key: Tuple[str, str], generation: int) -> str:
+        digest = hashlib.sha256(key[1].encode("utf-8")).hexdigest()
+        return f"{self.KEY_PREFIX}:{key[0]}:{generation}:{digest}"
+
+    def _get_shared(self, key: Tuple[str, str]) -> Tuple[Optional[str], Optional[int]]:
+        generation = IndexGeneration(self.redis_client).get()
+        value = self.redis_client.get(self._shared_key(key, generation))
+        return (value.decode("utf-8") if value is not None else None), generation
+
+    def _put_shared(self, key: Tuple[str, str], generation: int, observation: str):
+        self.redis_client.set(
+            self._shared_key(key, generation), observation.encode("utf-8"), ex=self.ttl
+        )
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    async def call(
+        self,
+        tool_name: str,
+        tool_input: str,
+        compute: Callable[[], Awaitable[str]],
+        shared: bool = False,
+    ) -> str:
+        """
+        Return the memoized observation of a tool call, or compute it.
+
+        :param tool_name: Name of the tool.
+        :param tool_input: Input of the tool call.
+        :param compute: Coroutine function computing the observation.
+        :param shared: Also cache the observation in Redis across agent runs.
+        :return: Observation of the tool call.
+        """
+        self._count("calls")
+        key = (tool_name, normalize_query(tool_input))
+        memo = _observations.get()
+        if memo is not None and key in memo:
+            self._count("request_hits")
+            logger.debug(f"{tool_name} call with input '{tool_input}' memoized.")
+            return memo[key]
+
+        shared = shared and self.redis_client is not None
+        generation = None
+        if shared:
+            try:
+                observation, generation = await asyncio.to_thread(self._get_shared, key)
+            except Exception:
+                logger.warning("Tool observation cache lookup failed.", exc_info=True)
+                self._count("errors")
+                observation, shared = None, False
+            if observation is not None:
+                self._count("shared_hits")
+                logger.debug(f"{tool_name} observation for '{tool_input}' cached.")
+                if memo is not None:
+                    memo[key] = observation
+                return observation
+
+        observation = await compute()
+        if memo is not None:
+            memo[key] = observation
+        if shared:
+            try:
+                await asyncio.to_thread(self._put_shared, key, generation, observation)
+            except Exception:
+                logger.warning("Failed to cache a tool observation.", exc_info=True)
+                self._count("errors")
+        return observation
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the number of tool calls and of calls short-circuited by caches."""
+        with self._lock:
+            short_circuited = self.request_hits + self.shared_hits
+            return {
+                "calls": self.calls,
+                "request_hits": self.request_hits,
+                "shared_hits": self.shared_hits,
+                "short_circuited": short_circuited,
+                "short_circuit_rate": (
+                    short_circuited / self.calls if self.calls else 0.0
+                ),
+                "errors": self.errors,
+            }
+
+
+_tool_memo: Optional[ToolObservationCache] = None
+_tool_memo_lock = threading.Lock()
+
+
+def get_tool_memo() -> ToolObservationCache:
+    """Return the process-wide tool observation cache, creating it on first use."""
+    global _tool_memo
+    settings = get_settings()
+    if _tool_memo is None:
+        with _tool_memo_lock:
+            if _tool_memo is None:
+                _tool_memo = ToolObservationCache(
+                    ttl=settings.TOOL_OBSERVATION_CACHE_TTL
+                )
+                metrics_registry.register("tool_memo", _tool_memo.get_stats)
+    # The Redis client is available once the index has been initialized
+    if settings.TOOL_OBSERVATION_CACHE_ENABLED and _tool_memo.redis_client is None:
+        _tool_memo.redis_client = IndexManager().redis_client
+    return _tool_memo
@@ -1,55 +1,48 @@
 # KONSPECTO/backend/agent/tools/search.py
 
+import asyncio
 import logging
 
-from typing import List
+from typing import Dict, List, Optional
 
-from app.services.index_service import get_query_engine
+from llama_index.core.schema import NodeWithScore, QueryBundle
+
+from app.core.config import get_settings
+from app.services.chunk_merger import merge_chunks
+from app.services.index_service import get_query_embeddings, get_retriever
+from app.services.retrieval_executor import get_retrieval_executor
 
 logger = logging.getLogger("agent.tools.search")
 
 
 class SearchTool:
     """
-    Инструмент для выполнения операций поиска с использованием query_engine.
+    Инструмент для выполнения операций поиска с использованием ретривера индекса.
     """
 
     @staticmethod
-    def search(query: str) -> List[str]:
+    def search(query: str, top_k: int = 1, mode: Optional[str] = None) -> List[str]:
         """
         Выполняет поиск документов по заданному текстовому запросу и возвращает список текстов из найденных документов.
 
         :param query: Текстовый запрос для поиска документов.
+        :param top_k: Количество извлекаемых фрагментов.
+        :param mode: Режим поиска ("vector" или "hybrid"). По умолчанию AGENT_SEARCH_MODE.
         :return: Список текстовых результатов поиска.
         """
         try:
             logger.debug(f"Agent search received query: {query}")
 
-            # Получение query_engine при необходимости
-            query_engine = get_query_engine()
-            response = query_engine.query(query)
-            logger.info("Agent received response from query engine.")
-
-            # Извлечение текстов из результатов поиска
-            results_text = []
-            for node_with_score in response.source_nodes:
-                # Проверяем наличие атрибутов 'node'
-                if hasattr(node_with_score, "node"):
-                    node = node_with_score.node
-                else:
-                    logger.warning("node_with_score does not have 'node' attribute.")
-                    continue
-
-                if not node:
-                    logger.warning("Received node_with_score with no node.")
-                    continue
-
-                text = node.text
-                if text:
-                    results_text.append(text)
-                else:
-                    logger.warning("Node has no text.")
+            # Получение ретривера; синтез ответа не нужен, используются только узлы
+            mode = mode or get_settings().AGENT_SEARCH_MODE
+            retriever = get_retriever(similarity_top_k=top_k, mode=mode)
+            nodes_with_scores = retriever.retrieve(query)
+            logger.info("Agent received nodes from retriever.")
+
+            # Перекрывающиеся фрагменты одного документа объединяются в один отрывок
+            nodes_with_scores = merge_chunks(nodes_with_scores)
 
+            results_text = SearchTool._to_texts(nodes_with_scores)
             logger.info(
                 f"Agent search query '{query}' returned {len(results_text)} text results."
             )
@@ -58,3 +51,125 @@ class SearchTool:
         except Exception as e:
             logger.exception("Agent search operation failed.")
             raise e
+
+    @staticmethod
+    def search_many(
+        queries: List[str], top_k: int = 1, mode: Optional[str] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Выполняет поиск по нескольким запросам за один вызов.
+
+        Запросы векторизуются одним пакетным проходом модели, после чего
+        KNN-запросы к Redis выполняются последовательно в том же потоке
+        исполнителя поиска, не превышая его ограничение параллелизма.
+
+        :param queries: Список текстовых запросов (терминов).
+        :param top_k: Количество извлекаемых фрагментов для каждого запроса.
+        :param mode: Режим поиска ("vector" или "hybrid"). По умолчанию AGENT_SEARCH_MODE.
+        :return: Словарь "запрос -> список текстовых результатов" в порядке запросов.
+        """
+        try:
+            logger.debug(f"Agent multi-search received queries: {queries}")
+
+            mode = mode or get_settings().AGENT_SEARCH_MODE
+            embeddings = get_query_embeddings(queries)
+            retriever = get_retriever(similarity_top_k=top_k, mode=mode)
+
+            nodes_per_query = [
+                retriever.retrieve(QueryBundle(query_str=query, embedding=embedding))
+                for query, embedding in zip(queries, embeddings)
+            ]
+            results = {
+                query: SearchTool._to_texts(merge_chunks(nodes_with_scores))
+                for query, nodes_with_scores in zip(queries, nodes_per_query)
+            }
+            logger.info(
+                f"Agent multi-search of {len(queries)} queries returned "
+                f"{sum(len(texts) for texts in results.values())} text results."
+            )
+            return results
+
+        except Exception as e:
+            logger.exception("Agent multi-search operation failed.")
+            raise e
+
+    @staticmethod
+    async def asearch(
+        query: str,
+        top_k: int = 1,
+        mode: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Асинхронный поиск, не блокирующий цикл событий.
+
+        Поиск выполняется в ограниченном пуле потоков ретривера. Отмена вызывающей
+        задачи снимает ещё не начатый поиск из очереди пула.
+
+        :param query: Текстовый запрос для поиска документов.
+        :param top_k: Количество извлекаемых фрагментов.
+        :param mode: Режим поиска ("vector" или "hybrid"). По умолчанию AGENT_SEARCH_MODE.
+        :param timeout: Тайм-аут в секундах. По умолчанию AGENT_SEARCH_TIMEOUT.
+        :return: Список текстовых результатов поиска.
+        :raises asyncio.TimeoutError: Если поиск не завершился за отведённое время.
+        :raises SearchOverloadedError: Если очередь пула ретривера переполнена.
+        """
+        if timeout is None:
+            timeout = get_settings().AGENT_SEARCH_TIMEOUT
+        return await asyncio.wait_for(
+            get_retrieval_executor().run(SearchTool.search, query, top_k, mode),
+            timeout,
+        )
+
+    @staticmethod
+    async def asearch_many(
+        queries: List[str],
+        top_k: int = 1,
+        mode: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Асинхронный поиск по нескольким запросам, не блокирующий цикл событий.
+
+        :param queries: Список текстовых запросов (терминов).
+        :param top_k: Количество извлекаемых фрагментов для каждого запроса.
+        :param mode: Режим поиска ("vector" или "hybrid"). По умолчанию AGENT_SEARCH_MODE.
+        :param timeout: Тайм-аут в секундах. По умолчанию AGENT_SEARCH_TIMEOUT.
+        :return: Словарь "запрос -> список текстовых результатов" в порядке запросов.
+        :raises asyncio.TimeoutError: Если поиск не завершился за отведённое время.
+        :raises SearchOverloadedError: Если очередь пула ретривера переполнена.
+        """
+        if timeout is None:
+            timeout = get_settings().AGENT_SEARCH_TIMEOUT
+        return await asyncio.wait_for(
+            get_retrieval_executor().run(SearchTool.search_many, queries, top_k, mode),
+            timeout,
+        )
+
+    @staticmethod
+    def _to_texts(nodes_with_scores: List[NodeWithScore]) -> List[str]:
+        """
+        Извлекает тексты из найденных узлов.
+
+        :param nodes_with_scores: Узлы с оценками сходства.
+        :return: Список текстов узлов.
+        """
+        results_text = []
+        for node_with_score in nodes_with_scores:
+            # Проверяем наличие атрибутов 'node'
+            if hasattr(node_with_score, "node"):
+                node = node_with_score.node
+            else:
+                logger.warning("node_with_score does not have 'node' attribute.")
+                continue
+
+            if not node:
+                logger.warning("Received node_with_score with no node.")
+                continue
+
+            text = node.text
+            if text:
+                results_text.append(text)
+            else:
+                logger.warning("Node has no text.")
+        return results_text
@@ -1,15 +1,30 @@
 # KONSPECTO/backend/app/api/v1/endpoints/agent.py
 
+import json
 import logging
+import time
+
+from typing import Any, AsyncIterator, Dict, Optional, Set
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from agent.react_agent import ReactAgent  # Импортируем ReactAgent
+from agent.react_agent import (  # Импортируем ReactAgent
+    SEARCH_TOOLS,
+    ReactAgent,
+    ToolCallRecorder,
+)
+
+from ....services.answer_cache import AnswerLookup, get_answer_cache, lookup_answer
+from ....services.retrieval_executor import get_retrieval_executor
 
 router = APIRouter()
 logger = logging.getLogger("app.api.v1.endpoints.agent")
 
+# Ответ AgentExecutor при исчерпании итераций; такие ответы не кэшируются
+AGENT_STOPPED_PREFIX = "Agent stopped"
+
 
 class QueryRequest(BaseModel):
     """
@@ -50,7 +65,13 @@ class AgentService:
         """
         logger.debug(f"Processing query: {query}")
         try:
-            response = await self.agent.ainvoke(query)
+            lookup = await self._lookup_answer(query)
+            if lookup is not None and lookup.answer is not None:
+                return lookup.answer
+
+            started = time.perf_counter()
+            tool_calls = ToolCallRecorder()
+            response = await self.agent.ainvoke(query, callbacks=[tool_calls])
             logger.debug(f"Agent response: {response}")
             if not isinstance(response, str):
                 logger.error(
@@ -60,6 +81,9 @@ class AgentService:
                     status_code=500, detail="Invalid response type from agent."
                 )
             # Дополнительная валидация или обработка может быть добавлена здесь
+            await self._store_answer(
+                lookup, response, time.perf_counter() - started, tool_calls.tools
+            )
             return response
         except HTTPException as he:
             # Передача HTTPException без изменений
@@ -68,6 +92,93 @@ class AgentService:
             logger.exception("Failed to process query.")
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def stream_query(self, query: str) -> AsyncIterator[str]:
+        """
+        Асинхронная обработка запроса к агенту с потоковой передачей событий SSE.
+
+        :param query: Строка запроса от пользователя.
+        :return: Асинхронный итератор событий в формате server-sent events.
+        """
+        logger.debug(f"Streaming query: {query}")
+        lookup = await self._lookup_answer(query)
+        if lookup is not None and lookup.answer is not None:
+            yield format_sse("final", {"response": lookup.answer})
+            return
+
+        started = time.perf_counter()
+        tools = set()
+        events = self.agent.astream(query)
+        try:
+            async for event, data in events:
+                yield format_sse(event, data)
+                if event == "action":
+                    tools.add(data["tool"])
+                elif event == "final":
+                    await self._store_answer(
+                        lookup, data["response"], time.perf_counter() - started, tools
+                    )
+        finally:
+            # При отключении клиента генератор закрывается, что отменяет работу агента
+            await events.aclose()
+
+    @staticmethod
+    async def _lookup_answer(query: str) -> Optional[AnswerLookup]:
+        """
+        Поиск ответа на семантически близкий вопрос в кэше ответов.
+
+        Ошибки кэша не прерывают обработку запроса.
+
+        :param query: Строка запроса от пользователя.
+        :return: Результат поиска в кэше или None, если кэш недоступен.
+        """
+        try:
+            return await get_retrieval_executor().run(lookup_answer, query)
+        except Exception:
+            logger.warning("Answer cache lookup failed.", exc_info=True)
+            return None
+
+    @staticmethod
+    async def _store_answer(
+        lookup: Optional[AnswerLookup], answer: str, elapsed: float, tools: Set[str]
+    ):
+        """
+        Сохранение ответа агента в кэше ответов.
+
+        Кэшируются только ответы, построенные по базе знаний. Ответы запусков,
+        вызывавших другие инструменты (например, YouTubeToDocx), зависят от деталей
+        запроса вроде ссылки на видео, которые почти не влияют на эмбеддинг, и не
+        кэшируются.
+
+        :param lookup: Результат промаха кэша с эмбеддингом и поколением индекса.
+        :param answer: Итоговый ответ агента.
+        :param elapsed: Время работы агента в секундах.
+        :param tools: Имена инструментов, вызванных агентом.
+        """
+        cache = get_answer_cache()
+        if lookup is None or cache is None or answer.startswith(AGENT_STOPPED_PREFIX):
+            return
+        other_tools = tools - SEARCH_TOOLS
+        if other_tools:
+            logger.debug(
+                f"Answer not cached: the agent used {', '.join(sorted(other_tools))}."
+            )
+            return
+        try:
+            await get_retrieval_executor().run(cache.store, lookup, answer, elapsed)
+        except Exception:
+            logger.warning("Failed to store the agent answer.", exc_info=True)
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """
+    Форматирование события в формате server-sent events.
+
+    :param event: Тип события.
+    :param data: Данные события, сериализуемые в JSON.
+    :return: Строка события SSE.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 
 # Инициализация сервисного класса агента
 agent_service = AgentService()
@@ -89,3 +200,22 @@ async def interact_with_agent(request: QueryRequest):
     except Exception as e:
         logger.exception("Agent interaction failed.")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/stream")
+async def stream_agent(request: QueryRequest):
+    """
+    Эндпойнт для взаимодействия с агентом с потоковой передачей ответа (SSE).
+
+    События: thought и token (фрагменты вывода LLM до и после "Final Answer:"),
+    action и observation (вызовы инструментов), final (полный ответ) или error.
+    Отключение клиента отменяет выполнение агента.
+
+    :param request: Объект запроса QueryRequest с полем query.
+    :return: Поток событий text/event-stream.
+    """
+    return StreamingResponse(
+        agent_service.stream_query(request.query),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
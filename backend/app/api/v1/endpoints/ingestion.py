@@ -0,0 +1,34 @@
+# KONSPECTO/backend/app/api/v1/endpoints/ingestion.py
+
+import logging
+
+from fastapi import APIRouter, Depends, Request
+
+from ....models.ingestion import IngestionStatus
+from ....services.ingestion_worker import IngestionWorker
+
+router = APIRouter()
+logger = logging.getLogger("app.api.v1.endpoints.ingestion")
+
+
+def get_ingestion_worker(request: Request) -> IngestionWorker:
+    """
+    Зависимость для получения экземпляра IngestionWorker из состояния приложения.
+
+    :param request: Объект запроса FastAPI.
+    :return: Экземпляр IngestionWorker.
+    """
+    return request.app.state.ingestion_worker
+
+
+@router.get("/status", response_model=IngestionStatus)
+async def get_ingestion_status(
+    ingestion_worker: IngestionWorker = Depends(get_ingestion_worker),
+):
+    """
+    Эндпойнт для получения прогресса фоновой индексации документов.
+
+    :param ingestion_worker: Экземпляр IngestionWorker.
+    :return: Объект IngestionStatus с текущим состоянием индексации.
+    """
+    return ingestion_worker.status
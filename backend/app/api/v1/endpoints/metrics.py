@@ -0,0 +1,22 @@
+# KONSPECTO/backend/app/api/v1/endpoints/metrics.py
+
+import logging
+
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from ....core.metrics import metrics_registry
+
+router = APIRouter()
+logger = logging.getLogger("app.api.v1.endpoints.metrics")
+
+
+@router.get("/", response_model=Dict[str, Dict[str, Any]])
+async def get_metrics():
+    """
+    Эндпойнт для получения метрик работы сервисов (кэши, очереди, пулы).
+
+    :return: Словарь метрик, сгруппированных по компонентам.
+    """
+    return metrics_registry.collect()
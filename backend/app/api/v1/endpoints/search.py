@@ -3,12 +3,32 @@
 import logging
 
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException
+from llama_index.core.schema import NodeWithScore, QueryBundle
 
-from ....models.search import SearchItem, SearchRequest, SearchResult
-from ....services.index_service import get_query_engine  # Updated import
+from ....core.config import get_settings
+from ....exceptions import SearchOverloadedError
+from ....models.search import (
+    BatchSearchRequest,
+    BatchSearchResult,
+    QuerySearchResult,
+    SearchFilters,
+    SearchItem,
+    SearchRequest,
+    SearchResult,
+)
+from ....services.chunk_merger import merge_chunks
+from ....services.index_service import (
+    build_metadata_filters,
+    get_query_embeddings,
+    get_retriever,
+)
+from ....services.local_replica import LocalReplicaRetriever
+from ....services.retrieval_executor import get_retrieval_executor
+from ....services.search_cache import get_search_cache
+from ....services.vector_db import IndexManager
 
 router = APIRouter()
 logger = logging.getLogger("app.api.v1.endpoints.search")
@@ -20,71 +40,272 @@ class SearchService:
     """
 
     @staticmethod
-    def process_search(query: str) -> List[SearchItem]:
+    def process_search(
+        query: str,
+        top_k: int = 1,
+        score_threshold: Optional[float] = None,
+        filters: Optional[SearchFilters] = None,
+        mode: str = "vector",
+    ) -> List[SearchItem]:
         """
         Обработка поискового запроса и возврат списка результатов поиска.
 
+        Поиск выполняется ретривером без синтеза ответа: узлы с оценками
+        возвращаются напрямую из векторного хранилища. Результаты кэшируются
+        до изменения поколения индекса.
+
         :param query: Текстовый поисковый запрос.
+        :param top_k: Количество извлекаемых фрагментов.
+        :param score_threshold: Минимальная оценка сходства результата.
+        :param filters: Фильтры по файлу и дате изменения, применяемые в Redis
+            внутри KNN-запроса.
+        :param mode: Режим поиска: "vector" или "hybrid" (векторный + BM25 с RRF).
         :return: Список объектов SearchItem с результатами поиска.
         """
         logger.debug(f"Processing search query: {query}")
-        query_engine = get_query_engine()  # Use the function to get the query engine
-        response = query_engine.query(query)
-        logger.info("Received response from query engine.")
 
-        # Log the full structure of the response for debugging
-        logger.debug(f"Response structure: {response}")
+        cache = get_search_cache()
+        generation = IndexManager().get_generation() if cache is not None else None
+        cache_key = None
+        if generation is not None:
+            cache_key = cache.make_key(
+                query,
+                generation,
+                top_k=top_k,
+                score_threshold=score_threshold,
+                filters=filters.model_dump(mode="json") if filters else None,
+                mode=mode,
+            )
+            cached_items = cache.get(cache_key, generation)
+            if cached_items is not None:
+                logger.info(f"Search query '{query}' served from the result cache.")
+                return cached_items
 
-        search_items = []
-        for node_with_score in response.source_nodes:
-            # Check if 'score' and 'node' attributes exist
-            if hasattr(node_with_score, "score") and hasattr(node_with_score, "node"):
-                score = node_with_score.score
-                node = node_with_score.node
-            else:
-                logger.warning(
-                    "node_with_score does not have 'score' or 'node' attributes."
-                )
-                continue
+        retriever = get_retriever(
+            similarity_top_k=SearchService._candidate_top_k(top_k),
+            filters=build_metadata_filters(filters),
+            mode=mode,
+            score_threshold=score_threshold,
+        )
+        if not SearchService._serves_generation(retriever, generation):
+            cache_key = None
+        nodes_with_scores = retriever.retrieve(query)
+        logger.info(f"Retrieved {len(nodes_with_scores)} nodes from the retriever.")
+
+        search_items = SearchService._to_search_items(
+            nodes_with_scores,
+            SearchService._result_threshold(score_threshold, mode),
+            top_k=top_k,
+        )
+
+        logger.info(f"Search query '{query}' returned {len(search_items)} results.")
+        if cache_key is not None:
+            cache.put(cache_key, generation, search_items)
+        return search_items
 
-            if not node:
-                logger.warning("Received node_with_score with no node.")
-                continue
+    @staticmethod
+    def process_batch_search(
+        queries: List[str],
+        top_k: int = 1,
+        score_threshold: Optional[float] = None,
+        filters: Optional[SearchFilters] = None,
+        mode: str = "vector",
+    ) -> List[QuerySearchResult]:
+        """
+        Обработка пакета поисковых запросов.
+
+        Запросы, отсутствующие в кэше результатов, векторизуются одним пакетным
+        проходом модели, после чего KNN-запросы к Redis выполняются
+        последовательно в том же потоке исполнителя поиска, не превышая его
+        ограничение параллелизма.
+
+        :param queries: Список текстовых поисковых запросов.
+        :param top_k: Количество извлекаемых фрагментов для каждого запроса.
+        :param score_threshold: Минимальная оценка сходства результата.
+        :param filters: Фильтры по файлу и дате изменения, применяемые в Redis
+            внутри KNN-запроса.
+        :param mode: Режим поиска: "vector" или "hybrid".
+        :return: Список результатов в порядке запросов.
+        """
+        logger.debug(f"Processing batch of {len(queries)} search queries.")
 
-            metadata = node.metadata
-            modified_at_str = metadata.get("modified_at") or metadata.get("modified at")
-            file_name = metadata.get("file_name") or metadata.get("file name", "")
-            file_id = metadata.get("file_id") or metadata.get("file id", "")
+        cache = get_search_cache()
+        generation = IndexManager().get_generation() if cache is not None else None
+        results: List[Optional[List[SearchItem]]] = [None] * len(queries)
+        cache_keys: List[Optional[str]] = [None] * len(queries)
+        if generation is not None:
+            for index, query in enumerate(queries):
+                cache_keys[index] = cache.make_key(
+                    query,
+                    generation,
+                    top_k=top_k,
+                    score_threshold=score_threshold,
+                    filters=filters.model_dump(mode="json") if filters else None,
+                    mode=mode,
+                )
+                results[index] = cache.get(cache_keys[index], generation)
 
-            # Ensure mandatory metadata fields are present
-            if not all([modified_at_str, file_name, file_id]):
-                logger.warning(f"Incomplete metadata for node ID: {node.id_}")
-                continue
+        missing = [index for index, items in enumerate(results) if items is None]
+        if missing:
+            embeddings = get_query_embeddings([queries[index] for index in missing])
+            retriever = get_retriever(
+                similarity_top_k=SearchService._candidate_top_k(top_k),
+                filters=build_metadata_filters(filters),
+                mode=mode,
+                score_threshold=score_threshold,
+            )
+            if not SearchService._serves_generation(retriever, generation):
+                cache_keys = [None] * len(queries)
 
-            try:
-                modified_at = datetime.fromisoformat(
-                    modified_at_str.replace("Z", "+00:00")
+            for index, embedding in zip(missing, embeddings):
+                nodes_with_scores = retriever.retrieve(
+                    QueryBundle(query_str=queries[index], embedding=embedding)
                 )
-            except ValueError:
-                logger.error(
-                    f"Invalid date format for node ID: {node.id_} - {modified_at_str}",
-                    exc_info=True,
+                results[index] = SearchService._to_search_items(
+                    nodes_with_scores,
+                    SearchService._result_threshold(score_threshold, mode),
+                    top_k=top_k,
                 )
-                continue
-
-            search_item = SearchItem(
-                modified_at=modified_at,
-                file_name=file_name,
-                file_id=file_id,
-                text=node.text,
-                score=score,
-                start_char_idx=node.start_char_idx,
-                end_char_idx=node.end_char_idx,
+                if cache_keys[index] is not None:
+                    cache.put(cache_keys[index], generation, results[index])
+
+        logger.info(
+            f"Batch search of {len(queries)} queries finished "
+            f"({len(queries) - len(missing)} served from the result cache)."
+        )
+        return [
+            QuerySearchResult(query=query, results=items)
+            for query, items in zip(queries, results)
+        ]
+
+    @staticmethod
+    def _serves_generation(retriever, generation: Optional[int]) -> bool:
+        """
+        Проверка, что ретривер отвечает по данным поколения индекса generation.
+
+        Локальная реплика догоняет Redis в фоновом потоке и может отставать от
+        поколения, прочитанного для ключа кэша. Её результаты не кэшируются,
+        пока она не применит это поколение.
+
+        :param retriever: Ретривер, выполняющий поиск.
+        :param generation: Поколение индекса из ключа кэша.
+        :return: True, если результаты можно кэшировать под этим поколением.
+        """
+        if generation is None or not isinstance(retriever, LocalReplicaRetriever):
+            return True
+        return retriever.generation is not None and retriever.generation >= generation
+
+    @staticmethod
+    def _candidate_top_k(top_k: int) -> int:
+        """
+        Количество извлекаемых кандидатов для запроса top_k результатов.
+
+        Узлы с неполными метаданными отбрасываются, а перекрывающиеся фрагменты
+        объединяются, поэтому кандидатов извлекается с запасом, а результаты
+        затем обрезаются до top_k.
+
+        :param top_k: Запрошенное количество результатов.
+        :return: Количество кандидатов.
+        """
+        return top_k * get_settings().SEARCH_CANDIDATE_FACTOR
+
+    @staticmethod
+    def _result_threshold(
+        score_threshold: Optional[float], mode: str
+    ) -> Optional[float]:
+        """
+        Порог оценки, применяемый к результатам поиска.
+
+        В гибридном режиме оценки результатов - это оценки RRF, а не косинусное
+        сходство, поэтому порог применяется ретривером к векторным кандидатам до
+        слияния рейтингов.
+
+        :param score_threshold: Минимальная оценка сходства результата.
+        :param mode: Режим поиска.
+        :return: Порог для результатов или None.
+        """
+        return score_threshold if mode == "vector" else None
+
+    @staticmethod
+    def _to_search_items(
+        nodes_with_scores: List[NodeWithScore],
+        score_threshold: Optional[float] = None,
+        top_k: Optional[int] = None,
+    ) -> List[SearchItem]:
+        """
+        Отбор найденных узлов по порогу, объединение перекрывающихся фрагментов
+        одного документа, преобразование в SearchItem и обрезка до top_k.
+
+        :param nodes_with_scores: Узлы с оценками сходства.
+        :param score_threshold: Минимальная оценка сходства результата.
+        :param top_k: Максимальное количество результатов.
+        :return: Список объектов SearchItem.
+        """
+        if score_threshold is not None:
+            nodes_with_scores = [
+                node_with_score
+                for node_with_score in nodes_with_scores
+                if node_with_score.score is not None
+                and node_with_score.score >= score_threshold
+            ]
+
+        search_items = []
+        for node_with_score in merge_chunks(nodes_with_scores):
+            search_item = SearchService._to_search_item(node_with_score)
+            if search_item is not None:
+                search_items.append(search_item)
+        return search_items[:top_k]
+
+    @staticmethod
+    def _to_search_item(node_with_score: NodeWithScore) -> Optional[SearchItem]:
+        """
+        Преобразование найденного узла в объект SearchItem.
+
+        :param node_with_score: Узел с оценкой сходства.
+        :return: Объект SearchItem или None, если метаданные узла неполные.
+        """
+        # Check if 'score' and 'node' attributes exist
+        if hasattr(node_with_score, "score") and hasattr(node_with_score, "node"):
+            score = node_with_score.score
+            node = node_with_score.node
+        else:
+            logger.warning(
+                "node_with_score does not have 'score' or 'node' attributes."
             )
-            search_items.append(search_item)
+            return None
 
-        logger.info(f"Search query '{query}' returned {len(search_items)} results.")
-        return search_items
+        if not node:
+            logger.warning("Received node_with_score with no node.")
+            return None
+
+        metadata = node.metadata
+        modified_at_str = metadata.get("modified_at") or metadata.get("modified at")
+        file_name = metadata.get("file_name") or metadata.get("file name", "")
+        file_id = metadata.get("file_id") or metadata.get("file id", "")
+
+        # Ensure mandatory metadata fields are present
+        if not all([modified_at_str, file_name, file_id]):
+            logger.warning(f"Incomplete metadata for node ID: {node.id_}")
+            return None
+
+        try:
+            modified_at = datetime.fromisoformat(modified_at_str.replace("Z", "+00:00"))
+        except ValueError:
+            logger.error(
+                f"Invalid date format for node ID: {node.id_} - {modified_at_str}",
+                exc_info=True,
+            )
+            return None
+
+        return SearchItem(
+            modified_at=modified_at,
+            file_name=file_name,
+            file_id=file_id,
+            text=node.text,
+            score=score,
+            start_char_idx=node.start_char_idx,
+            end_char_idx=node.end_char_idx,
+        )
 
 
 @router.post("/", response_model=SearchResult)
@@ -92,12 +313,51 @@ async def search_documents(request: SearchRequest):
     """
     Эндпойнт для поиска документов на основе запроса.
 
-    :param request: Объект запроса SearchRequest с полем query.
+    Поиск выполняется в ограниченном пуле потоков, чтобы не блокировать цикл
+    событий. При переполнении очереди возвращается ответ 503.
+
+    :param request: Объект запроса SearchRequest с полем query и параметрами поиска.
     :return: Объект ответа SearchResult с результатами поиска.
     """
     try:
-        search_items = SearchService.process_search(request.query)
+        search_items = await get_retrieval_executor().run(
+            SearchService.process_search,
+            request.query,
+            top_k=request.top_k,
+            score_threshold=request.score_threshold,
+            filters=request.filters,
+            mode=request.mode,
+        )
         return SearchResult(results=search_items)
+    except SearchOverloadedError as e:
+        logger.warning("Search rejected: retrieval queue is full.")
+        raise e
     except Exception:
         logger.exception("Search operation failed.")
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/batch", response_model=BatchSearchResult)
+async def batch_search_documents(request: BatchSearchRequest):
+    """
+    Эндпойнт для пакетного поиска документов по списку запросов.
+
+    :param request: Объект запроса BatchSearchRequest со списком queries.
+    :return: Объект ответа BatchSearchResult с результатами для каждого запроса.
+    """
+    try:
+        results = await get_retrieval_executor().run(
+            SearchService.process_batch_search,
+            request.queries,
+            top_k=request.top_k,
+            score_threshold=request.score_threshold,
+            filters=request.filters,
+            mode=request.mode,
+        )
+        return BatchSearchResult(results=results)
+    except SearchOverloadedError as e:
+        logger.warning("Batch search rejected: retrieval queue is full.")
+        raise e
+    except Exception:
+        logger.exception("Batch search operation failed.")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
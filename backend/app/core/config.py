@@ -4,7 +4,7 @@ import logging
 
 from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from pydantic import AnyHttpUrl, Field, validator
 from pydantic_settings import BaseSettings
@@ -46,6 +46,54 @@ class Settings(BaseSettings):
         description="Base URL for the LLM Studio API.",
     )
 
+    # Retries of a failed request to the LLM server
+    LLM_MAX_RETRIES: int = Field(
+        default=1,
+        env="LLM_MAX_RETRIES",
+        description="Maximum number of retries of a failed LLM request.",
+    )
+
+    # Connection pool of the HTTP client shared by all LLM requests
+    LLM_HTTP_MAX_CONNECTIONS: int = Field(
+        default=20,
+        env="LLM_HTTP_MAX_CONNECTIONS",
+        description="Maximum number of open connections to the LLM server.",
+    )
+
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=10,
+        env="LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+        description="Maximum number of idle connections kept alive for reuse.",
+    )
+
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = Field(
+        default=60.0,
+        env="LLM_HTTP_KEEPALIVE_EXPIRY",
+        description="Seconds an idle connection to the LLM server is kept alive.",
+    )
+
+    # Timeouts of requests to the LLM server
+    LLM_HTTP_CONNECT_TIMEOUT: float = Field(
+        default=5.0,
+        env="LLM_HTTP_CONNECT_TIMEOUT",
+        description="Timeout in seconds of opening a connection to the LLM server.",
+    )
+
+    LLM_HTTP_READ_TIMEOUT: float = Field(
+        default=120.0,
+        env="LLM_HTTP_READ_TIMEOUT",
+        description=(
+            "Timeout in seconds of waiting for data from the LLM server, "
+            "i.e. between two chunks of a streamed answer."
+        ),
+    )
+
+    LLM_HTTP_POOL_TIMEOUT: float = Field(
+        default=30.0,
+        env="LLM_HTTP_POOL_TIMEOUT",
+        description="Timeout in seconds of waiting for a free pooled connection.",
+    )
+
     # Embedding Model Configuration
     EMBEDDING_MODEL_NAME: str = Field(
         default="intfloat/multilingual-e5-large",
@@ -60,6 +108,89 @@ class Settings(BaseSettings):
         description="Batch size for embeddings in HuggingFaceEmbedding.",
     )
 
+    # Embedding Backend Configuration
+    EMBEDDING_BACKEND: str = Field(
+        default="torch",
+        env="EMBEDDING_BACKEND",
+        description="Embedding runtime: 'torch', 'onnx' or 'onnx-int8'.",
+    )
+
+    # Directory where exported ONNX models are cached
+    EMBEDDING_ONNX_CACHE_DIR: Path = Field(
+        default=Path(".cache/onnx"),
+        env="EMBEDDING_ONNX_CACHE_DIR",
+        description="Directory for exported and quantized ONNX embedding models.",
+    )
+
+    # Dynamic int8 quantization target of the 'onnx-int8' backend
+    EMBEDDING_ONNX_QUANTIZATION: str = Field(
+        default="avx512_vnni",
+        env="EMBEDDING_ONNX_QUANTIZATION",
+        description="Quantization config: 'arm64', 'avx2', 'avx512' or 'avx512_vnni'.",
+    )
+
+    # Parallel Embedding Configuration
+    EMBEDDING_NUM_WORKERS: int = Field(
+        default=1,
+        env="EMBEDDING_NUM_WORKERS",
+        description=(
+            "Number of worker processes embedding nodes during ingestion. "
+            "1 embeds in the application process."
+        ),
+    )
+
+    # Intra-op threads of each embedding worker process
+    EMBEDDING_THREADS_PER_WORKER: int = Field(
+        default=0,
+        env="EMBEDDING_THREADS_PER_WORKER",
+        description="Torch threads per embedding worker. 0 splits the CPU cores evenly.",
+    )
+
+    # Number of nodes sent to an embedding worker at once
+    EMBEDDING_SHARD_SIZE: int = Field(
+        default=256,
+        env="EMBEDDING_SHARD_SIZE",
+        description="Number of nodes per shard sent to an embedding worker.",
+    )
+
+    # Query Embedding Cache Configuration
+    QUERY_EMBEDDING_CACHE_ENABLED: bool = Field(
+        default=True,
+        env="QUERY_EMBEDDING_CACHE_ENABLED",
+        description="Cache query embeddings in process memory and Redis.",
+    )
+
+    # Number of query embeddings kept in the in-process LRU
+    QUERY_EMBEDDING_CACHE_SIZE: int = Field(
+        default=1024,
+        env="QUERY_EMBEDDING_CACHE_SIZE",
+        description="Maximum number of query embeddings in the in-process LRU.",
+    )
+
+    # Lifetime of query embeddings cached in Redis
+    QUERY_EMBEDDING_CACHE_TTL: int = Field(
+        default=86400,
+        env="QUERY_EMBEDDING_CACHE_TTL",
+        description="TTL in seconds of query embeddings cached in Redis.",
+    )
+
+    # Query Embedding Micro-Batching Configuration
+    QUERY_EMBEDDING_MAX_BATCH_SIZE: int = Field(
+        default=16,
+        env="QUERY_EMBEDDING_MAX_BATCH_SIZE",
+        description=(
+            "Maximum number of concurrent queries embedded in one forward pass; "
+            "1 disables micro-batching."
+        ),
+    )
+
+    # Time the first query of a batch waits for more queries to arrive
+    QUERY_EMBEDDING_MAX_WAIT_MS: float = Field(
+        default=5.0,
+        env="QUERY_EMBEDDING_MAX_WAIT_MS",
+        description="Maximum time in milliseconds a query waits for its batch.",
+    )
+
     # Whisper Model Size configuration
     WHISPER_MODEL_SIZE: str = Field(
         default="large-v2",
@@ -74,6 +205,315 @@ class Settings(BaseSettings):
         description="Dimensions of the embedding vectors.",
     )
 
+    # Vector Index Configuration
+    VECTOR_DATATYPE: str = Field(
+        default="float32",
+        env="VECTOR_DATATYPE",
+        description="Datatype of stored vectors: 'float32' or 'float16'.",
+    )
+
+    # HNSW graph parameters of the vector index
+    HNSW_M: int = Field(
+        default=16,
+        env="HNSW_M",
+        description="Maximum number of outgoing edges per node in the HNSW graph.",
+    )
+
+    HNSW_EF_CONSTRUCTION: int = Field(
+        default=200,
+        env="HNSW_EF_CONSTRUCTION",
+        description="Number of candidates considered while building the HNSW graph.",
+    )
+
+    HNSW_EF_RUNTIME: int = Field(
+        default=10,
+        env="HNSW_EF_RUNTIME",
+        description="Number of candidates considered during KNN queries.",
+    )
+
+    # Hybrid Search Configuration
+    HYBRID_RRF_K: int = Field(
+        default=60,
+        env="HYBRID_RRF_K",
+        description="Constant k of reciprocal-rank fusion in hybrid search.",
+    )
+
+    # Candidates fetched from each of the vector and full-text queries
+    HYBRID_CANDIDATE_TOP_K: int = Field(
+        default=20,
+        env="HYBRID_CANDIDATE_TOP_K",
+        description="Candidates fetched per query before fusion in hybrid search.",
+    )
+
+    # Search mode used by the agent's RAGSearch tool
+    AGENT_SEARCH_MODE: str = Field(
+        default="vector",
+        env="AGENT_SEARCH_MODE",
+        description="Search mode of the agent's RAGSearch tool: 'vector' or 'hybrid'.",
+    )
+
+    # Deadline of one knowledge base search made by the agent
+    AGENT_SEARCH_TIMEOUT: float = Field(
+        default=10.0,
+        env="AGENT_SEARCH_TIMEOUT",
+        description="Timeout in seconds of one RAGSearch or RAGMultiSearch call.",
+    )
+
+    # Node Parser Configuration
+    NODE_PARSER: str = Field(
+        default="sentence",
+        env="NODE_PARSER",
+        description=(
+            "Node parser of the ingestion pipeline: 'sentence' uses LlamaIndex's "
+            "SentenceSplitter, 'structure' (opt-in) splits on headings, paragraphs "
+            "and lists."
+        ),
+    )
+
+    # Maximum number of tokens per indexed chunk
+    CHUNK_SIZE: int = Field(
+        default=600,
+        env="CHUNK_SIZE",
+        description="Maximum number of tokens per chunk.",
+    )
+
+    # Number of tokens repeated from the previous chunk
+    CHUNK_OVERLAP: int = Field(
+        default=400,
+        env="CHUNK_OVERLAP",
+        description="Number of tokens shared by consecutive chunks.",
+    )
+
+    # Merge overlapping or adjacent retrieved chunks of a document into one passage
+    CHUNK_MERGE_ENABLED: bool = Field(
+        default=True,
+        env="CHUNK_MERGE_ENABLED",
+        description="Merge overlapping retrieved chunks before returning them.",
+    )
+
+    # Largest gap in characters between two chunks that are still merged
+    CHUNK_MERGE_MAX_GAP: int = Field(
+        default=2,
+        env="CHUNK_MERGE_MAX_GAP",
+        description="Maximum number of characters between merged chunk spans.",
+    )
+
+    # Candidates retrieved per requested result, so that top_k results remain
+    # after nodes with incomplete metadata are dropped and chunks are merged
+    SEARCH_CANDIDATE_FACTOR: int = Field(
+        default=3,
+        env="SEARCH_CANDIDATE_FACTOR",
+        description="Multiple of top_k retrieved before results are cut to top_k.",
+    )
+
+    # Maximum number of tokens of one tool observation in the agent prompt
+    AGENT_OBSERVATION_TOKEN_LIMIT: int = Field(
+        default=600,
+        env="AGENT_OBSERVATION_TOKEN_LIMIT",
+        description="Tool observations are cut to this many tokens in the prompt.",
+    )
+
+    # Token budget of the agent scratchpad (previous actions and observations)
+    AGENT_SCRATCHPAD_TOKEN_BUDGET: int = Field(
+        default=2000,
+        env="AGENT_SCRATCHPAD_TOKEN_BUDGET",
+        description="Older observations are omitted to keep the scratchpad in budget.",
+    )
+
+    # Cache agent search observations in Redis across agent runs
+    TOOL_OBSERVATION_CACHE_ENABLED: bool = Field(
+        default=False,
+        env="TOOL_OBSERVATION_CACHE_ENABLED",
+        description="Share RAGSearch observations between agent runs through Redis.",
+    )
+
+    # Lifetime of shared agent search observations in seconds
+    TOOL_OBSERVATION_CACHE_TTL: int = Field(
+        default=3600,
+        env="TOOL_OBSERVATION_CACHE_TTL",
+        description="Time-to-live of shared agent search observations in seconds.",
+    )
+
+    # Agent Answer Cache Configuration
+    ANSWER_CACHE_ENABLED: bool = Field(
+        default=False,
+        env="ANSWER_CACHE_ENABLED",
+        description="Serve agent answers of semantically similar questions from Redis.",
+    )
+
+    # Minimum cosine similarity of query embeddings for an answer cache hit
+    ANSWER_CACHE_THRESHOLD: float = Field(
+        default=0.95,
+        env="ANSWER_CACHE_THRESHOLD",
+        description="Cosine similarity a question needs to reuse a cached answer.",
+    )
+
+    # Lifetime of cached agent answers in seconds
+    ANSWER_CACHE_TTL: int = Field(
+        default=86400,
+        env="ANSWER_CACHE_TTL",
+        description="Time-to-live of cached agent answers in seconds.",
+    )
+
+    # Search Result Cache Configuration
+    SEARCH_CACHE_ENABLED: bool = Field(
+        default=True,
+        env="SEARCH_CACHE_ENABLED",
+        description="Cache search results until the index generation changes.",
+    )
+
+    # Number of search results kept in the in-process LRU
+    SEARCH_CACHE_SIZE: int = Field(
+        default=1024,
+        env="SEARCH_CACHE_SIZE",
+        description="Maximum number of cached search results per process.",
+    )
+
+    # Retrieval Executor Configuration
+    RETRIEVAL_MAX_CONCURRENCY: int = Field(
+        default=4,
+        env="RETRIEVAL_MAX_CONCURRENCY",
+        description="Number of threads running retrievals off the event loop.",
+    )
+
+    # Retrievals allowed to wait for a thread before searches are rejected with 503
+    RETRIEVAL_MAX_QUEUE_DEPTH: int = Field(
+        default=32,
+        env="RETRIEVAL_MAX_QUEUE_DEPTH",
+        description="Maximum number of queued retrievals before returning 503.",
+    )
+
+    # Local Replica Configuration
+    LOCAL_REPLICA_ENABLED: bool = Field(
+        default=False,
+        env="LOCAL_REPLICA_ENABLED",
+        description="Serve vector searches from an in-process replica of the index.",
+    )
+
+    # Directory of the memory-mapped vector matrix of the local replica
+    LOCAL_REPLICA_DIR: Path = Field(
+        default=Path("/tmp/konspecto_replica"),
+        env="LOCAL_REPLICA_DIR",
+        description="Directory where the local replica keeps its vector file.",
+    )
+
+    # How often the local replica checks the index generation for new writes
+    LOCAL_REPLICA_REFRESH_INTERVAL: float = Field(
+        default=2.0,
+        env="LOCAL_REPLICA_REFRESH_INTERVAL",
+        description="Seconds between index generation checks of the local replica.",
+    )
+
+    # Document Source Configuration
+    DOCUMENT_SOURCE: str = Field(
+        default="gdrive",
+        env="DOCUMENT_SOURCE",
+        description="Source of indexed documents: 'gdrive' or 'local'.",
+    )
+
+    # Local Documents Directory (used when DOCUMENT_SOURCE is 'local')
+    LOCAL_DOCUMENTS_DIR: Optional[Path] = Field(
+        default=None,
+        env="LOCAL_DOCUMENTS_DIR",
+        description="Directory with documents for the local document source.",
+    )
+
+    # Index Synchronization Configuration
+    INDEX_SYNC_MODE: str = Field(
+        default="delta",
+        env="INDEX_SYNC_MODE",
+        description=(
+            "'delta' re-ingests only added or changed files, "
+            "'full' reloads every file of the source."
+        ),
+    )
+
+    # Number of files downloaded and ingested per sync batch
+    INDEX_SYNC_BATCH_SIZE: int = Field(
+        default=50,
+        env="INDEX_SYNC_BATCH_SIZE",
+        description="Number of files fetched and ingested per sync batch.",
+    )
+
+    # Whether the background ingestion worker syncs documents on startup
+    INDEX_SYNC_ON_STARTUP: bool = Field(
+        default=True,
+        env="INDEX_SYNC_ON_STARTUP",
+        description="Synchronize the document source in the background on startup.",
+    )
+
+    # Retries of a failed index load or sync by the ingestion worker
+    INGESTION_MAX_RETRIES: int = Field(
+        default=10,
+        env="INGESTION_MAX_RETRIES",
+        description="Retries of a failed index load or document sync.",
+    )
+
+    # Delay before the first retry, doubled after every failed attempt
+    INGESTION_RETRY_BACKOFF: float = Field(
+        default=5.0,
+        env="INGESTION_RETRY_BACKOFF",
+        description="Seconds before the first ingestion retry.",
+    )
+
+    # Upper bound of the delay between two ingestion retries
+    INGESTION_RETRY_MAX_BACKOFF: float = Field(
+        default=300.0,
+        env="INGESTION_RETRY_MAX_BACKOFF",
+        description="Maximum seconds between two ingestion retries.",
+    )
+
+    @validator("VECTOR_DATATYPE")
+    def validate_vector_datatype(cls, v):
+        if v.lower() not in ("float32", "float16"):
+            raise ValueError("VECTOR_DATATYPE must be either 'float32' or 'float16'.")
+        return v.lower()
+
+    @validator("AGENT_SEARCH_MODE")
+    def validate_agent_search_mode(cls, v):
+        if v not in ("vector", "hybrid"):
+            raise ValueError("AGENT_SEARCH_MODE must be either 'vector' or 'hybrid'.")
+        return v
+
+    @validator("ANSWER_CACHE_THRESHOLD")
+    def validate_answer_cache_threshold(cls, v):
+        if not 0.0 < v <= 1.0:
+            raise ValueError("ANSWER_CACHE_THRESHOLD must be in the range (0, 1].")
+        return v
+
+    @validator("SEARCH_CANDIDATE_FACTOR")
+    def validate_search_candidate_factor(cls, v):
+        if v < 1:
+            raise ValueError("SEARCH_CANDIDATE_FACTOR must be at least 1.")
+        return v
+
+    @validator("NODE_PARSER")
+    def validate_node_parser(cls, v):
+        if v not in ("sentence", "structure"):
+            raise ValueError("NODE_PARSER must be either 'sentence' or 'structure'.")
+        return v
+
+    @validator("CHUNK_OVERLAP")
+    def validate_chunk_overlap(cls, v, values):
+        chunk_size = values.get("CHUNK_SIZE")
+        if chunk_size is not None and v >= chunk_size:
+            raise ValueError("CHUNK_OVERLAP must be smaller than CHUNK_SIZE.")
+        return v
+
+    @validator("EMBEDDING_BACKEND")
+    def validate_embedding_backend(cls, v):
+        if v not in ("torch", "onnx", "onnx-int8"):
+            raise ValueError(
+                "EMBEDDING_BACKEND must be one of 'torch', 'onnx' or 'onnx-int8'."
+            )
+        return v
+
+    @validator("INDEX_SYNC_MODE")
+    def validate_index_sync_mode(cls, v):
+        if v not in ("delta", "full"):
+            raise ValueError("INDEX_SYNC_MODE must be either 'delta' or 'full'.")
+        return v
+
     @validator("GOOGLE_SERVICE_ACCOUNT_KEY_PATH", pre=True)
     def validate_service_account_path(cls, v):
         logger.debug(f"Original GOOGLE_SERVICE_ACCOUNT_KEY_PATH value: {v}")
@@ -94,7 +534,9 @@ class Settings(BaseSettings):
 
     class Config:
         # Set the path to the .env file
-        env_file = (Path(__file__).resolve().parent.parent / "config" / ".env").as_posix()
+        env_file = (
+            Path(__file__).resolve().parent.parent / "config" / ".env"
+        ).as_posix()
         case_sensitive = True
 
 
@@ -112,8 +554,78 @@ def get_settings() -> Settings:
     )
     logger.debug(f"TRANSCRIPTION_MODEL: {settings.TRANSCRIPTION_MODEL}")
     logger.debug(f"LLM_STUDIO_BASE_URL: {settings.LLM_STUDIO_BASE_URL}")
+    logger.debug(f"LLM_MAX_RETRIES: {settings.LLM_MAX_RETRIES}")
+    logger.debug(f"LLM_HTTP_MAX_CONNECTIONS: {settings.LLM_HTTP_MAX_CONNECTIONS}")
+    logger.debug(
+        f"LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: {settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS}"
+    )
+    logger.debug(f"LLM_HTTP_KEEPALIVE_EXPIRY: {settings.LLM_HTTP_KEEPALIVE_EXPIRY}")
+    logger.debug(f"LLM_HTTP_CONNECT_TIMEOUT: {settings.LLM_HTTP_CONNECT_TIMEOUT}")
+    logger.debug(f"LLM_HTTP_READ_TIMEOUT: {settings.LLM_HTTP_READ_TIMEOUT}")
+    logger.debug(f"LLM_HTTP_POOL_TIMEOUT: {settings.LLM_HTTP_POOL_TIMEOUT}")
     logger.debug(f"EMBEDDING_MODEL_NAME: {settings.EMBEDDING_MODEL_NAME}")
     logger.debug(f"EMBEDDING_BATCH_SIZE: {settings.EMBEDDING_BATCH_SIZE}")
+    logger.debug(f"EMBEDDING_BACKEND: {settings.EMBEDDING_BACKEND}")
+    logger.debug(f"EMBEDDING_ONNX_CACHE_DIR: {settings.EMBEDDING_ONNX_CACHE_DIR}")
+    logger.debug(f"EMBEDDING_ONNX_QUANTIZATION: {settings.EMBEDDING_ONNX_QUANTIZATION}")
+    logger.debug(f"EMBEDDING_NUM_WORKERS: {settings.EMBEDDING_NUM_WORKERS}")
+    logger.debug(
+        f"EMBEDDING_THREADS_PER_WORKER: {settings.EMBEDDING_THREADS_PER_WORKER}"
+    )
+    logger.debug(f"EMBEDDING_SHARD_SIZE: {settings.EMBEDDING_SHARD_SIZE}")
+    logger.debug(
+        f"QUERY_EMBEDDING_CACHE_ENABLED: {settings.QUERY_EMBEDDING_CACHE_ENABLED}"
+    )
+    logger.debug(f"QUERY_EMBEDDING_CACHE_SIZE: {settings.QUERY_EMBEDDING_CACHE_SIZE}")
+    logger.debug(f"QUERY_EMBEDDING_CACHE_TTL: {settings.QUERY_EMBEDDING_CACHE_TTL}")
+    logger.debug(
+        f"QUERY_EMBEDDING_MAX_BATCH_SIZE: {settings.QUERY_EMBEDDING_MAX_BATCH_SIZE}"
+    )
+    logger.debug(f"QUERY_EMBEDDING_MAX_WAIT_MS: {settings.QUERY_EMBEDDING_MAX_WAIT_MS}")
     logger.debug(f"WHISPER_MODEL_SIZE: {settings.WHISPER_MODEL_SIZE}")
     logger.debug(f"EMBEDDING_DIMENSION: {settings.EMBEDDING_DIMENSION}")
+    logger.debug(f"VECTOR_DATATYPE: {settings.VECTOR_DATATYPE}")
+    logger.debug(f"HNSW_M: {settings.HNSW_M}")
+    logger.debug(f"HNSW_EF_CONSTRUCTION: {settings.HNSW_EF_CONSTRUCTION}")
+    logger.debug(f"HNSW_EF_RUNTIME: {settings.HNSW_EF_RUNTIME}")
+    logger.debug(f"HYBRID_RRF_K: {settings.HYBRID_RRF_K}")
+    logger.debug(f"HYBRID_CANDIDATE_TOP_K: {settings.HYBRID_CANDIDATE_TOP_K}")
+    logger.debug(f"AGENT_SEARCH_MODE: {settings.AGENT_SEARCH_MODE}")
+    logger.debug(f"AGENT_SEARCH_TIMEOUT: {settings.AGENT_SEARCH_TIMEOUT}")
+    logger.debug(f"NODE_PARSER: {settings.NODE_PARSER}")
+    logger.debug(f"CHUNK_SIZE: {settings.CHUNK_SIZE}")
+    logger.debug(f"CHUNK_OVERLAP: {settings.CHUNK_OVERLAP}")
+    logger.debug(f"CHUNK_MERGE_ENABLED: {settings.CHUNK_MERGE_ENABLED}")
+    logger.debug(f"CHUNK_MERGE_MAX_GAP: {settings.CHUNK_MERGE_MAX_GAP}")
+    logger.debug(f"SEARCH_CANDIDATE_FACTOR: {settings.SEARCH_CANDIDATE_FACTOR}")
+    logger.debug(
+        f"AGENT_OBSERVATION_TOKEN_LIMIT: {settings.AGENT_OBSERVATION_TOKEN_LIMIT}"
+    )
+    logger.debug(
+        f"AGENT_SCRATCHPAD_TOKEN_BUDGET: {settings.AGENT_SCRATCHPAD_TOKEN_BUDGET}"
+    )
+    logger.debug(
+        f"TOOL_OBSERVATION_CACHE_ENABLED: {settings.TOOL_OBSERVATION_CACHE_ENABLED}"
+    )
+    logger.debug(f"TOOL_OBSERVATION_CACHE_TTL: {settings.TOOL_OBSERVATION_CACHE_TTL}")
+    logger.debug(f"ANSWER_CACHE_ENABLED: {settings.ANSWER_CACHE_ENABLED}")
+    logger.debug(f"ANSWER_CACHE_THRESHOLD: {settings.ANSWER_CACHE_THRESHOLD}")
+    logger.debug(f"ANSWER_CACHE_TTL: {settings.ANSWER_CACHE_TTL}")
+    logger.debug(f"SEARCH_CACHE_ENABLED: {settings.SEARCH_CACHE_ENABLED}")
+    logger.debug(f"SEARCH_CACHE_SIZE: {settings.SEARCH_CACHE_SIZE}")
+    logger.debug(f"RETRIEVAL_MAX_CONCURRENCY: {settings.RETRIEVAL_MAX_CONCURRENCY}")
+    logger.debug(f"RETRIEVAL_MAX_QUEUE_DEPTH: {settings.RETRIEVAL_MAX_QUEUE_DEPTH}")
+    logger.debug(f"LOCAL_REPLICA_ENABLED: {settings.LOCAL_REPLICA_ENABLED}")
+    logger.debug(f"LOCAL_REPLICA_DIR: {settings.LOCAL_REPLICA_DIR}")
+    logger.debug(
+        f"LOCAL_REPLICA_REFRESH_INTERVAL: {settings.LOCAL_REPLICA_REFRESH_INTERVAL}"
+    )
+    logger.debug(f"DOCUMENT_SOURCE: {settings.DOCUMENT_SOURCE}")
+    logger.debug(f"LOCAL_DOCUMENTS_DIR: {settings.LOCAL_DOCUMENTS_DIR}")
+    logger.debug(f"INDEX_SYNC_MODE: {settings.INDEX_SYNC_MODE}")
+    logger.debug(f"INDEX_SYNC_BATCH_SIZE: {settings.INDEX_SYNC_BATCH_SIZE}")
+    logger.debug(f"INDEX_SYNC_ON_STARTUP: {settings.INDEX_SYNC_ON_STARTUP}")
+    logger.debug(f"INGESTION_MAX_RETRIES: {settings.INGESTION_MAX_RETRIES}")
+    logger.debug(f"INGESTION_RETRY_BACKOFF: {settings.INGESTION_RETRY_BACKOFF}")
+    logger.debug(f"INGESTION_RETRY_MAX_BACKOFF: {settings.INGESTION_RETRY_MAX_BACKOFF}")
     return settings
@@ -0,0 +1,97 @@
+# KONSPECTO/backend/app/core/metrics.py
+
+import bisect
+import logging
+import threading
+
+from typing import Any, Callable, Dict, Sequence
+
+logger = logging.getLogger("app.core.metrics")
+
+
+class MetricsRegistry:
+    """
+    Process-wide registry of runtime metrics.
+
+    Components register a provider that returns a snapshot of their counters;
+    the snapshots are collected on demand by the metrics endpoint.
+    """
+
+    def __init__(self):
+        self._providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, provider: Callable[[], Dict[str, Any]]):
+        """
+        Registers (or replaces) the metrics provider of a component.
+
+        :param name: Name of the component in the metrics output.
+        :param provider: Callable returning the current metrics of the component.
+        """
+        with self._lock:
+            self._providers[name] = provider
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the current metrics of all registered components.
+        """
+        with self._lock:
+            providers = dict(self._providers)
+
+        metrics = {}
+        for name, provider in providers.items():
+            try:
+                metrics[name] = provider()
+            except Exception:
+                logger.exception(f"Failed to collect metrics of '{name}'.")
+        return metrics
+
+
+class Histogram:
+    """
+    Thread-safe histogram with fixed bucket upper bounds.
+
+    Snapshots report cumulative bucket counts ("le_<bound>"), like Prometheus
+    histograms, so the distribution can be read without storing observations.
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = sorted(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """
+        Records a single observation.
+        """
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the count, sum, mean and cumulative bucket counts.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        buckets = {}
+        cumulative = 0
+        for bound, bucket_count in zip(self.bounds, counts):
+            cumulative += bucket_count
+            buckets[f"le_{bound:g}"] = cumulative
+        buckets["le_inf"] = count
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "buckets": buckets,
+        }
+
+
+metrics_registry = MetricsRegistry()
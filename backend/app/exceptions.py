@@ -1,5 +1,9 @@
 from fastapi import HTTPException
-from starlette.status import HTTP_400_BAD_REQUEST, HTTP_500_INTERNAL_SERVER_ERROR
+from starlette.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_503_SERVICE_UNAVAILABLE,
+)
 
 
 class InvalidYouTubeURLException(HTTPException):
@@ -10,3 +14,14 @@ class InvalidYouTubeURLException(HTTPException):
 class VideoProcessingError(HTTPException):
     def __init__(self, detail: str = "Не удалось обработать видео."):
         super().__init__(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=detail)
+
+
+class SearchOverloadedError(HTTPException):
+    def __init__(
+        self, detail: str = "Сервис поиска перегружен. Повторите запрос позже."
+    ):
+        super().__init__(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": "1"},
+        )
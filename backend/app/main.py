@@ -4,12 +4,17 @@ import logging
 
 from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from .api.v1.api import api_router
 from .core.config import get_settings  # Updated import
 from .core.logging_config import setup_logging
-from .services.index_service import get_query_engine  # Added import
+from .services.ingestion_worker import IngestionWorker
+from .services.llm.http_client import close_llm_http_client
+from .services.local_replica import stop_local_replica
 from .services.redis_service import RedisService
+from .services.retrieval_executor import shutdown_retrieval_executor
+from .services.vector_db import IndexManager
 
 # New imports for transcription models
 from .services.transcription.whisper_model import WhisperTranscriptionModel
@@ -48,6 +53,8 @@ class KonspectoAPIApp:
     def _setup_services(self):
         """Initialize services such as Redis."""
         self.redis_service = RedisService()
+        self.ingestion_worker = IngestionWorker()
+        self.app.state.ingestion_worker = self.ingestion_worker
 
     def _get_redis_service(self):
         """Dependency to get an instance of RedisService."""
@@ -89,15 +96,23 @@ class KonspectoAPIApp:
             self.logger.exception("Failed to initialize transcription model.")
             raise
 
-        # Initialize query engine at startup
-        self.logger.info("Initializing query engine...")
-        query_engine = get_query_engine()
-        # If needed, you can store it in app.state for use elsewhere
-        self.app.state.query_engine = query_engine
-        self.logger.info("Query engine initialized successfully.")
+        # Load the index and sync documents in the background, so the application
+        # starts accepting requests without waiting for ingestion
+        self.logger.info("Startup: Starting background ingestion worker...")
+        self.ingestion_worker.start(sync=settings.INDEX_SYNC_ON_STARTUP)
 
     async def _shutdown_event(self):
         """Event handler for application shutdown."""
+        self.logger.info("Shutdown: Stopping ingestion worker...")
+        await self.ingestion_worker.stop()
+        self.logger.info("Shutdown: Stopping retrieval executor...")
+        shutdown_retrieval_executor()
+        self.logger.info("Shutdown: Stopping embedding workers and batcher...")
+        IndexManager().shutdown()
+        self.logger.info("Shutdown: Stopping local replica...")
+        stop_local_replica()
+        self.logger.info("Shutdown: Closing LLM HTTP client...")
+        await close_llm_http_client()
         self.logger.info("Shutdown: Closing Redis connection...")
         await self.redis_service.close()
 
@@ -107,6 +122,9 @@ class KonspectoAPIApp:
         self.app.add_api_route(
             "/health", self._health_check_endpoint, methods=["GET"], tags=["Health"]
         )
+        self.app.add_api_route(
+            "/ready", self._readiness_endpoint, methods=["GET"], tags=["Health"]
+        )
 
         # Include API Router without global dependencies
         self.app.include_router(
@@ -141,6 +159,24 @@ class KonspectoAPIApp:
                 "error": str(e),
             }
 
+    async def _readiness_endpoint(self) -> JSONResponse:
+        """
+        Endpoint for checking whether the application can serve searches.
+
+        Unlike /health (liveness), readiness depends on the vector index being
+        loaded. It stays ready while documents are being synchronized, so
+        orchestrators do not restart the service during long syncs.
+        """
+        ready = self.ingestion_worker.is_ready
+        return JSONResponse(
+            status_code=200 if ready else 503,
+            content={
+                "status": "ready" if ready else "not_ready",
+                "version": get_settings().PROJECT_VERSION,
+                "ingestion": self.ingestion_worker.status.model_dump(mode="json"),
+            },
+        )
+
     def get_app(self) -> FastAPI:
         """Returns the FastAPI application instance."""
         return self.app
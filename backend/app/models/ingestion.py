@@ -0,0 +1,24 @@
+# KONSPECTO/backend/app/models/ingestion.py
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class IngestionStatus(BaseModel):
+    """
+    Модель состояния фоновой индексации документов.
+    """
+
+    state: str = Field("idle", example="syncing")
+    index_ready: bool = False
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    files_total: int = 0
+    files_processed: int = 0
+    documents_loaded: int = 0
+    documents_skipped: int = 0
+    nodes_ingested: int = 0
+    retries: int = 0
+    error: Optional[str] = None
@@ -1,12 +1,70 @@
 # backend/app/models/search.py
-from datetime import datetime
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+def utc_timestamp(value: datetime) -> float:
+    """
+    Returns the POSIX timestamp of a datetime, treating naive values as UTC.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class SearchFilters(BaseModel):
+    """
+    Constraints on the searched fragments, applied inside the Redis KNN query.
+
+    A file id or name may be a single value or a list of alternatives. Date
+    bounds are inclusive; naive datetimes are treated as UTC.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    file_id: Optional[Union[str, List[str]]] = Field(None, example="1a2B3c")
+    file_name: Optional[Union[str, List[str]]] = Field(
+        None, example=["lecture_1.docx", "lecture_2.docx"]
+    )
+    modified_after: Optional[datetime] = Field(None, example="2024-09-01T00:00:00Z")
+    modified_before: Optional[datetime] = Field(None, example="2025-01-01T00:00:00Z")
+
+    @model_validator(mode="after")
+    def check_date_range(self):
+        if (
+            self.modified_after is not None
+            and self.modified_before is not None
+            and utc_timestamp(self.modified_after) > utc_timestamp(self.modified_before)
+        ):
+            raise ValueError("modified_after must not be later than modified_before.")
+        return self
 
 
 class SearchRequest(BaseModel):
     query: str = Field(..., example="Find relevant documents about AI")
+    top_k: int = Field(1, ge=1, le=50, example=3)
+    score_threshold: Optional[float] = Field(None, ge=-1.0, le=1.0, example=0.8)
+    filters: Optional[SearchFilters] = Field(
+        None, example={"file_name": "lecture_1.docx"}
+    )
+    mode: Literal["vector", "hybrid"] = Field("vector", example="hybrid")
+
+
+class BatchSearchRequest(BaseModel):
+    queries: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=200,
+        example=["преобразование Фурье", "градиентный спуск"],
+    )
+    top_k: int = Field(1, ge=1, le=50, example=3)
+    score_threshold: Optional[float] = Field(None, ge=-1.0, le=1.0, example=0.8)
+    filters: Optional[SearchFilters] = Field(
+        None, example={"file_name": "lecture_1.docx"}
+    )
+    mode: Literal["vector", "hybrid"] = Field("vector", example="hybrid")
 
 
 class SearchItem(BaseModel):
@@ -21,3 +79,12 @@ class SearchItem(BaseModel):
 
 class SearchResult(BaseModel):
     results: List[SearchItem]
+
+
+class QuerySearchResult(BaseModel):
+    query: str
+    results: List[SearchItem]
+
+
+class BatchSearchResult(BaseModel):
+    results: List[QuerySearchResult]
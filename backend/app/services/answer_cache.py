@@ -0,0 +1,278 @@
+# KONSPECTO/backend/app/services/answer_cache.py
+
+import hashlib
+import logging
+import threading
+import time
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from redis import Redis
+from redisvl.index import SearchIndex
+from redisvl.query import VectorQuery
+from redisvl.query.filter import Num
+from redisvl.schema import IndexSchema
+
+from ..core.config import get_settings
+from ..core.metrics import Histogram, metrics_registry
+from .embedding_cache import normalize_query
+from .index_service import get_query_embeddings
+from .vector_db import IndexManager
+
+logger = logging.getLogger("app.services.answer_cache")
+
+ANSWER_CACHE_INDEX_NAME = "agent_answers"
+ANSWER_CACHE_PREFIX = "agent_answer"
+
+LOOKUP_MS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250)
+
+
+def build_answer_cache_schema(dims: int) -> IndexSchema:
+    """
+    Builds the Redis schema of the answer cache index.
+
+    The cache holds few entries compared to the document index, so the vectors
+    are searched exactly (FLAT).
+
+    :param dims: Dimension of the query embeddings.
+    :return: IndexSchema of the 'agent_answers' index.
+    """
+    return IndexSchema.from_dict(
+        {
+            "index": {"name": ANSWER_CACHE_INDEX_NAME, "prefix": ANSWER_CACHE_PREFIX},
+            "fields": [
+                {"type": "numeric", "name": "generation"},
+                {
+                    "type": "vector",
+                    "name": "vector",
+                    "attrs": {
+                        "dims": dims,
+                        "algorithm": "flat",
+                        "distance_metric": "cosine",
+                        "datatype": "float32",
+                    },
+                },
+            ],
+        }
+    )
+
+
+@dataclass
+class AnswerLookup:
+    """
+    Result of an answer cache lookup: the cached answer on a hit, and on a miss
+    the query embedding and index generation to store the new answer with.
+    """
+
+    query: str
+    embedding: List[float]
+    generation: int
+    answer: Optional[str] = None
+    similarity: Optional[float] = None
+
+
+class SemanticAnswerCache:
+    """
+    Redis cache of agent answers, looked up by query embedding similarity.
+
+    A question is answered from the cache when a question asked at the same index
+    generation has a cosine similarity of at least the threshold. Entries expire
+    after the TTL; entries of older generations are never matched, so answers do
+    not outlive the index contents they were built from. Redis errors are logged
+    and treated as misses.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        dims: int,
+        threshold: float = 0.95,
+        ttl: int = 86400,
+    ):
+        self.redis_client = redis_client
+        self.threshold = threshold
+        self.ttl = ttl
+        self.dims = dims
+        self._index: Optional[SearchIndex] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0
+        self.seconds_saved = 0.0
+        self._lookup_ms = Histogram(LOOKUP_MS_BUCKETS)
+
+    def _ensure_index(self) -> SearchIndex:
+        if self._index is None:
+            index = SearchIndex(
+                build_answer_cache_schema(self.dims), redis_client=self.redis_client
+            )
+            index.create(overwrite=False)
+            self._index = index
+        return self._index
+
+    @staticmethod
+    def build_query(embedding: List[float], generation: int) -> VectorQuery:
+        """
+        Builds the KNN query of the closest cached entry of the generation.
+        """
+        return VectorQuery(
+            vector=embedding,
+            vector_field_name="vector",
+            return_fields=["answer", "elapsed"],
+            filter_expression=Num("generation") == generation,
+            num_results=1,
+        )
+
+    def _nearest(
+        self, embedding: List[float], generation: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns the closest cached entry of the generation, or None.
+        """
+        results = self._ensure_index().query(self.build_query(embedding, generation))
+        return results[0] if results else None
+
+    def lookup(
+        self, query: str, embedding: List[float], generation: int
+    ) -> AnswerLookup:
+        """
+        Looks up the cached answer of a query.
+
+        :param query: Query text.
+        :param embedding: Query embedding.
+        :param generation: Current index generation.
+        :return: AnswerLookup with the answer set on a hit.
+        """
+        lookup = AnswerLookup(query=query, embedding=embedding, generation=generation)
+        started = time.perf_counter()
+        try:
+            entry = self._nearest(embedding, generation)
+        except Exception:
+            logger.warning("Answer cache lookup failed.", exc_info=True)
+            with self._lock:
+                self.errors += 1
+            entry = None
+        lookup_seconds = time.perf_counter() - started
+        self._lookup_ms.observe(lookup_seconds * 1000)
+
+        if entry is not None:
+            # Cosine distance is 1 - cosine similarity
+            lookup.similarity = 1.0 - float(entry["vector_distance"])
+        with self._lock:
+            if lookup.similarity is not None and lookup.similarity >= self.threshold:
+                lookup.answer = entry["answer"]
+                self.hits += 1
+                self.seconds_saved += max(
+                    0.0, float(entry.get("elapsed") or 0.0) - lookup_seconds
+                )
+            else:
+                self.misses += 1
+
+        if lookup.answer is not None:
+            logger.info(
+                f"Answer for '{query}' served from the answer cache "
+                f"(similarity {lookup.similarity:.3f})."
+            )
+        return lookup
+
+    def store(self, lookup: AnswerLookup, answer: str, elapsed: float):
+        """
+        Stores the answer of a missed lookup.
+
+        :param lookup: Lookup that missed; its embedding and generation are stored.
+        :param answer: Final answer of the agent.
+        :param elapsed: Seconds the agent took to answer.
+        """
+        digest = hashlib.sha256(
+            normalize_query(lookup.query).encode("utf-8")
+        ).hexdigest()
+        key = f"{ANSWER_CACHE_PREFIX}:{lookup.generation}:{digest}"
+        try:
+            self._ensure_index()
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hset(
+                key,
+                mapping={
+                    "query": lookup.query,
+                    "answer": answer,
+                    "elapsed": elapsed,
+                    "generation": lookup.generation,
+                    "vector": np.asarray(lookup.embedding, dtype=np.float32).tobytes(),
+                },
+            )
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+        except Exception:
+            logger.warning("Failed to store an answer in the cache.", exc_info=True)
+            with self._lock:
+                self.errors += 1
+            return
+        with self._lock:
+            self.stores += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns hit/miss counters, time saved and the lookup latency histogram.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "errors": self.errors,
+                "seconds_saved": self.seconds_saved,
+                "threshold": self.threshold,
+                "lookup_ms": self._lookup_ms.snapshot(),
+            }
+
+
+_answer_cache: Optional[SemanticAnswerCache] = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> Optional[SemanticAnswerCache]:
+    """
+    Returns the process-wide answer cache, or None if it is disabled.
+    """
+    global _answer_cache
+    settings = get_settings()
+    if not settings.ANSWER_CACHE_ENABLED:
+        return None
+    if _answer_cache is None:
+        redis_client = IndexManager().redis_client
+        if redis_client is None:
+            return None
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                _answer_cache = SemanticAnswerCache(
+                    redis_client,
+                    dims=settings.EMBEDDING_DIMENSION,
+                    threshold=settings.ANSWER_CACHE_THRESHOLD,
+                    ttl=settings.ANSWER_CACHE_TTL,
+                )
+                metrics_registry.register("answer_cache", _answer_cache.get_stats)
+    return _answer_cache
+
+
+def lookup_answer(query: str) -> Optional[AnswerLookup]:
+    """
+    Embeds a query and looks up its cached answer.
+
+    :param query: Query text.
+    :return: AnswerLookup, or None if the cache is disabled or the index
+        generation is unavailable.
+    """
+    cache = get_answer_cache()
+    if cache is None:
+        return None
+    generation = IndexManager().get_generation()
+    if generation is None:
+        return None
+    embedding = get_query_embeddings([query])[0]
+    return cache.lookup(query, embedding, generation)
@@ -0,0 +1,187 @@
+# KONSPECTO/backend/app/services/chunk_merger.py
+
+import logging
+import threading
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from llama_index.core.schema import NodeWithScore
+from llama_index.core.utils import get_tokenizer
+
+from ..core.config import get_settings
+from ..core.metrics import Histogram, metrics_registry
+
+logger = logging.getLogger("app.services.chunk_merger")
+
+TOKENS_SAVED_BUCKETS = (0, 50, 100, 200, 500, 1000, 2000)
+
+
+def _span_key(node_with_score: NodeWithScore) -> Optional[Tuple[str, str]]:
+    """
+    Returns the (file id, source document id) of a node whose text is an exact
+    span of its document, or None if the node cannot be merged.
+
+    Character offsets are relative to the source document, and a file may be
+    loaded as several documents (e.g. PDF pages), so both are part of the key.
+    """
+    node = getattr(node_with_score, "node", None)
+    start = getattr(node, "start_char_idx", None)
+    end = getattr(node, "end_char_idx", None)
+    if start is None or end is None or end - start != len(node.text or ""):
+        return None
+    metadata = getattr(node, "metadata", None) or {}
+    file_id = metadata.get("file_id") or metadata.get("file id")
+    if not file_id:
+        return None
+    return file_id, node.ref_doc_id or ""
+
+
+class ChunkMerger:
+    """
+    Merges retrieved chunks whose spans overlap or touch into single passages.
+
+    With chunk overlap, neighbouring chunks of a file often rank together and
+    repeat the same paragraphs. Chunks of the same source document whose
+    character spans overlap, or are separated by at most max_gap characters
+    (the whitespace stripped between chunks), are joined into one node that
+    keeps the best score, the rank of its best chunk and the metadata of that
+    chunk. Chunks without exact offsets are passed through unchanged.
+    """
+
+    def __init__(self, max_gap: int = 2, tokenizer: Optional[Callable] = None):
+        self.max_gap = max_gap
+        self._tokenizer = tokenizer
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.chunks_in = 0
+        self.chunks_merged = 0
+        self.tokens_saved = 0
+        self._tokens_saved = Histogram(TOKENS_SAVED_BUCKETS)
+
+    def _count_tokens(self, text: str) -> int:
+        if self._tokenizer is None:
+            self._tokenizer = get_tokenizer()
+        return len(self._tokenizer(text))
+
+    def _merge_group(
+        self, group: List[Tuple[int, NodeWithScore]]
+    ) -> List[Tuple[int, NodeWithScore]]:
+        spans = sorted(group, key=lambda item: item[1].node.start_char_idx)
+        runs: List[List[Tuple[int, NodeWithScore]]] = [[spans[0]]]
+        for rank, node_with_score in spans[1:]:
+            run_end = max(item.node.end_char_idx for _, item in runs[-1])
+            if node_with_score.node.start_char_idx <= run_end + self.max_gap:
+                runs[-1].append((rank, node_with_score))
+            else:
+                runs.append([(rank, node_with_score)])
+        return [
+            (min(rank for rank, _ in run), self._join([item for _, item in run]))
+            for run in runs
+        ]
+
+    @staticmethod
+    def _join(run: List[NodeWithScore]) -> NodeWithScore:
+        if len(run) == 1:
+            return run[0]
+
+        text = run[0].node.text
+        end = run[0].node.end_char_idx
+        for item in run[1:]:
+            node = item.node
+            if node.end_char_idx <= end:
+                continue
+            if node.start_char_idx >= end:
+                text += "\n" if node.start_char_idx > end else ""
+                text += node.text
+            else:
+                text += node.text[end - node.start_char_idx :]
+            end = node.end_char_idx
+
+        best = max(run, key=lambda item: item.score or 0.0)
+        node = best.node.model_copy()
+        node.text = text
+        node.start_char_idx = run[0].node.start_char_idx
+        node.end_char_idx = end
+        return NodeWithScore(node=node, score=best.score)
+
+    def merge(self, nodes_with_scores: List[NodeWithScore]) -> List[NodeWithScore]:
+        """
+        Merges overlapping and adjacent chunks of the same document.
+
+        :param nodes_with_scores: Retrieved nodes in rank order.
+        :return: Nodes in the order of their best chunk.
+        """
+        groups: Dict[Any, List[Tuple[int, NodeWithScore]]] = {}
+        for rank, node_with_score in enumerate(nodes_with_scores):
+            key = _span_key(node_with_score)
+            groups.setdefault(key if key is not None else rank, []).append(
+                (rank, node_with_score)
+            )
+
+        ranked: List[Tuple[int, NodeWithScore]] = []
+        for group in groups.values():
+            ranked.extend(group if len(group) == 1 else self._merge_group(group))
+        ranked.sort(key=lambda item: item[0])
+        results = [node_with_score for _, node_with_score in ranked]
+
+        merged_count = len(nodes_with_scores) - len(results)
+        tokens_saved = 0
+        if merged_count:
+            tokens_saved = sum(
+                self._count_tokens(item.node.text or "") for item in nodes_with_scores
+            ) - sum(self._count_tokens(item.node.text or "") for item in results)
+            logger.debug(
+                f"Merged {len(nodes_with_scores)} chunks into {len(results)} "
+                f"passages, saving {tokens_saved} tokens."
+            )
+
+        with self._lock:
+            self.requests += 1
+            self.chunks_in += len(nodes_with_scores)
+            self.chunks_merged += merged_count
+            self.tokens_saved += tokens_saved
+        self._tokens_saved.observe(tokens_saved)
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns merge counters and the histogram of tokens saved per request.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "chunks_in": self.chunks_in,
+                "chunks_merged": self.chunks_merged,
+                "tokens_saved": self.tokens_saved,
+                "tokens_saved_per_request": self._tokens_saved.snapshot(),
+            }
+
+
+_chunk_merger: Optional[ChunkMerger] = None
+_chunk_merger_lock = threading.Lock()
+
+
+def get_chunk_merger() -> Optional[ChunkMerger]:
+    """
+    Returns the process-wide chunk merger, or None if merging is disabled.
+    """
+    global _chunk_merger
+    settings = get_settings()
+    if not settings.CHUNK_MERGE_ENABLED:
+        return None
+    if _chunk_merger is None:
+        with _chunk_merger_lock:
+            if _chunk_merger is None:
+                _chunk_merger = ChunkMerger(max_gap=settings.CHUNK_MERGE_MAX_GAP)
+                metrics_registry.register("chunk_merger", _chunk_merger.get_stats)
+    return _chunk_merger
+
+
+def merge_chunks(nodes_with_scores: List[NodeWithScore]) -> List[NodeWithScore]:
+    """
+    Merges overlapping retrieved chunks if merging is enabled.
+    """
+    merger = get_chunk_merger()
+    if merger is None or len(nodes_with_scores) < 2:
+        return nodes_with_scores
+    return merger.merge(nodes_with_scores)
@@ -0,0 +1,323 @@
+# KONSPECTO/backend/app/services/document_sources.py
+
+import hashlib
+import json
+import logging
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from llama_index.core import Document, SimpleDirectoryReader
+from pydantic import BaseModel
+
+from ..core.config import Settings
+
+logger = logging.getLogger("app.services.document_sources")
+
+GOOGLE_DRIVE_SCOPES = ["https://www.googleapis.com/auth/drive.readonly"]
+GOOGLE_DRIVE_FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+
+class SourceFile(BaseModel):
+    """
+    Lightweight description of a file in a document source.
+
+    Listing a source only returns these descriptors, so the sync cursor can be
+    compared against the source without downloading any file content.
+    """
+
+    file_id: str
+    file_name: str
+    modified_at: str
+    checksum: Optional[str] = None
+
+
+class DocumentSource(ABC):
+    """
+    Abstract source of documents for the vector index.
+    """
+
+    @property
+    @abstractmethod
+    def source_key(self) -> str:
+        """
+        Stable identifier of the source, used as the sync cursor namespace.
+        """
+        pass
+
+    @abstractmethod
+    def list_files(self) -> List[SourceFile]:
+        """
+        Lists all files currently present in the source.
+
+        :return: List of SourceFile descriptors.
+        """
+        pass
+
+    @abstractmethod
+    def load_files(self, file_ids: List[str]) -> List[Document]:
+        """
+        Downloads and parses the given files.
+
+        :param file_ids: Identifiers of the files to load.
+        :return: List of documents. A single file may produce several documents.
+        """
+        pass
+
+
+# GoogleDriveReader metadata keys and their normalized names
+_METADATA_ALIASES = {
+    "file id": "file_id",
+    "file name": "file_name",
+    "modified at": "modified_at",
+}
+
+
+def parse_modified_at(value: Optional[str]) -> Optional[float]:
+    """
+    Parses an ISO 8601 modification time into a POSIX timestamp.
+
+    :return: Timestamp in seconds, or None if the value is empty or invalid.
+    """
+    if not value:
+        return None
+    try:
+        modified_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if modified_at.tzinfo is None:
+        modified_at = modified_at.replace(tzinfo=timezone.utc)
+    return modified_at.timestamp()
+
+
+def normalize_document_metadata(documents: List[Document]) -> List[Document]:
+    """
+    Brings the metadata of loaded documents to the layout indexed by Redis.
+
+    Documents get "file_id", "file_name" and "modified_at" whatever the source,
+    plus "modified_at_ts" (POSIX timestamp) for date range filters. Keys the
+    reader excluded from the embedded and LLM texts stay excluded under their
+    new names, and so does the timestamp.
+
+    :param documents: Loaded documents, modified in place.
+    :return: The same documents.
+    """
+    for document in documents:
+        metadata = document.metadata
+        for alias, key in _METADATA_ALIASES.items():
+            if alias in metadata:
+                value = metadata.pop(alias)
+                metadata.setdefault(key, value)
+        timestamp = parse_modified_at(metadata.get("modified_at"))
+        if timestamp is not None:
+            metadata["modified_at_ts"] = timestamp
+        for excluded in (
+            document.excluded_embed_metadata_keys,
+            document.excluded_llm_metadata_keys,
+        ):
+            excluded[:] = [_METADATA_ALIASES.get(key, key) for key in excluded]
+            if "modified_at_ts" not in excluded:
+                excluded.append("modified_at_ts")
+    return documents
+
+
+def get_document_file_id(document: Document) -> str:
+    """
+    Returns the source file identifier of a document.
+
+    GoogleDriveReader stores it as "file id", while the local source uses "file_id".
+    """
+    metadata = document.metadata
+    return metadata.get("file_id") or metadata.get("file id") or document.id_
+
+
+class GoogleDriveSource(DocumentSource):
+    """
+    Document source backed by a Google Drive folder.
+
+    Files are listed through the Drive v3 API (id, modifiedTime and md5Checksum)
+    and only the requested files are downloaded with GoogleDriveReader.
+    """
+
+    def __init__(self, service_account_key: Dict, folder_id: str):
+        self.service_account_key = service_account_key
+        self.folder_id = folder_id
+        self._service = None
+
+    @property
+    def source_key(self) -> str:
+        return f"gdrive:{self.folder_id}"
+
+    def _get_service(self):
+        if self._service is None:
+            from google.oauth2 import service_account
+            from googleapiclient.discovery import build
+
+            credentials = service_account.Credentials.from_service_account_info(
+                self.service_account_key, scopes=GOOGLE_DRIVE_SCOPES
+            )
+            self._service = build(
+                "drive", "v3", credentials=credentials, cache_discovery=False
+            )
+        return self._service
+
+    def list_files(self) -> List[SourceFile]:
+        service = self._get_service()
+        files: List[SourceFile] = []
+        pending_folders = [self.folder_id]
+
+        while pending_folders:
+            folder_id = pending_folders.pop()
+            page_token = None
+            while True:
+                response = (
+                    service.files()
+                    .list(
+                        q=f"'{folder_id}' in parents and trashed = false",
+                        fields=(
+                            "nextPageToken, "
+                            "files(id, name, mimeType, modifiedTime, md5Checksum)"
+                        ),
+                        pageSize=1000,
+                        pageToken=page_token,
+                        supportsAllDrives=True,
+                        includeItemsFromAllDrives=True,
+                    )
+                    .execute()
+                )
+                for item in response.get("files", []):
+                    if item.get("mimeType") == GOOGLE_DRIVE_FOLDER_MIME_TYPE:
+                        pending_folders.append(item["id"])
+                        continue
+                    files.append(
+                        SourceFile(
+                            file_id=item["id"],
+                            file_name=item.get("name", ""),
+                            modified_at=item.get("modifiedTime", ""),
+                            # Native Google Docs have no md5Checksum
+                            checksum=item.get("md5Checksum"),
+                        )
+                    )
+                page_token = response.get("nextPageToken")
+                if not page_token:
+                    break
+
+        logger.info(
+            f"Listed {len(files)} files in Google Drive folder {self.folder_id}."
+        )
+        return files
+
+    def load_files(self, file_ids: List[str]) -> List[Document]:
+        if not file_ids:
+            return []
+
+        from llama_index.readers.google import GoogleDriveReader
+
+        loader = GoogleDriveReader(service_account_key=self.service_account_key)
+        documents = normalize_document_metadata(loader.load_data(file_ids=file_ids))
+        logger.info(
+            f"Loaded {len(documents)} documents for {len(file_ids)} Google Drive files."
+        )
+        return documents
+
+
+class LocalDirectorySource(DocumentSource):
+    """
+    Document source backed by a local directory.
+
+    Used as a stand-in for Google Drive in tests and local development.
+    File identifiers are paths relative to the root directory.
+    """
+
+    def __init__(self, root_dir: Path):
+        self.root_dir = Path(root_dir).resolve()
+
+    @property
+    def source_key(self) -> str:
+        return f"local:{self.root_dir.as_posix()}"
+
+    def _iter_paths(self) -> List[Path]:
+        return sorted(
+            path
+            for path in self.root_dir.rglob("*")
+            if path.is_file() and not path.name.startswith(".")
+        )
+
+    @staticmethod
+    def _modified_at(path: Path) -> str:
+        return datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc).isoformat()
+
+    def list_files(self) -> List[SourceFile]:
+        files = []
+        for path in self._iter_paths():
+            files.append(
+                SourceFile(
+                    file_id=path.relative_to(self.root_dir).as_posix(),
+                    file_name=path.name,
+                    modified_at=self._modified_at(path),
+                    checksum=hashlib.md5(path.read_bytes()).hexdigest(),
+                )
+            )
+        logger.info(f"Listed {len(files)} files in {self.root_dir}.")
+        return files
+
+    def load_files(self, file_ids: List[str]) -> List[Document]:
+        if not file_ids:
+            return []
+
+        input_files = [self.root_dir / file_id for file_id in file_ids]
+
+        # Only the requested files are stat-ed; listing would hash the whole tree
+        def get_metadata(file_path: str) -> Dict:
+            path = Path(file_path).resolve()
+            return {
+                "file_id": path.relative_to(self.root_dir).as_posix(),
+                "file_name": path.name,
+                "modified_at": self._modified_at(path),
+            }
+
+        reader = SimpleDirectoryReader(
+            input_files=[path.as_posix() for path in input_files],
+            file_metadata=get_metadata,
+            filename_as_id=True,
+        )
+        documents = normalize_document_metadata(reader.load_data())
+        logger.info(
+            f"Loaded {len(documents)} documents for {len(file_ids)} local files."
+        )
+        return documents
+
+
+def get_document_source(settings: Settings) -> DocumentSource:
+    """
+    Builds the document source selected in the settings.
+
+    :param settings: Application settings.
+    :return: Configured DocumentSource instance.
+    """
+    source_name = settings.DOCUMENT_SOURCE.lower()
+    if source_name == "local":
+        if settings.LOCAL_DOCUMENTS_DIR is None:
+            raise ValueError("LOCAL_DOCUMENTS_DIR must be set for the local source.")
+        return LocalDirectorySource(settings.LOCAL_DOCUMENTS_DIR)
+
+    if source_name == "gdrive":
+        service_account_path = Path(settings.GOOGLE_SERVICE_ACCOUNT_KEY_PATH)
+        if not service_account_path.exists():
+            logger.error(
+                f"Service account key file not found at {service_account_path}"
+            )
+            raise FileNotFoundError(
+                f"Service account key file not found at {service_account_path}"
+            )
+
+        with service_account_path.open("r") as f:
+            google_creds_dict = json.load(f)
+
+        return GoogleDriveSource(
+            service_account_key=google_creds_dict, folder_id=settings.FOLDER_ID
+        )
+
+    raise ValueError(f"Unknown document source: {settings.DOCUMENT_SOURCE}")
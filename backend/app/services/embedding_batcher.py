@@ -0,0 +1,188 @@
+# KONSPECTO/backend/app/services/embedding_batcher.py
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from pydantic import PrivateAttr
+
+from ..core.metrics import Histogram
+
+logger = logging.getLogger("app.services.embedding_batcher")
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+WAIT_MS_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100)
+
+
+def embed_query_batch(
+    embed_model: BaseEmbedding, queries: List[str]
+) -> List[Embedding]:
+    """
+    Embeds several queries, in one batched forward pass where the model allows.
+
+    :param embed_model: Embedding model, optionally wrapped by the query embedding
+        cache or the micro-batcher.
+    :param queries: Query texts.
+    :return: Query embeddings in the order of the queries.
+    """
+    if not queries:
+        return []
+    if hasattr(embed_model, "get_query_embedding_batch"):
+        return embed_model.get_query_embedding_batch(queries)
+    return [embed_model.get_query_embedding(query) for query in queries]
+
+
+class MicroBatchingEmbedding(BaseEmbedding):
+    """
+    Embedding model wrapper that batches concurrent query embeddings.
+
+    Queries from all threads are put on a queue. A single batching thread takes
+    the first pending query, keeps collecting for up to max_wait_ms or until
+    max_batch_size queries are pending, and embeds them in one forward pass of
+    the wrapped model. The vectors are then handed back to the waiting callers.
+    Text (document) embeddings are passed through unchanged.
+    """
+
+    _inner: BaseEmbedding = PrivateAttr()
+    _max_batch_size: int = PrivateAttr()
+    _max_wait: float = PrivateAttr()
+    _queue: "queue.Queue[Optional[Tuple[str, Future, float]]]" = PrivateAttr()
+    _thread: Optional[threading.Thread] = PrivateAttr(default=None)
+    _thread_lock: threading.Lock = PrivateAttr()
+    _batch_sizes: Histogram = PrivateAttr()
+    _wait_ms: Histogram = PrivateAttr()
+
+    def __init__(
+        self,
+        inner: BaseEmbedding,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        **kwargs: Any,
+    ):
+        super().__init__(
+            model_name=inner.model_name,
+            embed_batch_size=inner.embed_batch_size,
+            **kwargs,
+        )
+        self._inner = inner
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self._wait_ms = Histogram(WAIT_MS_BUCKETS)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "MicroBatchingEmbedding"
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._thread_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run, name="query-embedding-batcher", daemon=True
+                    )
+                    self._thread.start()
+
+    def _collect_batch(
+        self, first: Tuple[str, Future, float]
+    ) -> Tuple[List[Tuple[str, Future, float]], bool]:
+        batch = [first]
+        deadline = time.perf_counter() + self._max_wait
+        while len(batch) < self._max_batch_size:
+            timeout = deadline - time.perf_counter()
+            try:
+                item = (
+                    self._queue.get(timeout=timeout)
+                    if timeout > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stop = self._collect_batch(first)
+
+            started = time.perf_counter()
+            self._batch_sizes.observe(len(batch))
+            for _, _, enqueued_at in batch:
+                self._wait_ms.observe((started - enqueued_at) * 1000)
+
+            try:
+                embeddings = embed_query_batch(
+                    self._inner, [query for query, _, _ in batch]
+                )
+            except Exception as e:
+                logger.exception(f"Failed to embed a batch of {len(batch)} queries.")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future, _), embedding in zip(batch, embeddings):
+                    future.set_result(embedding)
+
+            if stop:
+                return
+
+    def _submit(self, query: str) -> Future:
+        self._ensure_thread()
+        future: Future = Future()
+        self._queue.put((query, future, time.perf_counter()))
+        return future
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        return self._submit(query).result()
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        return await asyncio.wrap_future(self._submit(query))
+
+    def get_query_embedding_batch(self, queries: List[str]) -> List[Embedding]:
+        """
+        Embeds a batch of queries directly, bypassing the batching queue.
+        """
+        return embed_query_batch(self._inner, queries)
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._inner.get_text_embedding(text)
+
+    async def _aget_text_embedding(self, text: str) -> Embedding:
+        return await self._inner.aget_text_embedding(text)
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        return self._inner.get_text_embedding_batch(texts)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns histograms of batch sizes and of the time queries waited for their
+        batch, in milliseconds.
+        """
+        return {
+            "max_batch_size": self._max_batch_size,
+            "max_wait_ms": self._max_wait * 1000,
+            "pending": self._queue.qsize(),
+            "batch_size": self._batch_sizes.snapshot(),
+            "wait_ms": self._wait_ms.snapshot(),
+        }
+
+    def close(self):
+        """
+        Stops the batching thread after the pending queries are embedded.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
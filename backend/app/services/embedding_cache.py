@@ -0,0 +1,220 @@
+# KONSPECTO/backend/app/services/embedding_cache.py
+
+import hashlib
+import logging
+import threading
+import unicodedata
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from pydantic import PrivateAttr
+from redis import Redis
+
+from .embedding_batcher import embed_query_batch
+
+logger = logging.getLogger("app.services.embedding_cache")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalizes query text: Unicode NFKC form, trimmed, with collapsed whitespace.
+    """
+    return " ".join(unicodedata.normalize("NFKC", query).split())
+
+
+class QueryEmbeddingCache:
+    """
+    Two-tier cache of query embeddings: an in-process LRU in front of Redis.
+
+    Redis entries expire after the configured TTL and are shared by all workers;
+    Redis errors are logged and the cache degrades to the local tier.
+    """
+
+    KEY_PREFIX = "query_embedding"
+
+    def __init__(
+        self,
+        redis_client: Optional[Redis],
+        max_size: int = 1024,
+        ttl: int = 86400,
+    ):
+        self.redis_client = redis_client
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def make_key(self, query: str, model_name: str, instruction: str) -> str:
+        """
+        Builds the cache key of a query for the given model and query instruction.
+        """
+        digest = hashlib.sha256(
+            "\x1f".join([model_name, instruction, normalize_query(query)]).encode(
+                "utf-8"
+            )
+        ).hexdigest()
+        return f"{self.KEY_PREFIX}:{digest}"
+
+    def _put_local(self, key: str, embedding: List[float]):
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """
+        Returns the cached embedding or None.
+        """
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self.local_hits += 1
+                return embedding
+
+        if self.redis_client is not None:
+            try:
+                raw = self.redis_client.get(key)
+            except Exception:
+                logger.warning(
+                    "Query embedding cache: Redis lookup failed.", exc_info=True
+                )
+                raw = None
+            if raw is not None:
+                embedding = np.frombuffer(raw, dtype=np.float32).tolist()
+                self._put_local(key, embedding)
+                with self._lock:
+                    self.redis_hits += 1
+                return embedding
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, embedding: List[float]):
+        """
+        Stores an embedding in both tiers.
+        """
+        self._put_local(key, embedding)
+        if self.redis_client is not None:
+            try:
+                self.redis_client.set(
+                    key, np.asarray(embedding, dtype=np.float32).tobytes(), ex=self.ttl
+                )
+            except Exception:
+                logger.warning(
+                    "Query embedding cache: Redis write failed.", exc_info=True
+                )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns hit/miss counters of the cache.
+        """
+        with self._lock:
+            lookups = self.local_hits + self.redis_hits + self.misses
+            return {
+                "local_hits": self.local_hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "hit_rate": (
+                    (self.local_hits + self.redis_hits) / lookups if lookups else 0.0
+                ),
+                "local_size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+class CachedQueryEmbedding(BaseEmbedding):
+    """
+    Embedding model wrapper that caches query embeddings.
+
+    Queries are normalized before being embedded, so the cached vector is exactly
+    the one the wrapped model produces for the normalized text. Text (document)
+    embeddings are passed through unchanged.
+    """
+
+    _inner: BaseEmbedding = PrivateAttr()
+    _cache: QueryEmbeddingCache = PrivateAttr()
+    _cache_namespace: str = PrivateAttr()
+    _instruction: str = PrivateAttr()
+
+    def __init__(
+        self,
+        inner: BaseEmbedding,
+        cache: QueryEmbeddingCache,
+        cache_namespace: str,
+        instruction: str = "",
+        **kwargs: Any,
+    ):
+        super().__init__(
+            model_name=inner.model_name,
+            embed_batch_size=inner.embed_batch_size,
+            **kwargs,
+        )
+        self._inner = inner
+        self._cache = cache
+        self._cache_namespace = cache_namespace
+        self._instruction = instruction
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedQueryEmbedding"
+
+    @property
+    def cache(self) -> QueryEmbeddingCache:
+        return self._cache
+
+    def _cache_key(self, query: str) -> str:
+        return self._cache.make_key(query, self._cache_namespace, self._instruction)
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        key = self._cache_key(query)
+        embedding = self._cache.get(key)
+        if embedding is None:
+            embedding = self._inner.get_query_embedding(normalize_query(query))
+            self._cache.put(key, embedding)
+        return embedding
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        key = self._cache_key(query)
+        embedding = self._cache.get(key)
+        if embedding is None:
+            embedding = await self._inner.aget_query_embedding(normalize_query(query))
+            self._cache.put(key, embedding)
+        return embedding
+
+    def get_query_embedding_batch(self, queries: List[str]) -> List[Embedding]:
+        """
+        Embeds several queries; cache misses are embedded in one batch.
+        """
+        keys = [self._cache_key(query) for query in queries]
+        embeddings: List[Optional[Embedding]] = [self._cache.get(key) for key in keys]
+
+        missing = [
+            index for index, embedding in enumerate(embeddings) if embedding is None
+        ]
+        if missing:
+            computed = embed_query_batch(
+                self._inner, [normalize_query(queries[index]) for index in missing]
+            )
+            for index, embedding in zip(missing, computed):
+                self._cache.put(keys[index], embedding)
+                embeddings[index] = embedding
+        return embeddings
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._inner.get_text_embedding(text)
+
+    async def _aget_text_embedding(self, text: str) -> Embedding:
+        return await self._inner.aget_text_embedding(text)
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        return self._inner.get_text_embedding_batch(texts)
@@ -0,0 +1,166 @@
+# KONSPECTO/backend/app/services/embeddings.py
+
+import logging
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import torch
+
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+from ..core.config import Settings
+
+logger = logging.getLogger("app.services.embeddings")
+
+QUERY_INSTRUCTION = "Represent the question for retrieving supporting documents: "
+TEXT_INSTRUCTION = "Represent the document for retrieval: "
+
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+ONNX_MODEL_FILE = "onnx/model.onnx"
+
+
+class BatchedQueryEmbedding(HuggingFaceEmbedding):
+    """
+    HuggingFaceEmbedding that can embed several queries in one forward pass.
+
+    The base class only embeds queries one at a time. Batched queries get the
+    query instruction through the "query" prompt, exactly like single ones.
+    """
+
+    def get_query_embedding_batch(self, queries: List[str]) -> List[Embedding]:
+        """
+        Returns the embeddings of the queries in their order.
+        """
+        if not queries:
+            return []
+        return self._embed(queries, prompt_name="query")
+
+
+def get_device() -> str:
+    """
+    Returns the best available torch device.
+    """
+    return (
+        "mps"
+        if torch.backends.mps.is_available()
+        else "cuda"
+        if torch.cuda.is_available()
+        else "cpu"
+    )
+
+
+def get_onnx_model_dir(settings: Settings) -> Path:
+    """
+    Returns the local directory of the exported ONNX model.
+    """
+    return Path(
+        settings.EMBEDDING_ONNX_CACHE_DIR
+    ) / settings.EMBEDDING_MODEL_NAME.replace("/", "__")
+
+
+def get_quantized_model_file(settings: Settings) -> str:
+    """
+    Returns the path of the int8 model, relative to the ONNX model directory.
+    """
+    return f"onnx/model_qint8_{settings.EMBEDDING_ONNX_QUANTIZATION}.onnx"
+
+
+def export_onnx_model(settings: Settings) -> Path:
+    """
+    Exports the embedding model to ONNX and, for the "onnx-int8" backend, quantizes
+    it with dynamic int8 quantization. Exported models are cached locally and
+    reused on the next start.
+
+    :param settings: Application settings.
+    :return: Directory of the exported model.
+    """
+    try:
+        from sentence_transformers import (
+            SentenceTransformer,
+            export_dynamic_quantized_onnx_model,
+        )
+    except ImportError as e:
+        raise ImportError(
+            "ONNX embedding backends require sentence-transformers with ONNX support: "
+            "pip install 'optimum[onnxruntime]'"
+        ) from e
+
+    model_dir = get_onnx_model_dir(settings)
+
+    if not (model_dir / ONNX_MODEL_FILE).exists():
+        logger.info(
+            f"Exporting '{settings.EMBEDDING_MODEL_NAME}' to ONNX in {model_dir}..."
+        )
+        model = SentenceTransformer(settings.EMBEDDING_MODEL_NAME, backend="onnx")
+        model.save_pretrained(model_dir.as_posix())
+
+    if settings.EMBEDDING_BACKEND == "onnx-int8":
+        quantized_file = model_dir / get_quantized_model_file(settings)
+        if not quantized_file.exists():
+            logger.info(f"Quantizing ONNX model to int8 in {quantized_file}...")
+            model = SentenceTransformer(model_dir.as_posix(), backend="onnx")
+            export_dynamic_quantized_onnx_model(
+                model,
+                quantization_config=settings.EMBEDDING_ONNX_QUANTIZATION,
+                model_name_or_path=model_dir.as_posix(),
+                file_suffix=f"qint8_{settings.EMBEDDING_ONNX_QUANTIZATION}",
+            )
+
+    return model_dir
+
+
+def build_embed_model(
+    settings: Settings, device: Optional[str] = None
+) -> BaseEmbedding:
+    """
+    Builds the embedding model configured in the settings.
+
+    The "torch" backend runs the fp32 PyTorch model on the best available device.
+    The "onnx" and "onnx-int8" backends run an exported (and optionally quantized)
+    ONNX model with onnxruntime on CPU.
+
+    :param settings: Application settings.
+    :param device: Torch device. Defaults to the best available device.
+    :return: Embedding model instance.
+    """
+    backend = settings.EMBEDDING_BACKEND
+    model_name = settings.EMBEDDING_MODEL_NAME
+    model_kwargs: Dict[str, Any] = {}
+
+    if backend == "torch":
+        device = device or get_device()
+    elif backend in ("onnx", "onnx-int8"):
+        device = "cpu"
+        model_name = export_onnx_model(settings).as_posix()
+        file_name = (
+            get_quantized_model_file(settings)
+            if backend == "onnx-int8"
+            else ONNX_MODEL_FILE
+        )
+        model_kwargs = {
+            "backend": "onnx",
+            "model_kwargs": {
+                "file_name": file_name,
+                "provider": "CPUExecutionProvider",
+            },
+        }
+    else:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+
+    logger.info(f"Using device: {device}")
+
+    embed_model = BatchedQueryEmbedding(
+        model_name=model_name,
+        query_instruction=QUERY_INSTRUCTION,
+        text_instruction=TEXT_INSTRUCTION,
+        embed_batch_size=settings.EMBEDDING_BATCH_SIZE,
+        device=device,
+        **model_kwargs,
+    )
+    logger.info(
+        f"HuggingFaceEmbedding initialized with model '{settings.EMBEDDING_MODEL_NAME}' "
+        f"({backend} backend)."
+    )
+    return embed_model
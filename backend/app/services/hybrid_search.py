@@ -0,0 +1,205 @@
+# KONSPECTO/backend/app/services/hybrid_search.py
+
+import logging
+import re
+
+from typing import Dict, List, Optional
+
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import NodeWithScore, QueryBundle
+from llama_index.core.vector_stores import MetadataFilters
+from llama_index.core.vector_stores.utils import metadata_dict_to_node
+from llama_index.vector_stores.redis.utils import REDIS_LLAMA_FIELD_SPEC
+from redis import Redis
+from redis.commands.search.query import Query
+from redisvl.query.filter import FilterExpression
+
+from .vector_db import FILTER_FIELDS, VECTOR_INDEX_NAME
+
+logger = logging.getLogger("app.services.hybrid_search")
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_full_text_query(query_str: str) -> str:
+    """
+    Builds a RediSearch query matching any term of the text field.
+
+    Only word characters are kept, so the terms need no escaping.
+
+    :param query_str: User query.
+    :return: RediSearch query string, or an empty string if there are no terms.
+    """
+    terms = [term for term in _TERM_PATTERN.findall(query_str) if len(term) > 1]
+    if not terms:
+        return ""
+    return "@text:(" + " | ".join(terms) + ")"
+
+
+def build_filter_expression(filters: Optional[MetadataFilters]) -> str:
+    """
+    Translates metadata filters on indexed fields into a RediSearch filter.
+
+    It matches what the Redis vector store applies to the KNN query, so the
+    full-text query of a hybrid search sees the same documents.
+
+    :param filters: Metadata filters combined with their condition.
+    :return: RediSearch filter, or an empty string if there is nothing to filter.
+    """
+    if filters is None or not filters.filters:
+        return ""
+
+    expressions = []
+    for metadata_filter in filters.filters:
+        if isinstance(metadata_filter, MetadataFilters):
+            nested = build_filter_expression(metadata_filter)
+            if nested:
+                expressions.append(FilterExpression(nested))
+            continue
+        field_type = FILTER_FIELDS.get(metadata_filter.key)
+        if field_type is None:
+            raise ValueError(f"Field '{metadata_filter.key}' is not indexed.")
+        spec = REDIS_LLAMA_FIELD_SPEC[field_type]
+        operator = spec["operators"].get(metadata_filter.operator.value)
+        if operator is None:
+            raise ValueError(
+                f"Operator {metadata_filter.operator.value} is not supported "
+                f"for field '{metadata_filter.key}'."
+            )
+        expressions.append(
+            operator(spec["class"](metadata_filter.key), metadata_filter.value)
+        )
+
+    if not expressions:
+        return ""
+    expression = expressions[0]
+    for other in expressions[1:]:
+        if filters.condition.value == "or":
+            expression = expression | other
+        else:
+            expression = expression & other
+    return str(expression)
+
+
+def reciprocal_rank_fusion(
+    result_lists: List[List[NodeWithScore]], k: int = 60
+) -> List[NodeWithScore]:
+    """
+    Fuses ranked result lists with reciprocal-rank fusion.
+
+    Each node scores sum(1 / (k + rank)) over the lists it appears in.
+
+    :param result_lists: Ranked lists of nodes.
+    :param k: RRF constant; larger values flatten the contribution of top ranks.
+    :return: Nodes ordered by fused score, with the fused score as their score.
+    """
+    fused_scores: Dict[str, float] = {}
+    nodes = {}
+    for results in result_lists:
+        for rank, node_with_score in enumerate(results, start=1):
+            node_id = node_with_score.node.node_id
+            fused_scores[node_id] = fused_scores.get(node_id, 0.0) + 1.0 / (k + rank)
+            nodes.setdefault(node_id, node_with_score.node)
+
+    ranked_ids = sorted(fused_scores, key=fused_scores.get, reverse=True)
+    return [
+        NodeWithScore(node=nodes[node_id], score=fused_scores[node_id])
+        for node_id in ranked_ids
+    ]
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Retriever combining the KNN vector query with a BM25 full-text query on the
+    'text' field of the Redis index.
+
+    Both queries run in the calling thread, so a search holds a single slot of
+    the retrieval executor, and their rankings are fused with RRF, so
+    exact-term matches (formula names, acronyms) surface even when they rank low
+    in embedding space. The score of returned nodes is the fused RRF score, so
+    a cosine score_threshold is applied to the vector candidates before fusion;
+    full-text candidates have no cosine score and are kept.
+    Metadata filters given to the vector retriever must also be given here, so
+    the full-text query is restricted to the same documents.
+    """
+
+    def __init__(
+        self,
+        vector_retriever: BaseRetriever,
+        redis_client: Redis,
+        similarity_top_k: int = 1,
+        candidate_top_k: int = 20,
+        rrf_k: int = 60,
+        filters: Optional[MetadataFilters] = None,
+        score_threshold: Optional[float] = None,
+    ):
+        super().__init__()
+        self._vector_retriever = vector_retriever
+        self._redis_client = redis_client
+        self._similarity_top_k = similarity_top_k
+        self._candidate_top_k = candidate_top_k
+        self._rrf_k = rrf_k
+        self._filter_expression = build_filter_expression(filters)
+        self._score_threshold = score_threshold
+
+    def full_text_search(self, query_str: str) -> List[NodeWithScore]:
+        """
+        Runs the BM25 full-text query against the vector index.
+
+        :param query_str: User query.
+        :return: Nodes ranked by BM25 score.
+        """
+        full_text_query = build_full_text_query(query_str)
+        if not full_text_query:
+            return []
+        if self._filter_expression:
+            full_text_query = f"{full_text_query} {self._filter_expression}"
+
+        query = (
+            Query(full_text_query)
+            .scorer("BM25")
+            .with_scores()
+            .return_fields("text", "_node_content", "_node_type")
+            .paging(0, self._candidate_top_k)
+            .dialect(2)
+        )
+        result = self._redis_client.ft(VECTOR_INDEX_NAME).search(query)
+
+        nodes = []
+        for doc in result.docs:
+            try:
+                node = metadata_dict_to_node(
+                    {
+                        "_node_content": doc._node_content,
+                        "_node_type": doc._node_type,
+                    }
+                )
+                node.text = doc.text
+            except Exception:
+                logger.warning(f"Failed to parse full-text result {doc.id}.")
+                continue
+            nodes.append(NodeWithScore(node=node, score=float(doc.score)))
+        return nodes
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        vector_results = self._vector_retriever.retrieve(query_bundle)
+        try:
+            text_results = self.full_text_search(query_bundle.query_str)
+        except Exception:
+            logger.exception("Full-text search failed; using vector results only.")
+            text_results = []
+
+        if self._score_threshold is not None:
+            vector_results = [
+                node_with_score
+                for node_with_score in vector_results
+                if node_with_score.score is not None
+                and node_with_score.score >= self._score_threshold
+            ]
+
+        fused = reciprocal_rank_fusion([vector_results, text_results], k=self._rrf_k)
+        logger.debug(
+            f"Hybrid search fused {len(vector_results)} vector and "
+            f"{len(text_results)} full-text results."
+        )
+        return fused[: self._similarity_top_k]
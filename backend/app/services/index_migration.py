@@ -0,0 +1,286 @@
+# KONSPECTO/backend/app/services/index_migration.py
+"""
+Rebuilds the 'gdrive' vector index in the layout configured in the settings.
+
+The stored vectors are converted in place to VECTOR_DATATYPE (no re-embedding is
+needed) and the index is recreated with the configured HNSW parameters and filter
+fields. A memory report of the index before and after the migration is printed.
+
+Nodes ingested before a change of the indexed metadata lack the new fields;
+--reset-sync clears the sync cursor and document fingerprints of the configured
+source, so the next sync re-ingests every file with normalized metadata.
+
+Usage:
+    python -m app.services.index_migration --from-datatype float32 \\
+        [--reset-sync] [--dry-run]
+"""
+
+import argparse
+import logging
+import time
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from redis import Redis
+from redisvl.index import SearchIndex
+
+from ..core.config import Settings, get_settings
+from .document_sources import get_document_source
+from .index_sync import DocumentFingerprintStore, IndexGeneration, SyncCursor
+from .vector_db import VECTOR_INDEX_NAME, VECTOR_INDEX_PREFIX, build_index_schema
+
+logger = logging.getLogger("app.services.index_migration")
+
+BYTES_PER_COMPONENT = {"float32": 4, "float16": 2}
+
+# RediSearch stores HNSW neighbour ids as 4-byte integers
+HNSW_LINK_BYTES = 4
+
+
+def estimate_vector_memory(
+    num_vectors: int, dims: int, datatype: str, m: int
+) -> Dict[str, float]:
+    """
+    Estimates the memory of an HNSW vector index.
+
+    Each element stores its vector, 2*M links on the base layer and on average
+    M/(M-1) additional links on the upper layers.
+
+    :return: Estimated megabytes of vector data, graph links and their total.
+    """
+    vectors_mb = num_vectors * dims * BYTES_PER_COMPONENT[datatype] / 1024**2
+    links_per_element = 2 * m + m / max(1, m - 1)
+    graph_mb = num_vectors * links_per_element * HNSW_LINK_BYTES / 1024**2
+    return {
+        "vectors_mb": vectors_mb,
+        "graph_mb": graph_mb,
+        "total_mb": vectors_mb + graph_mb,
+    }
+
+
+def _info_float(info: Dict[str, Any], key: str) -> float:
+    value = info.get(key, 0)
+    if isinstance(value, bytes):
+        value = value.decode("utf-8")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def get_index_memory_report(
+    redis_client: Redis, index_name: str = VECTOR_INDEX_NAME
+) -> Optional[Dict[str, Any]]:
+    """
+    Reads memory statistics of the vector index from FT.INFO.
+
+    :return: Number of documents, index sizes and vector memory per million
+        vectors, or None if the index does not exist.
+    """
+    try:
+        info = redis_client.ft(index_name).info()
+    except Exception:
+        return None
+
+    num_docs = int(_info_float(info, "num_docs"))
+    vector_index_mb = _info_float(info, "vector_index_sz_mb")
+    return {
+        "num_docs": num_docs,
+        "vector_index_sz_mb": vector_index_mb,
+        "inverted_sz_mb": _info_float(info, "inverted_sz_mb"),
+        "vector_mb_per_million": (
+            vector_index_mb / num_docs * 1_000_000 if num_docs else 0.0
+        ),
+    }
+
+
+def convert_vectors(
+    redis_client: Redis,
+    from_datatype: str,
+    to_datatype: str,
+    dims: int,
+    batch_size: int = 500,
+) -> int:
+    """
+    Converts the stored vectors of all index documents to another datatype.
+
+    Only blobs of dims components of from_datatype are converted, so an
+    interrupted or repeated migration leaves already converted vectors intact.
+
+    :return: Number of converted documents.
+    """
+    source_dtype = np.dtype(from_datatype)
+    target_dtype = np.dtype(to_datatype)
+    source_size = dims * source_dtype.itemsize
+    converted = 0
+    skipped = 0
+    keys = []
+
+    def flush(batch_keys):
+        nonlocal skipped
+        pipe = redis_client.pipeline(transaction=False)
+        for key in batch_keys:
+            pipe.hget(key, "vector")
+        vectors = pipe.execute()
+
+        pipe = redis_client.pipeline(transaction=False)
+        count = 0
+        for key, raw in zip(batch_keys, vectors):
+            if raw is None:
+                continue
+            if len(raw) != source_size:
+                skipped += 1
+                continue
+            vector = np.frombuffer(raw, dtype=source_dtype).astype(target_dtype)
+            pipe.hset(key, "vector", vector.tobytes())
+            count += 1
+        pipe.execute()
+        return count
+
+    for key in redis_client.scan_iter(match=f"{VECTOR_INDEX_PREFIX}:*", count=1000):
+        keys.append(key)
+        if len(keys) >= batch_size:
+            converted += flush(keys)
+            keys = []
+    if keys:
+        converted += flush(keys)
+    if skipped:
+        logger.warning(
+            f"Skipped {skipped} vectors that are not {dims} {from_datatype} "
+            f"components; they may already be converted."
+        )
+    return converted
+
+
+def wait_for_indexing(
+    redis_client: Redis,
+    timeout: float = 3600.0,
+    index_name: str = VECTOR_INDEX_NAME,
+):
+    """
+    Waits until Redis has finished indexing the existing documents.
+    """
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        info = redis_client.ft(index_name).info()
+        if _info_float(info, "indexing") == 0:
+            return
+        time.sleep(1)
+    logger.warning("Timed out waiting for the index to finish indexing.")
+
+
+def migrate_index(
+    settings: Settings, redis_client: Redis, from_datatype: str, dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Rebuilds the vector index with the datatype and HNSW parameters of the settings.
+
+    :param settings: Application settings with the target layout.
+    :param redis_client: Redis client.
+    :param from_datatype: Datatype of the currently stored vectors.
+    :param dry_run: Only report, do not modify anything.
+    :return: Memory report before and after the migration.
+    """
+    before = get_index_memory_report(redis_client)
+    num_docs = before["num_docs"] if before else 0
+    report = {
+        "before": before,
+        "estimate_before": estimate_vector_memory(
+            1_000_000, settings.EMBEDDING_DIMENSION, from_datatype, settings.HNSW_M
+        ),
+        "estimate_after": estimate_vector_memory(
+            1_000_000,
+            settings.EMBEDDING_DIMENSION,
+            settings.VECTOR_DATATYPE,
+            settings.HNSW_M,
+        ),
+    }
+    if dry_run:
+        return report
+
+    if before is not None:
+        logger.info(f"Dropping index '{VECTOR_INDEX_NAME}' (documents are kept)...")
+        redis_client.ft(VECTOR_INDEX_NAME).dropindex(delete_documents=False)
+
+    if from_datatype != settings.VECTOR_DATATYPE:
+        logger.info(
+            f"Converting {num_docs} vectors from {from_datatype} "
+            f"to {settings.VECTOR_DATATYPE}..."
+        )
+        converted = convert_vectors(
+            redis_client,
+            from_datatype,
+            settings.VECTOR_DATATYPE,
+            dims=settings.EMBEDDING_DIMENSION,
+        )
+        logger.info(f"Converted {converted} vectors.")
+
+    logger.info(f"Creating index '{VECTOR_INDEX_NAME}' with the new layout...")
+    SearchIndex(build_index_schema(settings), redis_client=redis_client).create()
+    wait_for_indexing(redis_client)
+    IndexGeneration(redis_client).bump()
+
+    report["after"] = get_index_memory_report(redis_client)
+    return report
+
+
+def reset_sync_state(redis_client: Redis, source_key: str):
+    """
+    Forgets what was ingested from a source, so the next sync loads every file.
+
+    Nodes already in the index are replaced as their documents are re-ingested.
+    """
+    SyncCursor(redis_client, source_key).clear()
+    DocumentFingerprintStore(redis_client, source_key).clear()
+    logger.info(f"Sync state of {source_key} cleared.")
+
+
+def print_report(report: Dict[str, Any]):
+    print("Estimated memory per million vectors (MB):")
+    for name in ("estimate_before", "estimate_after"):
+        estimate = report[name]
+        print(
+            f"  {name}: vectors={estimate['vectors_mb']:.1f} "
+            f"graph={estimate['graph_mb']:.1f} total={estimate['total_mb']:.1f}"
+        )
+    for name in ("before", "after"):
+        measured = report.get(name)
+        if measured:
+            print(
+                f"Measured {name}: docs={measured['num_docs']} "
+                f"vector_index={measured['vector_index_sz_mb']:.1f} MB "
+                f"per million={measured['vector_mb_per_million']:.1f} MB"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--from-datatype",
+        choices=sorted(BYTES_PER_COMPONENT),
+        default="float32",
+        help="Datatype of the vectors currently stored in Redis.",
+    )
+    parser.add_argument(
+        "--reset-sync",
+        action="store_true",
+        help="Re-ingest all files of the document source on the next sync.",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only print the memory report."
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    settings = get_settings()
+    redis_client = Redis.from_url(settings.REDIS_URL)
+    report = migrate_index(settings, redis_client, args.from_datatype, args.dry_run)
+    if args.reset_sync and not args.dry_run:
+        reset_sync_state(redis_client, get_document_source(settings).source_key)
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,21 @@
 
 import logging
 
-from .vector_db import get_index
+from typing import List, Optional
+
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.vector_stores import (
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+
+from ..core.config import get_settings
+from ..models.search import SearchFilters, utc_timestamp
+from .embedding_batcher import embed_query_batch
+from .hybrid_search import HybridRetriever
+from .local_replica import LocalReplicaRetriever, get_local_replica
+from .vector_db import IndexManager, get_index
 
 logger = logging.getLogger("app.services.index_service")
 
@@ -18,3 +32,120 @@ def get_query_engine():
     query_engine = index.as_query_engine(similarity_top_k=1)
     logger.debug("Query engine initialized successfully.")
     return query_engine
+
+
+def build_metadata_filters(
+    filters: Optional[SearchFilters],
+) -> Optional[MetadataFilters]:
+    """
+    Translates search filters into metadata filters on the indexed fields.
+
+    The Redis vector store applies them inside the KNN query, so top_k counts
+    only matching nodes.
+
+    :param filters: Search filters of the request.
+    :return: MetadataFilters, or None if no constraint is set.
+    """
+    if filters is None:
+        return None
+
+    metadata_filters = []
+    for key, value in (("file_id", filters.file_id), ("file_name", filters.file_name)):
+        if value is None:
+            continue
+        if isinstance(value, list):
+            metadata_filters.append(
+                MetadataFilter(key=key, value=value, operator=FilterOperator.IN)
+            )
+        else:
+            metadata_filters.append(MetadataFilter(key=key, value=value))
+    if filters.modified_after is not None:
+        metadata_filters.append(
+            MetadataFilter(
+                key="modified_at_ts",
+                value=utc_timestamp(filters.modified_after),
+                operator=FilterOperator.GTE,
+            )
+        )
+    if filters.modified_before is not None:
+        metadata_filters.append(
+            MetadataFilter(
+                key="modified_at_ts",
+                value=utc_timestamp(filters.modified_before),
+                operator=FilterOperator.LTE,
+            )
+        )
+    return MetadataFilters(filters=metadata_filters) if metadata_filters else None
+
+
+def get_retriever(
+    similarity_top_k: int = 1,
+    filters: Optional[MetadataFilters] = None,
+    mode: str = "vector",
+    score_threshold: Optional[float] = None,
+) -> BaseRetriever:
+    """
+    Returns a retriever over the index.
+
+    Unlike the query engine, the retriever returns scored nodes directly and skips
+    response synthesis, which search callers never use.
+
+    :param similarity_top_k: Number of nodes to retrieve.
+    :param filters: Optional metadata filters passed to the vector store.
+    :param mode: "vector" for the KNN query only, "hybrid" to fuse it with a
+        BM25 full-text query. Unfiltered vector queries are served by the local
+        replica when it is enabled and loaded.
+    :param score_threshold: Minimum cosine similarity of the vector candidates
+        of a hybrid search, applied before fusion since fused RRF scores are not
+        similarities. Vector search results are filtered by the caller.
+    :return: An instance of the retriever.
+    """
+    index = get_index()
+
+    if mode == "hybrid":
+        settings = get_settings()
+        candidate_top_k = max(similarity_top_k, settings.HYBRID_CANDIDATE_TOP_K)
+        retriever = HybridRetriever(
+            vector_retriever=index.as_retriever(
+                similarity_top_k=candidate_top_k, filters=filters
+            ),
+            redis_client=IndexManager().redis_client,
+            similarity_top_k=similarity_top_k,
+            candidate_top_k=candidate_top_k,
+            rrf_k=settings.HYBRID_RRF_K,
+            filters=filters,
+            score_threshold=score_threshold,
+        )
+    elif mode == "vector":
+        replica = get_local_replica() if filters is None else None
+        if replica is not None and replica.is_ready:
+            retriever = LocalReplicaRetriever(
+                replica,
+                embed_model=IndexManager().query_embed_model,
+                similarity_top_k=similarity_top_k,
+            )
+        else:
+            retriever = index.as_retriever(
+                similarity_top_k=similarity_top_k, filters=filters
+            )
+    else:
+        raise ValueError(f"Unknown search mode: {mode}")
+
+    logger.debug(
+        f"Retriever initialized with similarity_top_k={similarity_top_k}, mode={mode}."
+    )
+    return retriever
+
+
+def get_query_embeddings(queries: List[str]) -> List[List[float]]:
+    """
+    Embeds several queries with the query embedding model of the index.
+
+    Cached embeddings are reused and the remaining queries are embedded in one
+    batched forward pass.
+
+    :param queries: Query texts.
+    :return: Query embeddings in the order of the queries.
+    """
+    get_index()
+    return embed_query_batch(IndexManager().query_embed_model, queries)
@@ -0,0 +1,460 @@
+# KONSPECTO/backend/app/services/index_sync.py
+
+import hashlib
+import json
+import logging
+
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from llama_index.core import Document
+from llama_index.core.ingestion import IngestionPipeline
+from pydantic import BaseModel
+from redis import Redis
+
+from .document_sources import DocumentSource, SourceFile, get_document_file_id
+
+logger = logging.getLogger("app.services.index_sync")
+
+
+class CursorEntry(BaseModel):
+    """
+    State of a single file as of the last successful sync.
+    """
+
+    modified_at: str
+    checksum: Optional[str] = None
+    doc_ids: List[str] = []
+    node_parser: Optional[str] = None
+
+
+class SyncDelta(BaseModel):
+    """
+    Difference between the source listing and the sync cursor.
+    """
+
+    added: List[str] = []
+    changed: List[str] = []
+    removed: List[str] = []
+    unchanged: int = 0
+
+    @property
+    def to_fetch(self) -> List[str]:
+        return self.added + self.changed
+
+
+class SyncStats(BaseModel):
+    """
+    Statistics of a single synchronization run.
+    """
+
+    mode: str
+    files_listed: int = 0
+    files_added: int = 0
+    files_changed: int = 0
+    files_removed: int = 0
+    files_unchanged: int = 0
+    documents_loaded: int = 0
+    documents_skipped: int = 0
+    nodes_ingested: int = 0
+
+
+class SyncCursor:
+    """
+    Persisted per-source sync cursor stored as a Redis hash.
+
+    Each field is a file id, each value the CursorEntry of that file.
+    """
+
+    KEY_PREFIX = "index_sync"
+
+    def __init__(self, redis_client: Redis, source_key: str):
+        self.redis_client = redis_client
+        self.key = f"{self.KEY_PREFIX}:{source_key}"
+
+    def load(self) -> Dict[str, CursorEntry]:
+        raw_entries = self.redis_client.hgetall(self.key)
+        entries = {}
+        for file_id, raw_entry in raw_entries.items():
+            if isinstance(file_id, bytes):
+                file_id = file_id.decode("utf-8")
+            entries[file_id] = CursorEntry(**json.loads(raw_entry))
+        return entries
+
+    def update(self, entries: Dict[str, CursorEntry]) -> None:
+        if entries:
+            self.redis_client.hset(
+                self.key,
+                mapping={
+                    file_id: entry.model_dump_json()
+                    for file_id, entry in entries.items()
+                },
+            )
+
+    def remove(self, file_ids: List[str]) -> None:
+        if file_ids:
+            self.redis_client.hdel(self.key, *file_ids)
+
+    def clear(self) -> None:
+        self.redis_client.delete(self.key)
+
+
+class IndexGeneration:
+    """
+    Counter of index writes, stored in Redis and shared by all workers.
+
+    It is bumped whenever nodes are ingested into or deleted from the index, so
+    caches of search results can tell that the index contents changed.
+
+    Every bump also records the ids of the documents it wrote in a sorted set
+    scored by generation, so readers can fetch only what changed since the
+    generation they last saw. A bump without document ids (e.g. after a
+    migration) records FULL_RELOAD instead. The counter and the change log are
+    updated in one transaction, so a generation is never visible before its
+    changes.
+
+    Replicas refresh every few seconds, so only the changes of the last
+    `retention` generations are kept. Older entries are trimmed on bump and the
+    trimmed generation is stored as a floor; a reader behind the floor is told
+    to reload fully.
+    """
+
+    KEY = "index:generation"
+    CHANGES_KEY = "index:changes"
+    CHANGES_FLOOR_KEY = "index:changes:floor"
+    FULL_RELOAD = "*"
+    CHANGES_RETENTION = 1000
+
+    def __init__(self, redis_client: Redis, retention: int = CHANGES_RETENTION):
+        self.redis_client = redis_client
+        self.retention = max(1, retention)
+
+    def get(self) -> int:
+        value = self.redis_client.get(self.KEY)
+        return int(value) if value is not None else 0
+
+    def bump(self, doc_ids: Optional[List[str]] = None) -> int:
+        members = list(doc_ids) if doc_ids is not None else [self.FULL_RELOAD]
+
+        def increment(pipe) -> int:
+            generation = int(pipe.get(self.KEY) or 0) + 1
+            pipe.multi()
+            pipe.set(self.KEY, generation)
+            if members:
+                pipe.zadd(self.CHANGES_KEY, {member: generation for member in members})
+            floor = generation - self.retention
+            if floor > 0:
+                pipe.zremrangebyscore(self.CHANGES_KEY, "-inf", floor)
+                pipe.set(self.CHANGES_FLOOR_KEY, floor)
+            return generation
+
+        return int(
+            self.redis_client.transaction(increment, self.KEY, value_from_callable=True)
+        )
+
+    def changes_since(self, generation: int) -> List[str]:
+        """
+        Returns the ids of documents written after the given generation.
+
+        Each document is listed once, with FULL_RELOAD among them if a write
+        since then was not tracked per document. Only FULL_RELOAD is returned
+        if changes after the generation were already trimmed.
+        """
+        pipe = self.redis_client.pipeline()
+        pipe.get(self.CHANGES_FLOOR_KEY)
+        pipe.zrangebyscore(self.CHANGES_KEY, f"({generation}", "+inf")
+        floor, members = pipe.execute()
+        if floor is not None and generation < int(floor):
+            return [self.FULL_RELOAD]
+        return [
+            member.decode("utf-8") if isinstance(member, bytes) else member
+            for member in members
+        ]
+
+
+class DocumentFingerprintStore:
+    """
+    Per-document fingerprints of the last ingestion, stored as a Redis hash.
+
+    A fingerprint combines the file id, the file version (md5 checksum or
+    modification time), the node parser configuration and the document hash.
+    Documents whose fingerprint is unchanged are dropped before the ingestion
+    pipeline, so they are never split or embedded again.
+    """
+
+    KEY_PREFIX = "index_fingerprint"
+
+    def __init__(self, redis_client: Redis, source_key: str):
+        self.redis_client = redis_client
+        self.key = f"{self.KEY_PREFIX}:{source_key}"
+
+    @staticmethod
+    def compute(
+        document: Document,
+        source_file: Optional[SourceFile],
+        node_parser_key: Optional[str] = None,
+    ) -> str:
+        version = ""
+        if source_file is not None:
+            version = source_file.checksum or source_file.modified_at
+        return hashlib.sha256(
+            "\x1f".join(
+                [
+                    get_document_file_id(document),
+                    version,
+                    node_parser_key or "",
+                    document.hash,
+                ]
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def get_many(self, doc_ids: List[str]) -> Dict[str, str]:
+        if not doc_ids:
+            return {}
+        values = self.redis_client.hmget(self.key, doc_ids)
+        return {
+            doc_id: value.decode("utf-8") if isinstance(value, bytes) else value
+            for doc_id, value in zip(doc_ids, values)
+            if value is not None
+        }
+
+    def update(self, fingerprints: Dict[str, str]) -> None:
+        if fingerprints:
+            self.redis_client.hset(self.key, mapping=fingerprints)
+
+    def remove(self, doc_ids: List[str]) -> None:
+        if doc_ids:
+            self.redis_client.hdel(self.key, *doc_ids)
+
+    def clear(self) -> None:
+        self.redis_client.delete(self.key)
+
+
+def compute_delta(
+    files: List[SourceFile],
+    cursor_entries: Dict[str, CursorEntry],
+    node_parser_key: Optional[str] = None,
+) -> SyncDelta:
+    """
+    Compares the source listing with the cursor.
+
+    A file is considered changed when its checksum differs, or, for files without a
+    checksum (native Google Docs), when its modification time differs. When
+    node_parser_key is given, files chunked by another node parser configuration
+    are changed as well.
+
+    :param files: Current listing of the source.
+    :param cursor_entries: Entries of the sync cursor.
+    :param node_parser_key: Identifier of the current node parser configuration.
+    :return: SyncDelta with added, changed and removed file ids.
+    """
+    delta = SyncDelta()
+    listed_ids = set()
+
+    for source_file in files:
+        listed_ids.add(source_file.file_id)
+        entry = cursor_entries.get(source_file.file_id)
+        if entry is None:
+            delta.added.append(source_file.file_id)
+        elif node_parser_key is not None and entry.node_parser != node_parser_key:
+            delta.changed.append(source_file.file_id)
+        elif source_file.checksum and entry.checksum:
+            if source_file.checksum != entry.checksum:
+                delta.changed.append(source_file.file_id)
+            else:
+                delta.unchanged += 1
+        elif source_file.modified_at != entry.modified_at:
+            delta.changed.append(source_file.file_id)
+        else:
+            delta.unchanged += 1
+
+    delta.removed = [file_id for file_id in cursor_entries if file_id not in listed_ids]
+    return delta
+
+
+class IndexSynchronizer:
+    """
+    Synchronizes a document source into the ingestion pipeline.
+
+    In "delta" mode only added or changed files are downloaded and re-ingested,
+    and the nodes of removed files are deleted. In "full" mode every file is
+    reloaded. Files are processed in batches and the cursor is committed after each
+    batch, so an interrupted sync resumes where it stopped.
+
+    Files last ingested with another node parser configuration are re-chunked:
+    their previous nodes are deleted before the new ones are ingested.
+
+    With a fingerprint store, loaded documents that did not change since their
+    last ingestion (e.g. in "full" mode, or unchanged pages of a changed file)
+    are skipped before any transformation runs.
+
+    The index generation, if given, is bumped after every write to the index.
+    """
+
+    def __init__(
+        self,
+        source: DocumentSource,
+        pipeline: IngestionPipeline,
+        cursor: SyncCursor,
+        batch_size: int = 50,
+        node_parser_key: Optional[str] = None,
+        fingerprints: Optional[DocumentFingerprintStore] = None,
+        generation: Optional[IndexGeneration] = None,
+    ):
+        self.source = source
+        self.pipeline = pipeline
+        self.cursor = cursor
+        self.batch_size = max(1, batch_size)
+        self.node_parser_key = node_parser_key
+        self.fingerprints = fingerprints
+        self.generation = generation
+
+    def _bump_generation(self, doc_ids: List[str]) -> None:
+        if self.generation is not None:
+            self.generation.bump(doc_ids)
+
+    def _delete_documents(self, doc_ids: List[str]) -> None:
+        if not doc_ids:
+            return
+        for doc_id in doc_ids:
+            if self.pipeline.vector_store is not None:
+                self.pipeline.vector_store.delete(doc_id)
+            if self.pipeline.docstore is not None:
+                self.pipeline.docstore.delete_document(doc_id, raise_error=False)
+        if self.fingerprints is not None:
+            self.fingerprints.remove(doc_ids)
+        self._bump_generation(doc_ids)
+
+    def _filter_unchanged(
+        self, documents: List[Document], files_by_id: Dict[str, SourceFile]
+    ) -> Tuple[List[Document], Dict[str, str]]:
+        """
+        Drops documents whose fingerprint matches the stored one.
+
+        :return: Documents to ingest and their new fingerprints.
+        """
+        if self.fingerprints is None:
+            return documents, {}
+
+        fingerprints = {
+            document.id_: self.fingerprints.compute(
+                document,
+                files_by_id.get(get_document_file_id(document)),
+                self.node_parser_key,
+            )
+            for document in documents
+        }
+        stored = self.fingerprints.get_many(list(fingerprints))
+        changed = [
+            document
+            for document in documents
+            if stored.get(document.id_) != fingerprints[document.id_]
+        ]
+        return changed, {
+            document.id_: fingerprints[document.id_] for document in changed
+        }
+
+    def sync(
+        self,
+        mode: str = "delta",
+        progress_callback: Optional[Callable[[SyncStats, int, int], None]] = None,
+    ) -> SyncStats:
+        """
+        Runs one synchronization pass.
+
+        :param mode: "delta" or "full".
+        :param progress_callback: Called with (stats, files_processed, files_total)
+            after the source is listed and after each ingested batch.
+        :return: SyncStats of the run.
+        """
+        if mode not in ("delta", "full"):
+            raise ValueError(f"Unknown sync mode: {mode}")
+
+        files = self.source.list_files()
+        files_by_id = {source_file.file_id: source_file for source_file in files}
+        cursor_entries = self.cursor.load()
+        delta = compute_delta(files, cursor_entries, self.node_parser_key)
+        if mode == "full":
+            delta.changed = [
+                file_id for file_id in files_by_id if file_id in cursor_entries
+            ]
+            delta.unchanged = 0
+
+        stats = SyncStats(
+            mode=mode,
+            files_listed=len(files),
+            files_added=len(delta.added),
+            files_changed=len(delta.changed),
+            files_removed=len(delta.removed),
+            files_unchanged=delta.unchanged,
+        )
+        logger.info(
+            f"Sync delta for {self.source.source_key}: {len(delta.added)} added, "
+            f"{len(delta.changed)} changed, {len(delta.removed)} removed, "
+            f"{delta.unchanged} unchanged."
+        )
+
+        if delta.removed:
+            for file_id in delta.removed:
+                self._delete_documents(cursor_entries[file_id].doc_ids)
+            self.cursor.remove(delta.removed)
+
+        to_fetch = delta.to_fetch
+        if progress_callback is not None:
+            progress_callback(stats, 0, len(to_fetch))
+
+        for start in range(0, len(to_fetch), self.batch_size):
+            batch = to_fetch[start : start + self.batch_size]
+            documents = self.source.load_files(batch)
+
+            doc_ids_by_file: Dict[str, List[str]] = defaultdict(list)
+            for document in documents:
+                doc_ids_by_file[get_document_file_id(document)].append(document.id_)
+
+            # Drop the previous version of changed files, so documents that no
+            # longer exist (e.g. removed pages) do not linger in the index. Files
+            # chunked by another node parser are dropped entirely, otherwise the
+            # docstore would skip their unchanged documents.
+            for file_id in batch:
+                previous = cursor_entries.get(file_id)
+                if previous is None:
+                    continue
+                if (
+                    self.node_parser_key is not None
+                    and previous.node_parser != self.node_parser_key
+                ):
+                    stale = set(previous.doc_ids)
+                else:
+                    stale = set(previous.doc_ids) - set(doc_ids_by_file[file_id])
+                self._delete_documents(sorted(stale))
+
+            to_ingest, fingerprints = self._filter_unchanged(documents, files_by_id)
+            nodes = self.pipeline.run(documents=to_ingest) if to_ingest else []
+            if to_ingest:
+                self._bump_generation([document.id_ for document in to_ingest])
+            stats.documents_loaded += len(documents)
+            stats.documents_skipped += len(documents) - len(to_ingest)
+            stats.nodes_ingested += len(nodes)
+
+            if self.fingerprints is not None:
+                self.fingerprints.update(fingerprints)
+            self.cursor.update(
+                {
+                    file_id: CursorEntry(
+                        modified_at=files_by_id[file_id].modified_at,
+                        checksum=files_by_id[file_id].checksum,
+                        doc_ids=doc_ids_by_file[file_id],
+                        node_parser=self.node_parser_key,
+                    )
+                    for file_id in batch
+                }
+            )
+            logger.info(
+                f"Synced batch of {len(batch)} files: {len(documents)} documents "
+                f"({len(documents) - len(to_ingest)} unchanged), {len(nodes)} nodes "
+                f"({start + len(batch)}/{len(to_fetch)})."
+            )
+            if progress_callback is not None:
+                progress_callback(stats, start + len(batch), len(to_fetch))
+
+        return stats
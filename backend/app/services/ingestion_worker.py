@@ -0,0 +1,162 @@
+# KONSPECTO/backend/app/services/ingestion_worker.py
+
+import asyncio
+import logging
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from ..core.config import get_settings
+from ..models.ingestion import IngestionStatus
+from .index_sync import SyncStats
+from .local_replica import start_local_replica
+from .vector_db import IndexManager
+
+logger = logging.getLogger("app.services.ingestion_worker")
+
+
+class IngestionWorker:
+    """
+    Background worker that brings the vector index up and keeps it in sync.
+
+    The worker first builds the index over the vectors already stored in Redis,
+    which makes the application ready to serve searches, and only then
+    synchronizes the document source. Both steps run in a thread so the event
+    loop keeps answering requests, including health and readiness probes.
+    A failed step is retried up to max_retries times with exponential backoff,
+    so a Redis or source outage at startup does not leave the worker failed
+    until the process restarts.
+    """
+
+    def __init__(
+        self,
+        index_manager: Optional[IndexManager] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        retry_max_backoff: Optional[float] = None,
+    ):
+        settings = get_settings()
+        self.index_manager = index_manager or IndexManager()
+        self.max_retries = (
+            settings.INGESTION_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.retry_backoff = (
+            settings.INGESTION_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+        )
+        self.retry_max_backoff = (
+            settings.INGESTION_RETRY_MAX_BACKOFF
+            if retry_max_backoff is None
+            else retry_max_backoff
+        )
+        self.status = IngestionStatus()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_ready(self) -> bool:
+        """
+        Returns True when the index can serve queries.
+        """
+        return self.index_manager.is_ready()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, sync: bool = True) -> asyncio.Task:
+        """
+        Starts the worker in the running event loop.
+
+        :param sync: Whether to synchronize the document source after loading.
+        :return: The asyncio task of the worker.
+        """
+        if self.is_running:
+            logger.info("Ingestion worker is already running.")
+            return self._task
+        self._task = asyncio.create_task(self._run(sync))
+        return self._task
+
+    async def stop(self):
+        """
+        Cancels the worker task.
+
+        A batch that is already being ingested in the thread finishes on its own;
+        the sync cursor makes the next run resume after the last committed batch.
+        """
+        if self.is_running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                logger.info("Ingestion worker cancelled.")
+
+    def _on_progress(self, stats: SyncStats, files_processed: int, files_total: int):
+        self.status.files_total = files_total
+        self.status.files_processed = files_processed
+        self.status.documents_loaded = stats.documents_loaded
+        self.status.documents_skipped = stats.documents_skipped
+        self.status.nodes_ingested = stats.nodes_ingested
+
+    async def _run_with_retries(self, fn: Callable[..., Any], **kwargs: Any) -> Any:
+        """
+        Runs a blocking step in a thread, retrying it with exponential backoff.
+
+        The worker state is "retrying" while it waits, and is restored before the
+        next attempt. The error of the last attempt is raised once the retries
+        are exhausted.
+        """
+        state = self.status.state
+        attempt = 0
+        while True:
+            try:
+                return await asyncio.to_thread(fn, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = min(self.retry_max_backoff, self.retry_backoff * 2**attempt)
+                attempt += 1
+                logger.warning(
+                    f"Ingestion worker: {state} failed ({e}); "
+                    f"retry {attempt}/{self.max_retries} in {delay:.0f}s.",
+                    exc_info=True,
+                )
+                self.status.state = "retrying"
+                self.status.retries += 1
+                self.status.error = str(e)
+                await asyncio.sleep(delay)
+                self.status.state = state
+
+    async def _run(self, sync: bool):
+        self.status = IngestionStatus(
+            state="loading_index", started_at=datetime.now(timezone.utc)
+        )
+        try:
+            logger.info("Ingestion worker: loading index from the vector store...")
+            await self._run_with_retries(self.index_manager.get_index)
+            self.status.index_ready = True
+            logger.info("Ingestion worker: index is ready to serve queries.")
+
+            try:
+                await asyncio.to_thread(start_local_replica)
+            except Exception:
+                logger.exception("Ingestion worker: failed to load the local replica.")
+
+            if sync:
+                self.status.state = "syncing"
+                logger.info("Ingestion worker: synchronizing documents...")
+                await self._run_with_retries(
+                    self.index_manager.sync_documents,
+                    progress_callback=self._on_progress,
+                )
+            self.status.state = "completed"
+            self.status.error = None
+            logger.info("Ingestion worker: finished.")
+        except asyncio.CancelledError:
+            self.status.state = "cancelled"
+            raise
+        except Exception as e:
+            logger.exception("Ingestion worker failed.")
+            self.status.state = "failed"
+            self.status.error = str(e)
+        finally:
+            self.status.index_ready = self.index_manager.is_ready()
+            self.status.finished_at = datetime.now(timezone.utc)
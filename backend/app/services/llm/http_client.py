@@ -0,0 +1,176 @@
+# KONSPECTO/backend/app/services/llm/http_client.py
+
+import logging
+import threading
+import time
+
+from typing import Any, Dict, Optional
+
+import httpx
+
+from ...core.config import get_settings
+from ...core.metrics import Histogram, metrics_registry
+
+logger = logging.getLogger("app.services.llm.http_client")
+
+CONNECTION_WAIT_MS_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 1000, 5000)
+
+# httpcore trace events that end the wait for a connection of the pool: a new
+# connection is being opened, or the request is sent on a kept-alive one
+NEW_CONNECTION_EVENT = ".connect_tcp.started"
+REQUEST_SENT_EVENT = ".send_request_headers.started"
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Async transport recording the connection pool usage of the requests it sends.
+
+    The time a request waits for a connection is measured from the moment it
+    reaches the pool until httpcore starts opening a new connection or sending
+    the request on a kept-alive one, using httpcore trace events.
+    """
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport, max_connections: int):
+        self._transport = transport
+        self.max_connections = max_connections
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.failed = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self._connection_wait_ms = Histogram(CONNECTION_WAIT_MS_BUCKETS)
+
+    def _start_wait(self):
+        with self._lock:
+            self.requests += 1
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+
+    def _end_wait(self, started: float, new_connection: bool):
+        self._connection_wait_ms.observe((time.perf_counter() - started) * 1000)
+        with self._lock:
+            self.waiting -= 1
+            if new_connection:
+                self.new_connections += 1
+            else:
+                self.reused_connections += 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        connected = False
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            nonlocal connected
+            if not connected and event_name.endswith(
+                (NEW_CONNECTION_EVENT, REQUEST_SENT_EVENT)
+            ):
+                connected = True
+                self._end_wait(started, event_name.endswith(NEW_CONNECTION_EVENT))
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        self._start_wait()
+        try:
+            return await self._transport.handle_async_request(request)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            # Requests that failed or timed out before getting a connection
+            if not connected:
+                with self._lock:
+                    self.waiting -= 1
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns pool usage counters and the connection wait histogram.
+        """
+        pool = getattr(self._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        with self._lock:
+            connected = self.new_connections + self.reused_connections
+            return {
+                "max_connections": self.max_connections,
+                "open_connections": len(connections),
+                "active_connections": len(connections) - idle,
+                "idle_connections": idle,
+                "waiting": self.waiting,
+                "peak_waiting": self.peak_waiting,
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": self.reused_connections,
+                "reuse_rate": self.reused_connections / connected if connected else 0.0,
+                "failed": self.failed,
+                "connection_wait_ms": self._connection_wait_ms.snapshot(),
+            }
+
+
+def build_llm_timeout() -> httpx.Timeout:
+    """
+    Returns the timeouts of requests to the LLM server.
+    """
+    settings = get_settings()
+    # The read timeout applies between two chunks of a streamed response, so it
+    # bounds a stuck generation without limiting long answers
+    return httpx.Timeout(
+        settings.LLM_HTTP_READ_TIMEOUT,
+        connect=settings.LLM_HTTP_CONNECT_TIMEOUT,
+        pool=settings.LLM_HTTP_POOL_TIMEOUT,
+    )
+
+
+_llm_http_client: Optional[httpx.AsyncClient] = None
+_llm_http_client_lock = threading.Lock()
+
+
+def get_llm_http_client() -> httpx.AsyncClient:
+    """
+    Returns the process-wide pooled HTTP client of the LLM server, creating it on
+    first use.
+    """
+    global _llm_http_client
+    if _llm_http_client is None:
+        with _llm_http_client_lock:
+            if _llm_http_client is None:
+                settings = get_settings()
+                transport = InstrumentedTransport(
+                    httpx.AsyncHTTPTransport(
+                        limits=httpx.Limits(
+                            max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                            max_keepalive_connections=(
+                                settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS
+                            ),
+                            keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+                        )
+                    ),
+                    max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                )
+                _llm_http_client = httpx.AsyncClient(
+                    transport=transport, timeout=build_llm_timeout()
+                )
+                metrics_registry.register("llm_http_pool", transport.get_stats)
+                logger.info(
+                    f"LLM HTTP client started with a pool of "
+                    f"{settings.LLM_HTTP_MAX_CONNECTIONS} connections."
+                )
+    return _llm_http_client
+
+
+async def close_llm_http_client():
+    """
+    Closes the pooled HTTP client of the LLM server, if it was created.
+    """
+    global _llm_http_client
+    with _llm_http_client_lock:
+        client, _llm_http_client = _llm_http_client, None
+    if client is not None:
+        await client.aclose()
@@ -2,21 +2,27 @@
 
 from typing import ClassVar
 
-from langchain_community.chat_models import ChatOpenAI
+from langchain_openai import ChatOpenAI
 
 from app.core.config import get_settings  # Импортируем функцию для получения настроек
+from app.services.llm.http_client import build_llm_timeout, get_llm_http_client
 
 
 class LLMStudioClient(ChatOpenAI):
     """
     Клиент для взаимодействия с LLM Studio через интерфейс ChatOpenAI из библиотеки LangChain.
 
+    Асинхронные запросы отправляются через общий для процесса пул HTTP-соединений
+    (см. get_llm_http_client), поэтому соединения с LLM Studio переиспользуются между
+    запросами и экземплярами клиента.
+
     Args:
         temperature (float, optional): Температура сэмплирования. По умолчанию 0.3.
         max_tokens (int, optional): Максимальное количество генерируемых токенов. По умолчанию None.
         model (str, optional): Название модели. По умолчанию "local".
-        timeout (float, optional): Тайм-аут запроса в секундах. По умолчанию None.
-        max_retries (int, optional): Максимальное количество повторных попыток при неудачных запросах. По умолчанию 1.
+        timeout (float, optional): Тайм-аут запроса в секундах. По умолчанию тайм-ауты LLM_HTTP_*_TIMEOUT из настроек.
+        max_retries (int, optional): Максимальное количество повторных попыток при неудачных запросах. По умолчанию LLM_MAX_RETRIES из настроек.
+        streaming (bool, optional): Потоковая генерация; токены передаются в колбэки on_llm_new_token по мере поступления. По умолчанию True.
         **kwargs: Дополнительные именованные аргументы, передаваемые в ChatOpenAI.
     """
 
@@ -28,18 +34,25 @@ class LLMStudioClient(ChatOpenAI):
         max_tokens: int = None,
         model: str = "local",
         timeout: float = None,
-        max_retries: int = 1,
+        max_retries: int = None,
+        streaming: bool = True,
         **kwargs,
     ):
         settings = get_settings()
         base_url = settings.LLM_STUDIO_BASE_URL
 
+        kwargs.setdefault("http_async_client", get_llm_http_client())
+
         super().__init__(
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
-            timeout=timeout,
-            max_retries=max_retries,
+            # Тайм-аут запроса переопределяет тайм-аут HTTP-клиента, поэтому передаётся явно
+            timeout=timeout if timeout is not None else build_llm_timeout(),
+            max_retries=(
+                max_retries if max_retries is not None else settings.LLM_MAX_RETRIES
+            ),
+            streaming=streaming,
             api_key=self.DEFAULT_API_KEY,
             base_url=base_url,
             **kwargs,
@@ -0,0 +1,542 @@
+# KONSPECTO/backend/app/services/local_replica.py
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import BaseNode, NodeWithScore, QueryBundle
+from llama_index.core.vector_stores.utils import metadata_dict_to_node
+from redis import Redis
+from redis.commands.search.query import Query
+from redisvl.query.filter import Tag
+
+from ..core.config import get_settings
+from ..core.metrics import Histogram, metrics_registry
+from .index_sync import IndexGeneration
+from .vector_db import IndexManager, VECTOR_INDEX_NAME, VECTOR_INDEX_PREFIX
+
+logger = logging.getLogger("app.services.local_replica")
+
+SEARCH_MS_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 50)
+
+# Hash fields of an index document read by the replica
+_FIELDS = ("vector", "_node_content", "_node_type", "doc_id", "text")
+
+# Rows converted to float32 at a time while scoring
+_SCORE_BLOCK_ROWS = 4096
+
+# Page size of RediSearch queries listing the nodes of a document
+_KEYS_PAGE_SIZE = 1000
+
+# Datatypes a stored vector may have, recognized by the size of its blob
+_VECTOR_DTYPES = (np.dtype(np.float32), np.dtype(np.float16))
+
+
+def _decode(value: Optional[bytes]) -> Optional[str]:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+class _VectorTable:
+    """
+    Rows of the replica: a memory-mapped float16 matrix of normalized vectors and
+    the compressed node payloads.
+
+    Rows are only appended; deleted rows are masked out and dropped when the
+    table grows. The backing file is unlinked right after it is mapped, so it
+    lives only as long as the mapping and is never left behind.
+    """
+
+    def __init__(self, dims: int, capacity: int, directory: Path):
+        self.dims = dims
+        self.capacity = max(1, capacity)
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix="vectors-", suffix=".f16", dir=directory)
+        try:
+            with os.fdopen(fd, "w+b") as file:
+                self.vectors = np.memmap(
+                    file, dtype=np.float16, mode="w+", shape=(self.capacity, dims)
+                )
+        finally:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        self.size = 0
+        self.node_ids: List[str] = []
+        self.payloads: List[Optional[bytes]] = []
+        self.rows_by_doc: Dict[str, List[int]] = {}
+        self.row_by_node: Dict[str, int] = {}
+
+    @property
+    def live_rows(self) -> int:
+        return len(self.row_by_node)
+
+    def append(self, rows: List[Tuple[str, Optional[str], np.ndarray, bytes]]) -> None:
+        """
+        Appends (node_id, doc_id, vector, payload) rows; the table must have room.
+        """
+        if not rows:
+            return
+        block = np.stack([vector for _, _, vector, _ in rows]).astype(np.float32)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        block /= np.where(norms > 0, norms, 1.0)
+
+        start, end = self.size, self.size + len(rows)
+        self.vectors[start:end] = block.astype(np.float16)
+        for row, (node_id, doc_id, _, payload) in enumerate(rows, start=start):
+            previous = self.row_by_node.get(node_id)
+            if previous is not None:
+                self.alive[previous] = False
+                self.payloads[previous] = None
+            self.node_ids.append(node_id)
+            self.payloads.append(payload)
+            self.row_by_node[node_id] = row
+            if doc_id is not None:
+                self.rows_by_doc.setdefault(doc_id, []).append(row)
+        self.alive[start:end] = True
+        self.size = end
+
+    def remove_document(self, doc_id: str) -> int:
+        """
+        Masks out the rows of a document.
+
+        :return: Number of removed rows.
+        """
+        removed = 0
+        for row in self.rows_by_doc.pop(doc_id, []):
+            if not self.alive[row]:
+                continue
+            self.alive[row] = False
+            self.payloads[row] = None
+            self.row_by_node.pop(self.node_ids[row], None)
+            removed += 1
+        return removed
+
+    def compacted(self, capacity: int) -> "_VectorTable":
+        """
+        Returns a copy of the live rows in a new table of the given capacity.
+        """
+        table = _VectorTable(self.dims, capacity, self.directory)
+        live = np.flatnonzero(self.alive[: self.size])
+        table.vectors[: len(live)] = self.vectors[live]
+        table.alive[: len(live)] = True
+        table.size = len(live)
+        new_rows = {int(row): index for index, row in enumerate(live)}
+        table.node_ids = [self.node_ids[row] for row in live]
+        table.payloads = [self.payloads[row] for row in live]
+        table.row_by_node = {node_id: i for i, node_id in enumerate(table.node_ids)}
+        for doc_id, rows in self.rows_by_doc.items():
+            kept = [new_rows[row] for row in rows if row in new_rows]
+            if kept:
+                table.rows_by_doc[doc_id] = kept
+        return table
+
+    def nbytes(self) -> Tuple[int, int]:
+        payload_bytes = sum(len(p) for p in self.payloads if p is not None)
+        return self.size * self.dims * 2, payload_bytes
+
+
+class LocalVectorReplica:
+    """
+    In-process read replica of the 'gdrive' vector index.
+
+    Vectors are kept normalized in a memory-mapped float16 matrix and searched by
+    exact (brute-force) cosine similarity with NumPy, so a query costs no network
+    round trip. Node texts and metadata are stored zlib-compressed and only
+    decoded for the returned rows.
+
+    The replica follows the index generation: the first refresh loads every
+    document of the index, later ones re-read only the documents recorded in
+    the change log of IndexGeneration since the generation last applied. A
+    background thread can run the refreshes at a fixed interval, so reads never
+    wait for Redis and lag behind writes by at most that interval.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        dims: int,
+        directory: Path,
+        source_datatype: str = "float32",
+        batch_size: int = 500,
+    ):
+        self.redis_client = redis_client
+        self.dims = dims
+        self.directory = Path(directory)
+        self.source_dtype = np.dtype(source_datatype)
+        self.batch_size = max(1, batch_size)
+        self.index_generation = IndexGeneration(redis_client)
+        self.generation: Optional[int] = None
+
+        self._table = _VectorTable(dims, 0, self.directory)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.full_loads = 0
+        self.incremental_refreshes = 0
+        self.documents_refreshed = 0
+        self.refresh_errors = 0
+        self.skipped_vectors = 0
+        self.last_refresh_ms = 0.0
+        self._search_ms = Histogram(SEARCH_MS_BUCKETS)
+
+    @property
+    def is_ready(self) -> bool:
+        """
+        Returns True once the replica has loaded the index.
+        """
+        return self.generation is not None
+
+    def __len__(self) -> int:
+        return self._table.live_rows
+
+    def _decode_vector(self, raw_vector: bytes) -> Optional[np.ndarray]:
+        """
+        Decodes a stored vector, or returns None if its size matches no datatype.
+
+        Vectors are expected in source_datatype, but the blob size decides: an
+        index may hold vectors of another datatype, e.g. written before a
+        VECTOR_DATATYPE migration finished.
+        """
+        dtypes = (self.source_dtype,) + tuple(
+            dtype for dtype in _VECTOR_DTYPES if dtype != self.source_dtype
+        )
+        for dtype in dtypes:
+            if len(raw_vector) == self.dims * dtype.itemsize:
+                return np.frombuffer(raw_vector, dtype=dtype)
+        return None
+
+    def _fetch_rows(
+        self, keys: List[Any]
+    ) -> List[Tuple[str, Optional[str], np.ndarray, bytes]]:
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hmget(key, _FIELDS)
+
+        rows = []
+        for key, values in zip(keys, pipe.execute()):
+            raw_vector, node_content, node_type, doc_id, text = values
+            if raw_vector is None or node_content is None:
+                continue
+            vector = self._decode_vector(raw_vector)
+            if vector is None:
+                logger.warning(
+                    f"Skipping {_decode(key)}: vector of {len(raw_vector)} bytes "
+                    f"does not have {self.dims} dimensions."
+                )
+                self.skipped_vectors += 1
+                continue
+            payload = zlib.compress(
+                json.dumps(
+                    [_decode(node_content), _decode(node_type), _decode(text)],
+                    ensure_ascii=False,
+                ).encode("utf-8")
+            )
+            node_id = _decode(key).split(":", 1)[-1]
+            rows.append((node_id, _decode(doc_id), vector, payload))
+        return rows
+
+    def _append(
+        self,
+        table: _VectorTable,
+        rows: List[Tuple[str, Optional[str], np.ndarray, bytes]],
+    ) -> _VectorTable:
+        """
+        Appends rows, moving the live rows to a larger table when it is full.
+        """
+        if table.size + len(rows) > table.capacity:
+            needed = table.live_rows + len(rows)
+            table = table.compacted(max(2 * needed, 1024))
+        table.append(rows)
+        return table
+
+    def _find_document_keys(self, doc_id: str) -> List[str]:
+        """
+        Lists the keys of the index nodes of a document.
+        """
+        keys = []
+        offset = 0
+        while True:
+            query = (
+                Query(str(Tag("doc_id") == doc_id))
+                .no_content()
+                .paging(offset, _KEYS_PAGE_SIZE)
+                .dialect(2)
+            )
+            result = self.redis_client.ft(VECTOR_INDEX_NAME).search(query)
+            keys.extend(doc.id for doc in result.docs)
+            offset += _KEYS_PAGE_SIZE
+            if len(result.docs) < _KEYS_PAGE_SIZE:
+                return keys
+
+    def _full_load(self) -> None:
+        table = _VectorTable(self.dims, 1024, self.directory)
+        keys = []
+        for key in self.redis_client.scan_iter(
+            match=f"{VECTOR_INDEX_PREFIX}:*", count=1000
+        ):
+            keys.append(key)
+            if len(keys) >= self.batch_size:
+                table = self._append(table, self._fetch_rows(keys))
+                keys = []
+        if keys:
+            table = self._append(table, self._fetch_rows(keys))
+
+        with self._lock:
+            self._table = table
+        self.full_loads += 1
+        logger.info(f"Local replica loaded {table.live_rows} nodes.")
+
+    def _apply_changes(self, doc_ids: List[str]) -> None:
+        for start in range(0, len(doc_ids), self.batch_size):
+            batch = doc_ids[start : start + self.batch_size]
+            keys = [key for doc_id in batch for key in self._find_document_keys(doc_id)]
+            rows = self._fetch_rows(keys) if keys else []
+            with self._lock:
+                table = self._table
+                for doc_id in batch:
+                    table.remove_document(doc_id)
+                self._table = self._append(table, rows)
+        self.incremental_refreshes += 1
+        self.documents_refreshed += len(doc_ids)
+        logger.info(f"Local replica refreshed {len(doc_ids)} documents.")
+
+    def refresh(self) -> bool:
+        """
+        Brings the replica up to the current index generation.
+
+        The generation is read before the index, so writes racing with the
+        refresh are picked up again by the next one.
+
+        :return: True if the replica changed.
+        """
+        with self._refresh_lock:
+            started = time.perf_counter()
+            generation = self.index_generation.get()
+            if generation == self.generation:
+                return False
+
+            if self.generation is None or generation < self.generation:
+                self._full_load()
+            else:
+                changes = self.index_generation.changes_since(self.generation)
+                if IndexGeneration.FULL_RELOAD in changes:
+                    self._full_load()
+                else:
+                    self._apply_changes(changes)
+
+            self.generation = generation
+            self.last_refresh_ms = (time.perf_counter() - started) * 1000
+            return True
+
+    def start(self, interval: float) -> None:
+        """
+        Starts a daemon thread refreshing the replica every interval seconds.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_loop,
+            args=(interval,),
+            name="local-replica-refresh",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the refresh thread.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _refresh_loop(self, interval: float) -> None:
+        while not self._stop_event.wait(interval):
+            try:
+                self.refresh()
+            except Exception:
+                self.refresh_errors += 1
+                logger.exception("Local replica refresh failed.")
+
+    @staticmethod
+    def _to_node(payload: bytes) -> BaseNode:
+        node_content, node_type, text = json.loads(zlib.decompress(payload))
+        node = metadata_dict_to_node(
+            {"_node_content": node_content, "_node_type": node_type}
+        )
+        if text is not None:
+            node.text = text
+        return node
+
+    def search(
+        self, query_embedding: List[float], top_k: int = 1
+    ) -> List[NodeWithScore]:
+        """
+        Returns the top_k nodes by cosine similarity to the query embedding.
+
+        Scores are cosine similarities, like those of the Redis vector store.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            table = self._table
+            size = table.size
+            alive = table.alive[:size].copy()
+        if size == 0 or top_k <= 0 or not alive.any():
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        scores = np.empty(size, dtype=np.float32)
+        for start in range(0, size, _SCORE_BLOCK_ROWS):
+            end = min(start + _SCORE_BLOCK_ROWS, size)
+            scores[start:end] = table.vectors[start:end].astype(np.float32) @ query
+        scores[~alive] = -np.inf
+
+        k = min(top_k, int(alive.sum()))
+        top_rows = np.argpartition(-scores, k - 1)[:k]
+        top_rows = top_rows[np.argsort(-scores[top_rows])]
+
+        results = []
+        for row in top_rows:
+            payload = table.payloads[row]
+            if payload is None:
+                # Removed by a refresh while this search was running
+                continue
+            try:
+                node = self._to_node(payload)
+            except Exception:
+                logger.warning(f"Failed to parse replica node {table.node_ids[row]}.")
+                continue
+            results.append(NodeWithScore(node=node, score=float(scores[row])))
+
+        self._search_ms.observe((time.perf_counter() - started) * 1000)
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns size, refresh and search statistics of the replica.
+        """
+        with self._lock:
+            table = self._table
+            vector_bytes, payload_bytes = table.nbytes()
+            rows, live_rows = table.size, table.live_rows
+        return {
+            "ready": self.is_ready,
+            "generation": self.generation,
+            "nodes": live_rows,
+            "deleted_rows": rows - live_rows,
+            "vectors_mb": vector_bytes / 1024**2,
+            "payloads_mb": payload_bytes / 1024**2,
+            "full_loads": self.full_loads,
+            "incremental_refreshes": self.incremental_refreshes,
+            "documents_refreshed": self.documents_refreshed,
+            "refresh_errors": self.refresh_errors,
+            "skipped_vectors": self.skipped_vectors,
+            "last_refresh_ms": self.last_refresh_ms,
+            "search_ms": self._search_ms.snapshot(),
+        }
+
+
+class LocalReplicaRetriever(BaseRetriever):
+    """
+    Retriever serving vector searches from a LocalVectorReplica.
+    """
+
+    def __init__(
+        self,
+        replica: LocalVectorReplica,
+        embed_model: BaseEmbedding,
+        similarity_top_k: int = 1,
+    ):
+        super().__init__()
+        self._replica = replica
+        self._embed_model = embed_model
+        self._similarity_top_k = similarity_top_k
+
+    @property
+    def generation(self) -> Optional[int]:
+        """
+        Returns the index generation the replica has applied.
+        """
+        return self._replica.generation
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        embedding = query_bundle.embedding
+        if embedding is None:
+            embedding = self._embed_model.get_agg_embedding_from_queries(
+                query_bundle.embedding_strs
+            )
+        return self._replica.search(embedding, self._similarity_top_k)
+
+
+_local_replica: Optional[LocalVectorReplica] = None
+_local_replica_lock = threading.Lock()
+
+
+def get_local_replica() -> Optional[LocalVectorReplica]:
+    """
+    Returns the process-wide local replica, or None if it is disabled or the
+    index has not been initialized yet.
+    """
+    global _local_replica
+    settings = get_settings()
+    if not settings.LOCAL_REPLICA_ENABLED:
+        return None
+    if _local_replica is None:
+        redis_client = IndexManager().redis_client
+        if redis_client is None:
+            return None
+        with _local_replica_lock:
+            if _local_replica is None:
+                _local_replica = LocalVectorReplica(
+                    redis_client,
+                    dims=settings.EMBEDDING_DIMENSION,
+                    directory=settings.LOCAL_REPLICA_DIR,
+                    source_datatype=settings.VECTOR_DATATYPE,
+                )
+                metrics_registry.register("local_replica", _local_replica.get_stats)
+    return _local_replica
+
+
+def start_local_replica() -> Optional[LocalVectorReplica]:
+    """
+    Loads the local replica and starts its refresh thread, if it is enabled.
+    """
+    replica = get_local_replica()
+    if replica is None:
+        return None
+    replica.refresh()
+    replica.start(get_settings().LOCAL_REPLICA_REFRESH_INTERVAL)
+    logger.info(f"Local replica is serving {len(replica)} nodes.")
+    return replica
+
+
+def stop_local_replica() -> None:
+    """
+    Stops the refresh thread of the local replica, if it was started.
+    """
+    if _local_replica is not None:
+        _local_replica.stop()
@@ -0,0 +1,319 @@
+# KONSPECTO/backend/app/services/node_parsers.py
+
+import logging
+import re
+
+from typing import Callable, List, Optional, Tuple
+
+from llama_index.core.callbacks.base import CallbackManager
+from llama_index.core.callbacks.schema import CBEventType, EventPayload
+from llama_index.core.node_parser import NodeParser, SentenceSplitter
+from llama_index.core.node_parser.interface import MetadataAwareTextSplitter
+from llama_index.core.node_parser.node_utils import default_id_func
+from llama_index.core.utils import get_tokenizer
+from pydantic import Field, PrivateAttr
+
+from ..core.config import Settings
+
+logger = logging.getLogger("app.services.node_parsers")
+
+NODE_PARSERS = ("sentence", "structure")
+
+# Markdown headings ("## Title"), multi-level numbered headings ("2.3 Title") and
+# section keywords ("Лекция 4", "Глава 2. ...")
+_HEADING_PATTERNS = [
+    re.compile(r"^\s{0,3}#{1,6}\s+\S"),
+    re.compile(r"^\s*\d+(\.\d+)+\.?\s+\S"),
+    re.compile(
+        r"^\s*(Лекция|Глава|Раздел|Тема|Часть|Chapter|Lecture|Section|Part)\s+\d+",
+        re.IGNORECASE,
+    ),
+]
+
+# Bulleted ("- item", "• item") and enumerated ("1) item", "а. item") list items
+_LIST_ITEM_PATTERN = re.compile(r"^\s*([-*•–]|\d+[.)]|[a-zа-я][.)])\s+\S")
+
+# Lines longer than this are never treated as headings
+MAX_HEADING_CHARS = 120
+
+
+class Block:
+    """
+    Structural block of a document: a heading, a list item or a text paragraph.
+
+    Blocks are located by their character offsets, so chunks built from them are
+    exact substrings of the document text.
+    """
+
+    __slots__ = ("kind", "start", "end", "tokens")
+
+    def __init__(self, kind: str, start: int, end: int, tokens: int):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.tokens = tokens
+
+
+def find_chunk_span(
+    text: str, chunk: str, start: int, end: int
+) -> Optional[Tuple[int, int]]:
+    """
+    Locates a chunk produced by a text splitter in text[start:end].
+
+    Splitters may strip, collapse or replace whitespace, so when the chunk is not
+    an exact substring, its words are matched in order with any whitespace
+    between them.
+
+    :param text: Document text.
+    :param chunk: Chunk returned by the splitter.
+    :param start: Offset to search from.
+    :param end: Offset to search up to.
+    :return: Character span of the chunk in the text, or None if not found.
+    """
+    position = text.find(chunk, start, end)
+    if position >= 0:
+        return position, position + len(chunk)
+
+    words = chunk.split()
+    if not words:
+        return None
+    pattern = re.compile(r"\s+".join(re.escape(word) for word in words))
+    match = pattern.search(text, start, end)
+    if match is None:
+        return None
+    return match.start(), match.end()
+
+
+def classify_line(line: str) -> str:
+    """
+    Classifies a non-empty line as "heading", "list" or "text".
+    """
+    stripped = line.strip()
+    if len(stripped) <= MAX_HEADING_CHARS and not stripped.endswith((".", ",", ";")):
+        if any(pattern.match(line) for pattern in _HEADING_PATTERNS):
+            return "heading"
+        letters = [char for char in stripped if char.isalpha()]
+        if len(letters) >= 3 and all(char.isupper() for char in letters):
+            return "heading"
+    if _LIST_ITEM_PATTERN.match(line):
+        return "list"
+    return "text"
+
+
+class StructureAwareNodeParser(MetadataAwareTextSplitter):
+    """
+    Splits documents along their structure: headings, paragraphs and list items.
+
+    Every non-empty line is a block; blocks are packed greedily into chunks of up
+    to chunk_size tokens. A heading always opens a new chunk (unless the current
+    chunk is shorter than min_chunk_size) and is never left as the last block of a
+    chunk. Overlap is made of whole trailing blocks of the same section and is off
+    by default, so each paragraph is embedded once. Blocks longer than chunk_size
+    are split by a SentenceSplitter.
+    """
+
+    chunk_size: int = Field(
+        default=600, description="Maximum number of tokens per chunk.", gt=0
+    )
+    chunk_overlap: int = Field(
+        default=0,
+        description="Maximum number of tokens repeated from the previous chunk.",
+        ge=0,
+    )
+    min_chunk_size: int = Field(
+        default=64,
+        description="Chunks shorter than this are not closed at a heading.",
+        ge=0,
+    )
+
+    _tokenizer: Callable = PrivateAttr()
+
+    def __init__(
+        self,
+        chunk_size: int = 600,
+        chunk_overlap: int = 0,
+        min_chunk_size: int = 64,
+        tokenizer: Optional[Callable] = None,
+        callback_manager: Optional[CallbackManager] = None,
+        include_metadata: bool = True,
+        include_prev_next_rel: bool = True,
+        id_func: Optional[Callable] = None,
+    ):
+        if chunk_overlap >= chunk_size:
+            raise ValueError(
+                f"Chunk overlap ({chunk_overlap}) must be smaller than chunk size "
+                f"({chunk_size})."
+            )
+        super().__init__(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            min_chunk_size=min_chunk_size,
+            callback_manager=callback_manager or CallbackManager([]),
+            include_metadata=include_metadata,
+            include_prev_next_rel=include_prev_next_rel,
+            id_func=id_func or default_id_func,
+        )
+        self._tokenizer = tokenizer or get_tokenizer()
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "StructureAwareNodeParser"
+
+    def split_text_metadata_aware(self, text: str, metadata_str: str) -> List[str]:
+        metadata_len = len(self._tokenizer(metadata_str))
+        effective_chunk_size = self.chunk_size - metadata_len
+        if effective_chunk_size <= 0:
+            raise ValueError(
+                f"Metadata length ({metadata_len}) is longer than chunk size "
+                f"({self.chunk_size})."
+            )
+        return self._split_text(text, effective_chunk_size)
+
+    def split_text(self, text: str) -> List[str]:
+        return self._split_text(text, self.chunk_size)
+
+    def _count_tokens(self, text: str) -> int:
+        return len(self._tokenizer(text))
+
+    def _iter_blocks(self, text: str) -> List[Block]:
+        blocks = []
+        offset = 0
+        for line in text.splitlines(keepends=True):
+            start = offset
+            offset += len(line)
+            if not line.strip():
+                continue
+            blocks.append(
+                Block(classify_line(line), start, offset, self._count_tokens(line))
+            )
+        return blocks
+
+    def _split_oversized(
+        self, text: str, block: Block, chunk_size: int
+    ) -> List[Tuple[int, int]]:
+        splitter = SentenceSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=min(self.chunk_overlap, chunk_size // 2),
+            tokenizer=self._tokenizer,
+        )
+        spans = []
+        search_from = block.start
+        for chunk in splitter.split_text(text[block.start : block.end]):
+            span = find_chunk_span(text, chunk, search_from, block.end)
+            if span is None:
+                logger.warning(
+                    f"Chunk at offset {search_from} not found in the document text; "
+                    f"skipping it."
+                )
+                continue
+            spans.append(span)
+            search_from = span[0] + 1
+        return spans
+
+    def _pack_blocks(
+        self, text: str, blocks: List[Block], chunk_size: int
+    ) -> List[Tuple[int, int]]:
+        spans: List[Tuple[int, int]] = []
+        current: List[Block] = []
+        current_tokens = 0
+        # Number of leading blocks of the current chunk repeated as overlap
+        overlap_count = 0
+
+        def flush(keep_overlap: bool) -> None:
+            nonlocal current, current_tokens, overlap_count
+            # Trailing headings belong to the next chunk
+            carried: List[Block] = []
+            while current and current[-1].kind == "heading":
+                carried.insert(0, current.pop())
+            if current:
+                spans.append((current[0].start, current[-1].end))
+
+            overlap: List[Block] = []
+            if keep_overlap and self.chunk_overlap > 0 and not carried:
+                overlap_tokens = 0
+                for block in reversed(current[1:]):
+                    if block.kind == "heading":
+                        break
+                    if overlap_tokens + block.tokens > self.chunk_overlap:
+                        break
+                    overlap.insert(0, block)
+                    overlap_tokens += block.tokens
+            current = overlap + carried
+            current_tokens = sum(block.tokens for block in current)
+            overlap_count = len(overlap)
+
+        for block in blocks:
+            if block.tokens > chunk_size:
+                flush(keep_overlap=False)
+                if current:
+                    spans.append((current[0].start, current[-1].end))
+                spans.extend(self._split_oversized(text, block, chunk_size))
+                current, current_tokens, overlap_count = [], 0, 0
+                continue
+
+            if (
+                block.kind == "heading"
+                and current
+                and current[-1].kind != "heading"
+                and current_tokens >= self.min_chunk_size
+            ):
+                flush(keep_overlap=False)
+            elif current and current_tokens + block.tokens > chunk_size:
+                flush(keep_overlap=True)
+                # Overlap must not push the block over the limit
+                while overlap_count and current_tokens + block.tokens > chunk_size:
+                    current_tokens -= current.pop(0).tokens
+                    overlap_count -= 1
+                # Headings that do not fit together with the block stay alone
+                if current and current_tokens + block.tokens > chunk_size:
+                    spans.append((current[0].start, current[-1].end))
+                    current, current_tokens = [], 0
+
+            current.append(block)
+            current_tokens += block.tokens
+
+        if current:
+            spans.append((current[0].start, current[-1].end))
+        return spans
+
+    def _split_text(self, text: str, chunk_size: int) -> List[str]:
+        if text == "":
+            return [text]
+
+        with self.callback_manager.event(
+            CBEventType.CHUNKING, payload={EventPayload.CHUNKS: [text]}
+        ) as event:
+            spans = self._pack_blocks(text, self._iter_blocks(text), chunk_size)
+            chunks = [text[start:end].strip() for start, end in spans]
+            chunks = [chunk for chunk in chunks if chunk]
+            event.on_end(payload={EventPayload.CHUNKS: chunks})
+
+        return chunks
+
+
+def get_node_parser_key(settings: Settings) -> str:
+    """
+    Returns an identifier of the configured node parser and its parameters.
+
+    It is stored in the sync cursor, so files chunked with other settings are
+    re-ingested after the parser configuration changes.
+    """
+    return f"{settings.NODE_PARSER}:{settings.CHUNK_SIZE}:{settings.CHUNK_OVERLAP}"
+
+
+def build_node_parser(settings: Settings) -> NodeParser:
+    """
+    Builds the node parser of the ingestion pipeline selected in the settings.
+
+    :param settings: Application settings.
+    :return: NodeParser instance.
+    """
+    if settings.NODE_PARSER == "structure":
+        return StructureAwareNodeParser(
+            chunk_size=settings.CHUNK_SIZE, chunk_overlap=settings.CHUNK_OVERLAP
+        )
+    return SentenceSplitter(
+        paragraph_separator="\n",
+        chunk_size=settings.CHUNK_SIZE,
+        chunk_overlap=settings.CHUNK_OVERLAP,
+    )
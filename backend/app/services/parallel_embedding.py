@@ -0,0 +1,132 @@
+# KONSPECTO/backend/app/services/parallel_embedding.py
+
+import logging
+import multiprocessing
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Any, List, Optional, Sequence
+
+from llama_index.core.schema import BaseNode, MetadataMode, TransformComponent
+from pydantic import PrivateAttr
+
+from ..core.config import Settings
+
+logger = logging.getLogger("app.services.parallel_embedding")
+
+# Embedding model of the current worker process, created by _init_worker
+_worker_embed_model = None
+
+
+def _init_worker(settings: Settings, num_threads: int):
+    """
+    Initializes a worker process: pins the intra-op thread count and loads its own
+    copy of the embedding model.
+    """
+    global _worker_embed_model
+
+    import torch
+
+    from .embeddings import build_embed_model
+
+    torch.set_num_threads(num_threads)
+    _worker_embed_model = build_embed_model(settings, device="cpu")
+    logger.info(
+        f"Embedding worker {os.getpid()} ready with {num_threads} intra-op threads."
+    )
+
+
+def _embed_shard(texts: List[str]) -> List[List[float]]:
+    return _worker_embed_model.get_text_embedding_batch(texts)
+
+
+def shard(items: Sequence[Any], shard_size: int) -> List[Sequence[Any]]:
+    """
+    Splits a sequence into contiguous shards of at most shard_size items.
+    """
+    shard_size = max(1, shard_size)
+    return [
+        items[start : start + shard_size] for start in range(0, len(items), shard_size)
+    ]
+
+
+def resolve_threads_per_worker(num_workers: int, threads_per_worker: int) -> int:
+    """
+    Returns the intra-op thread count of each worker.
+
+    A non-positive value splits the available cores evenly between the workers.
+    """
+    if threads_per_worker > 0:
+        return threads_per_worker
+    return max(1, (os.cpu_count() or 1) // max(1, num_workers))
+
+
+class ParallelEmbedding(TransformComponent):
+    """
+    Ingestion transformation that embeds nodes in a pool of worker processes.
+
+    Nodes are split into contiguous shards that are embedded by the workers, each
+    holding its own embedding model. Shard results are merged back in the original
+    order, so the pipeline writes nodes to the vector store exactly as the
+    single-process embedding would.
+    """
+
+    model_name: str
+    num_workers: int
+    threads_per_worker: int = 0
+    shard_size: int = 256
+
+    _settings: Settings = PrivateAttr()
+    _executor: Optional[ProcessPoolExecutor] = PrivateAttr(default=None)
+
+    def __init__(self, settings: Settings, **kwargs: Any):
+        super().__init__(
+            model_name=settings.EMBEDDING_MODEL_NAME,
+            num_workers=settings.EMBEDDING_NUM_WORKERS,
+            threads_per_worker=settings.EMBEDDING_THREADS_PER_WORKER,
+            shard_size=settings.EMBEDDING_SHARD_SIZE,
+            **kwargs,
+        )
+        self._settings = settings
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            num_threads = resolve_threads_per_worker(
+                self.num_workers, self.threads_per_worker
+            )
+            logger.info(
+                f"Starting {self.num_workers} embedding workers "
+                f"with {num_threads} threads each."
+            )
+            # Spawned workers do not inherit the torch thread pools of the parent
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._settings, num_threads),
+            )
+        return self._executor
+
+    def __call__(self, nodes: Sequence[BaseNode], **kwargs: Any) -> Sequence[BaseNode]:
+        if not nodes:
+            return nodes
+
+        texts = [node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes]
+        shards = shard(texts, self.shard_size)
+        logger.debug(f"Embedding {len(texts)} nodes in {len(shards)} shards.")
+
+        embeddings = list(
+            chain.from_iterable(self._get_executor().map(_embed_shard, shards))
+        )
+        for node, embedding in zip(nodes, embeddings):
+            node.embedding = embedding
+        return nodes
+
+    def close(self):
+        """
+        Shuts the worker pool down.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,163 @@
+# KONSPECTO/backend/app/services/retrieval_executor.py
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from ..core.config import get_settings
+from ..core.metrics import metrics_registry
+from ..exceptions import SearchOverloadedError
+
+logger = logging.getLogger("app.services.retrieval_executor")
+
+T = TypeVar("T")
+
+
+class RetrievalExecutor:
+    """
+    Bounded thread pool for blocking retrieval work.
+
+    Retrieval (query embedding forward pass plus the Redis KNN query) is
+    synchronous and CPU-bound, so running it on the event loop stalls every other
+    request of the worker. The executor runs it on at most max_concurrency threads
+    and lets up to max_queue_depth calls wait for a thread; calls beyond that are
+    rejected with SearchOverloadedError (HTTP 503) instead of queueing without
+    bound.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_queue_depth: int = 32):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue_depth = max(0, max_queue_depth)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="retrieval"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.peak_pending = 0
+        self.total_wait_seconds = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_concurrency + self.max_queue_depth
+
+    def _acquire(self):
+        with self._lock:
+            if self._pending >= self.capacity:
+                self.rejected += 1
+                raise SearchOverloadedError()
+            self._pending += 1
+            self.peak_pending = max(self.peak_pending, self._pending)
+
+    def _release(self, future: Future):
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def _call(self, submitted_at: float, fn: Callable[[], T]) -> T:
+        with self._lock:
+            self._active += 1
+            self.started += 1
+            self.total_wait_seconds += time.perf_counter() - submitted_at
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Runs a blocking callable on the executor.
+
+        A call stays counted against the queue until its thread finishes, even if
+        the awaiting request is cancelled (e.g. the client disconnected).
+
+        :param fn: Callable to run.
+        :return: Result of the callable.
+        :raises SearchOverloadedError: If the queue of waiting calls is full.
+        """
+        self._acquire()
+        try:
+            future = self._executor.submit(
+                self._call, time.perf_counter(), functools.partial(fn, *args, **kwargs)
+            )
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns counters of the executor.
+        """
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue_depth": self.max_queue_depth,
+                "active": self._active,
+                "queued": self._pending - self._active,
+                "peak_pending": self.peak_pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_queue_wait_ms": (
+                    self.total_wait_seconds / self.started * 1000
+                    if self.started
+                    else 0.0
+                ),
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_retrieval_executor: Optional[RetrievalExecutor] = None
+_retrieval_executor_lock = threading.Lock()
+
+
+def get_retrieval_executor() -> RetrievalExecutor:
+    """
+    Returns the process-wide retrieval executor, creating it on first use.
+    """
+    global _retrieval_executor
+    if _retrieval_executor is None:
+        with _retrieval_executor_lock:
+            if _retrieval_executor is None:
+                settings = get_settings()
+                _retrieval_executor = RetrievalExecutor(
+                    max_concurrency=settings.RETRIEVAL_MAX_CONCURRENCY,
+                    max_queue_depth=settings.RETRIEVAL_MAX_QUEUE_DEPTH,
+                )
+                metrics_registry.register(
+                    "retrieval_executor", _retrieval_executor.get_stats
+                )
+                logger.info(
+                    f"Retrieval executor started with "
+                    f"{_retrieval_executor.max_concurrency} threads."
+                )
+    return _retrieval_executor
+
+
+def shutdown_retrieval_executor():
+    """
+    Shuts the retrieval executor down, if it was started.
+    """
+    global _retrieval_executor
+    with _retrieval_executor_lock:
+        if _retrieval_executor is not None:
+            _retrieval_executor.shutdown()
+            _retrieval_executor = None
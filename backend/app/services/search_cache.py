@@ -0,0 +1,122 @@
+# KONSPECTO/backend/app/services/search_cache.py
+
+import hashlib
+import json
+import logging
+import threading
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from ..core.config import get_settings
+from ..core.metrics import metrics_registry
+from .embedding_cache import normalize_query
+
+logger = logging.getLogger("app.services.search_cache")
+
+
+class SearchResultCache:
+    """
+    In-process LRU cache of search results, versioned by the index generation.
+
+    Keys combine the index generation, the normalized query and the search
+    parameters. When a lookup sees a newer generation than the cached entries,
+    the whole cache is dropped, so results never outlive the index contents
+    they were computed from.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._generation: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(query: str, generation: int, **params: Any) -> str:
+        """
+        Builds the cache key of a query with the given search parameters.
+        """
+        payload = json.dumps(
+            [generation, normalize_query(query), params],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _check_generation(self, generation: int):
+        if self._generation != generation:
+            if self._entries:
+                self.invalidations += 1
+                logger.info(
+                    f"Index generation changed to {generation}; "
+                    f"dropping {len(self._entries)} cached search results."
+                )
+            self._entries.clear()
+            self._generation = generation
+
+    def get(self, key: str, generation: int) -> Optional[List[Any]]:
+        """
+        Returns the cached results or None.
+        """
+        with self._lock:
+            self._check_generation(generation)
+            results = self._entries.get(key)
+            if results is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(results)
+
+    def put(self, key: str, generation: int, results: List[Any]):
+        """
+        Stores results computed at the given index generation.
+        """
+        with self._lock:
+            if self._generation is not None and generation < self._generation:
+                return
+            self._check_generation(generation)
+            self._entries[key] = list(results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns hit/miss counters of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "generation": self._generation,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+_search_cache: Optional[SearchResultCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchResultCache]:
+    """
+    Returns the process-wide search result cache, or None if it is disabled.
+    """
+    global _search_cache
+    settings = get_settings()
+    if not settings.SEARCH_CACHE_ENABLED:
+        return None
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = SearchResultCache(max_size=settings.SEARCH_CACHE_SIZE)
+                metrics_registry.register("search_cache", _search_cache.get_stats)
+    return _search_cache
@@ -1,31 +1,140 @@
 # KONSPECTO/backend/app/services/vector_db.py
 
-import json
 import logging
+import threading
 
-from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import urlparse
 
-import torch
+import numpy as np
 
 from llama_index.core import Settings as LlamaSettings, VectorStoreIndex
+from llama_index.core.base.embeddings.base import BaseEmbedding
 from llama_index.core.ingestion import (
     DocstoreStrategy,
     IngestionCache,
     IngestionPipeline,
 )
-from llama_index.core.node_parser import SentenceSplitter
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-from llama_index.readers.google import GoogleDriveReader
+from llama_index.core.schema import BaseNode
+from llama_index.core.vector_stores.types import VectorStoreQuery
 from llama_index.storage.docstore.redis import RedisDocumentStore
 from llama_index.storage.kvstore.redis import RedisKVStore as RedisCache
 from llama_index.vector_stores.redis import RedisVectorStore
+from redis import Redis
+from redisvl.query import VectorQuery
 from redisvl.schema import IndexSchema
 
-from ..core.config import get_settings
+from ..core.config import Settings, get_settings
+from ..core.metrics import metrics_registry
+from .document_sources import DocumentSource, get_document_source
+from .embedding_batcher import MicroBatchingEmbedding
+from .embedding_cache import CachedQueryEmbedding, QueryEmbeddingCache
+from .embeddings import QUERY_INSTRUCTION, build_embed_model
+from .index_sync import (
+    DocumentFingerprintStore,
+    IndexGeneration,
+    IndexSynchronizer,
+    SyncCursor,
+    SyncStats,
+)
+from .node_parsers import build_node_parser, get_node_parser_key
+from .parallel_embedding import ParallelEmbedding
 
 logger = logging.getLogger("app.services.vector_db")
 
+VECTOR_INDEX_NAME = "gdrive"
+VECTOR_INDEX_PREFIX = "doc"
+
+# Metadata fields indexed for filtering and their RediSearch field types
+FILTER_FIELDS = {
+    "file_id": "tag",
+    "file_name": "tag",
+    "modified_at_ts": "numeric",
+}
+
+
+def build_index_schema(settings: Settings) -> IndexSchema:
+    """
+    Builds the Redis schema of the vector index.
+
+    The vector datatype and the HNSW parameters come from the settings; changing
+    them requires rebuilding the index (see app.services.index_migration).
+    File id, file name and modification time are indexed as filter fields, so
+    search filters run inside the KNN query.
+
+    :param settings: Application settings.
+    :return: IndexSchema of the 'gdrive' index.
+    """
+    return IndexSchema.from_dict(
+        {
+            "index": {"name": VECTOR_INDEX_NAME, "prefix": VECTOR_INDEX_PREFIX},
+            "fields": [
+                {"type": "tag", "name": "id"},
+                {"type": "tag", "name": "doc_id"},
+                {"type": "text", "name": "text"},
+                # Tag separator "|": file names may contain commas
+                {
+                    "type": "tag",
+                    "name": "file_id",
+                    "attrs": {"separator": "|", "case_sensitive": True},
+                },
+                {"type": "tag", "name": "file_name", "attrs": {"separator": "|"}},
+                {"type": "numeric", "name": "modified_at_ts"},
+                {
+                    "type": "vector",
+                    "name": "vector",
+                    "attrs": {
+                        "dims": settings.EMBEDDING_DIMENSION,
+                        "algorithm": "hnsw",
+                        "distance_metric": "cosine",
+                        "datatype": settings.VECTOR_DATATYPE,
+                        "m": settings.HNSW_M,
+                        "ef_construction": settings.HNSW_EF_CONSTRUCTION,
+                        "ef_runtime": settings.HNSW_EF_RUNTIME,
+                    },
+                },
+            ],
+        }
+    )
+
+
+class TypedRedisVectorStore(RedisVectorStore):
+    """
+    RedisVectorStore that stores and queries vectors in the datatype of the schema.
+
+    RedisVectorStore always writes vectors and builds KNN queries as float32,
+    which does not match a float16 vector field: the stored blobs and the query
+    vectors would have the wrong size. Stored vectors are converted to the schema
+    datatype before they are written, and queries are built in that datatype.
+    """
+
+    @property
+    def vector_datatype(self) -> str:
+        """
+        Returns the datatype of the vector field, e.g. 'float16'.
+        """
+        return self.schema.fields["vector"].attrs.datatype.value.lower()
+
+    def _convert_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        vector = np.frombuffer(record["vector"], dtype=np.float32)
+        record["vector"] = vector.astype(self.vector_datatype).tobytes()
+        return record
+
+    def add(self, nodes: List[BaseNode], **add_kwargs: Any) -> List[str]:
+        if self.vector_datatype != "float32":
+            add_kwargs.setdefault("preprocess", self._convert_record)
+        return super().add(nodes, **add_kwargs)
+
+    def _to_redis_query(self, query: VectorStoreQuery) -> VectorQuery:
+        return VectorQuery(
+            vector=query.query_embedding,
+            vector_field_name="vector",
+            num_results=query.similarity_top_k,
+            filter_expression=self._create_redis_filter_expression(query.filters),
+            return_fields=self._return_fields.copy(),
+            dtype=self.vector_datatype,
+        )
+
 
 class SingletonMeta(type):
     """
@@ -40,7 +149,9 @@ class SingletonMeta(type):
         lock = Lock()
         with lock:
             if cls not in cls._instances:
-                cls._instances[cls] = super(SingletonMeta, cls).__call__(*args, **kwargs)
+                cls._instances[cls] = super(SingletonMeta, cls).__call__(
+                    *args, **kwargs
+                )
         return cls._instances[cls]
 
 
@@ -51,10 +162,27 @@ class IndexManager(metaclass=SingletonMeta):
 
     def __init__(self):
         self.index = None
-
-    def initialize_index(self):
+        self.pipeline = None
+        self.source = None
+        self.redis_client = None
+        self.generation = None
+        self.query_embed_model = None
+        self.ingestion_embedding = None
+        self.query_embedding_batcher = None
+        self._init_lock = threading.Lock()
+
+    def initialize_index(
+        self, source: Optional[DocumentSource] = None, sync: bool = True
+    ):
         """
         Initialize VectorStoreIndex, vector store, and ingestion pipeline.
+
+        The index is built on top of the vectors already stored in Redis, so it can
+        serve queries before the document source has been synchronized.
+
+        :param source: Document source to sync from. Defaults to the source
+            selected by the DOCUMENT_SOURCE setting.
+        :param sync: Whether to synchronize the document source right away.
         """
         try:
             settings = get_settings()  # Get configuration settings
@@ -64,61 +192,41 @@ class IndexManager(metaclass=SingletonMeta):
             parsed_redis_url = urlparse(settings.REDIS_URL)
             redis_host = parsed_redis_url.hostname or "localhost"
             redis_port = parsed_redis_url.port or 6379
-
-            # Configure device
-            device = (
-                "mps"
-                if torch.backends.mps.is_available()
-                else "cuda"
-                if torch.cuda.is_available()
-                else "cpu"
-            )
-            logger.info(f"Using device: {device}")
+            self.redis_client = Redis.from_url(settings.REDIS_URL)
+            self.generation = IndexGeneration(self.redis_client)
 
             # Setup embedding model
-            embed_model = HuggingFaceEmbedding(
-                model_name=settings.EMBEDDING_MODEL_NAME,
-                query_instruction="Represent the question for retrieving supporting documents: ",
-                text_instruction="Represent the document for retrieval: ",
-                embed_batch_size=settings.EMBEDDING_BATCH_SIZE,
-                device=device,
+            embed_model = build_embed_model(settings)
+            self.query_embed_model = self._build_query_embed_model(
+                settings, embed_model
             )
 
-            logger.info(
-                f"HuggingFaceEmbedding initialized with model '{settings.EMBEDDING_MODEL_NAME}'."
-            )
+            # Embed ingested nodes in a process pool when several workers are set
+            if settings.EMBEDDING_NUM_WORKERS > 1:
+                ingestion_embedding = ParallelEmbedding(settings)
+                logger.info(
+                    f"Parallel ingestion embedding enabled with "
+                    f"{settings.EMBEDDING_NUM_WORKERS} workers."
+                )
+            else:
+                ingestion_embedding = embed_model
+            self.ingestion_embedding = ingestion_embedding
 
             # LLM settings
             LlamaSettings.llm = None
             logger.info("LLM settings configured.")
 
             # Custom schema for RedisVectorStore
-            custom_schema = IndexSchema.from_dict(
-                {
-                    "index": {"name": "gdrive", "prefix": "doc"},
-                    "fields": [
-                        {"type": "tag", "name": "id"},
-                        {"type": "tag", "name": "doc_id"},
-                        {"type": "text", "name": "text"},
-                        {
-                            "type": "vector",
-                            "name": "vector",
-                            "attrs": {
-                                "dims": settings.EMBEDDING_DIMENSION,
-                                "algorithm": "hnsw",
-                                "distance_metric": "cosine",
-                            },
-                        },
-                    ],
-                }
-            )
+            custom_schema = build_index_schema(settings)
 
-            # Initialize RedisVectorStore
-            vector_store = RedisVectorStore(
+            # Initialize the vector store, storing vectors in VECTOR_DATATYPE
+            vector_store = TypedRedisVectorStore(
                 schema=custom_schema,
                 redis_url=settings.REDIS_URL,
             )
-            logger.info("RedisVectorStore initialized.")
+            logger.info(
+                f"RedisVectorStore initialized ({settings.VECTOR_DATATYPE} vectors)."
+            )
 
             # Setup ingestion cache
             cache = IngestionCache(
@@ -128,12 +236,7 @@ class IndexManager(metaclass=SingletonMeta):
 
             # Setup Ingestion Pipeline
             pipeline = IngestionPipeline(
-                transformations=[
-                    SentenceSplitter(
-                        paragraph_separator="\n", chunk_overlap=400, chunk_size=600
-                    ),
-                    embed_model,
-                ],
+                transformations=[build_node_parser(settings), ingestion_embedding],
                 docstore=RedisDocumentStore.from_host_and_port(
                     redis_host, redis_port, namespace="document_store"
                 ),
@@ -145,55 +248,145 @@ class IndexManager(metaclass=SingletonMeta):
 
             # Initialize VectorStoreIndex
             self.index = VectorStoreIndex.from_vector_store(
-                pipeline.vector_store, embed_model=embed_model
+                pipeline.vector_store, embed_model=self.query_embed_model
             )
             logger.info("VectorStoreIndex created from vector store.")
 
-            # Load documents from Google Drive
-            service_account_path = Path(settings.GOOGLE_SERVICE_ACCOUNT_KEY_PATH)
-            if not service_account_path.exists():
-                logger.error(
-                    f"Service account key file not found at {service_account_path}"
-                )
-                raise FileNotFoundError(
-                    f"Service account key file not found at {service_account_path}"
-                )
+            self.pipeline = pipeline
+            self.source = source or get_document_source(settings)
 
-            with service_account_path.open("r") as f:
-                google_creds_dict = json.load(f)
+            if sync:
+                self.sync_documents()
 
-            loader = GoogleDriveReader(
-                service_account_key=google_creds_dict, folder_id=settings.FOLDER_ID
-            )
-            logger.info("GoogleDriveReader initialized.")
-
-            docs = loader.load_data()
-            if not docs:
-                logger.warning("No documents were loaded from Google Drive.")
-            else:
-                logger.info(f"Loaded {len(docs)} documents from Google Drive.")
-
-            # Run ingestion pipeline
-            nodes = pipeline.run(documents=docs)
-            logger.info(f"Ingested {len(nodes)} nodes into VectorStoreIndex.")
-
-            # Check if index exists
-            if vector_store.index_exists():
-                logger.info("Index 'gdrive' exists after ingestion.")
-            else:
-                logger.error("Index 'gdrive' does not exist after ingestion.")
+                # Check if index exists
+                if vector_store.index_exists():
+                    logger.info("Index 'gdrive' exists after ingestion.")
+                else:
+                    logger.error("Index 'gdrive' does not exist after ingestion.")
 
         except Exception as e:
             logger.exception("Failed to set up the ingestion pipeline.")
             raise
 
+    def shutdown(self):
+        """
+        Stops the parallel embedding worker processes and the query embedding
+        batching thread, if they were started.
+        """
+        if isinstance(self.ingestion_embedding, ParallelEmbedding):
+            self.ingestion_embedding.close()
+        if self.query_embedding_batcher is not None:
+            self.query_embedding_batcher.close()
+
+    def _build_query_embed_model(
+        self, settings: Settings, embed_model: BaseEmbedding
+    ) -> BaseEmbedding:
+        """
+        Builds the embedding model used for queries.
+
+        Concurrent queries are micro-batched into a single forward pass, and the
+        query embedding cache sits in front of the batcher, so only cache misses
+        reach the model.
+        """
+        query_embed_model = embed_model
+        if settings.QUERY_EMBEDDING_MAX_BATCH_SIZE > 1:
+            query_embed_model = MicroBatchingEmbedding(
+                embed_model,
+                max_batch_size=settings.QUERY_EMBEDDING_MAX_BATCH_SIZE,
+                max_wait_ms=settings.QUERY_EMBEDDING_MAX_WAIT_MS,
+            )
+            metrics_registry.register(
+                "query_embedding_batcher", query_embed_model.get_stats
+            )
+            self.query_embedding_batcher = query_embed_model
+            logger.info("Query embedding micro-batching enabled.")
+
+        if not settings.QUERY_EMBEDDING_CACHE_ENABLED:
+            return query_embed_model
+
+        cache = QueryEmbeddingCache(
+            redis_client=self.redis_client,
+            max_size=settings.QUERY_EMBEDDING_CACHE_SIZE,
+            ttl=settings.QUERY_EMBEDDING_CACHE_TTL,
+        )
+        metrics_registry.register("query_embedding_cache", cache.get_stats)
+        logger.info("Query embedding cache enabled.")
+        return CachedQueryEmbedding(
+            query_embed_model,
+            cache=cache,
+            cache_namespace=(
+                f"{settings.EMBEDDING_MODEL_NAME}:{settings.EMBEDDING_BACKEND}"
+            ),
+            instruction=QUERY_INSTRUCTION,
+        )
+
+    def sync_documents(
+        self,
+        mode: Optional[str] = None,
+        progress_callback: Optional[Callable[[SyncStats, int, int], None]] = None,
+    ) -> SyncStats:
+        """
+        Synchronizes the document source into the index.
+
+        :param mode: "delta" or "full". Defaults to the INDEX_SYNC_MODE setting.
+        :param progress_callback: Called with (stats, files_processed, files_total)
+            after the source is listed and after each ingested batch.
+        :return: SyncStats of the run.
+        """
+        if self.pipeline is None:
+            self.initialize_index(sync=False)
+
+        settings = get_settings()
+        mode = mode or settings.INDEX_SYNC_MODE
+        synchronizer = IndexSynchronizer(
+            source=self.source,
+            pipeline=self.pipeline,
+            cursor=SyncCursor(self.redis_client, self.source.source_key),
+            batch_size=settings.INDEX_SYNC_BATCH_SIZE,
+            node_parser_key=get_node_parser_key(settings),
+            fingerprints=DocumentFingerprintStore(
+                self.redis_client, self.source.source_key
+            ),
+            generation=self.generation,
+        )
+        stats = synchronizer.sync(mode=mode, progress_callback=progress_callback)
+        logger.info(
+            f"Ingested {stats.nodes_ingested} nodes from {stats.documents_loaded} "
+            f"documents into VectorStoreIndex ({mode} sync, "
+            f"{stats.documents_skipped} unchanged documents skipped)."
+        )
+        return stats
+
+    def get_generation(self) -> Optional[int]:
+        """
+        Returns the current index generation, or None if it is unavailable.
+        """
+        if self.generation is None:
+            return None
+        try:
+            return self.generation.get()
+        except Exception:
+            logger.warning("Failed to read the index generation.", exc_info=True)
+            return None
+
+    def is_ready(self) -> bool:
+        """
+        Returns True when the index can serve queries.
+        """
+        return self.index is not None
+
     def get_index(self) -> VectorStoreIndex:
         """
         Returns the VectorStoreIndex. Initializes it if not already created.
+
+        Initialization does not synchronize the document source; that is done by
+        the background ingestion worker.
         """
         if self.index is None:
-            logger.info("Index not initialized. Initializing now...")
-            self.initialize_index()
+            with self._init_lock:
+                if self.index is None:
+                    logger.info("Index not initialized. Initializing now...")
+                    self.initialize_index(sync=False)
         else:
             logger.info("Index already initialized. Returning existing index.")
         return self.index
@@ -0,0 +1,102 @@
+# KONSPECTO/backend/benchmarks/agent_iterations.py
+"""
+LLM round-trips, tool calls and latency per answer of the ReAct agent with and
+without the RAGMultiSearch tool, on questions that involve several terms.
+
+Without the tool the prompt asks for one term per RAGSearch call, so every term
+costs a Thought/Action/Observation iteration and its LLM call. With it the agent
+can search all terms in one call. The benchmark needs the LLM server configured
+by LLM_STUDIO_BASE_URL and the Redis index; answers are not cached, so each run
+makes real LLM calls.
+
+Usage:
+    python -m benchmarks.agent_iterations --repeat 3
+    python -m benchmarks.agent_iterations --questions questions.txt
+"""
+
+import argparse
+import asyncio
+import time
+
+from pathlib import Path
+from typing import Any, List
+
+from langchain_core.callbacks import AsyncCallbackHandler
+
+from agent.react_agent import ReactAgent
+
+from .common import print_table, summarize_latencies
+
+DEFAULT_QUESTIONS = [
+    "Градиентный спуск и преобразование Фурье",
+    "Объясни, что такое свёртка и ряд Фурье",
+    "Что такое функция потерь, производная и сходимость?",
+    "Расскажи про нейронные сети, обучение модели и выборку",
+]
+
+
+class IterationCounter(AsyncCallbackHandler):
+    """Counts LLM calls and tool calls of one agent run."""
+
+    def __init__(self):
+        self.llm_calls = 0
+        self.tool_calls = 0
+
+    async def on_llm_start(self, serialized, prompts, **kwargs: Any) -> None:
+        self.llm_calls += 1
+
+    async def on_chat_model_start(self, serialized, messages, **kwargs: Any) -> None:
+        self.llm_calls += 1
+
+    async def on_tool_start(self, serialized, input_str, **kwargs: Any) -> None:
+        self.tool_calls += 1
+
+
+async def run_variant(agent: ReactAgent, questions: List[str], repeat: int):
+    latencies = []
+    llm_calls = []
+    tool_calls = []
+    for _ in range(repeat):
+        for question in questions:
+            counter = IterationCounter()
+            started = time.perf_counter()
+            await agent.agent.ainvoke(question, config={"callbacks": [counter]})
+            latencies.append(time.perf_counter() - started)
+            llm_calls.append(counter.llm_calls)
+            tool_calls.append(counter.tool_calls)
+    return {
+        "llm_calls": sum(llm_calls) / len(llm_calls),
+        "tool_calls": sum(tool_calls) / len(tool_calls),
+        **summarize_latencies(latencies),
+    }
+
+
+async def run(args):
+    if args.questions:
+        lines = args.questions.read_text(encoding="utf-8").splitlines()
+        questions = [line.strip() for line in lines if line.strip()]
+    else:
+        questions = DEFAULT_QUESTIONS
+
+    rows = []
+    for name, multi_search in (("single_search", False), ("multi_search", True)):
+        agent = ReactAgent(multi_search=multi_search)
+        agent.agent.verbose = False
+        rows.append({"tools": name, **await run_variant(agent, questions, args.repeat)})
+
+    print(f"{len(questions)} questions x {args.repeat}")
+    print_table(
+        rows, ["tools", "llm_calls", "tool_calls", "mean_ms", "p50_ms", "p95_ms"]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# KONSPECTO/backend/benchmarks/batch_search.py
+"""
+Throughput of POST /api/v1/search/batch against N sequential POST /api/v1/search/
+calls on a running API.
+
+Both paths get disjoint query sets drawn from the same distribution, so neither
+benefits from the query embedding or search result caches of the other.
+
+Usage:
+    python -m benchmarks.batch_search --base-url http://localhost:8000 \\
+        --queries 20 50 200 --top-k 3
+"""
+
+import argparse
+import random
+import time
+
+from typing import List
+
+import httpx
+
+from .common import print_table, synthetic_corpus
+
+
+def make_queries(count: int, seed: int) -> List[str]:
+    return [
+        text.split(".")[0]
+        for text in synthetic_corpus(count, words_per_text=6, seed=seed)
+    ]
+
+
+def run_sequential(client: httpx.Client, queries: List[str], top_k: int) -> float:
+    started = time.perf_counter()
+    for query in queries:
+        response = client.post("/api/v1/search/", json={"query": query, "top_k": top_k})
+        response.raise_for_status()
+    return time.perf_counter() - started
+
+
+def run_batch(client: httpx.Client, queries: List[str], top_k: int) -> float:
+    started = time.perf_counter()
+    response = client.post(
+        "/api/v1/search/batch", json={"queries": queries, "top_k": top_k}
+    )
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--queries", type=int, nargs="+", default=[20, 50, 200])
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else random.randrange(1_000_000)
+    rows = []
+    with httpx.Client(base_url=args.base_url, timeout=args.timeout) as client:
+        # Warm up the model and the index
+        run_sequential(client, make_queries(2, seed), args.top_k)
+
+        for index, count in enumerate(args.queries):
+            sequential_seconds = run_sequential(
+                client, make_queries(count, seed + 2 * index + 1), args.top_k
+            )
+            batch_seconds = run_batch(
+                client, make_queries(count, seed + 2 * index + 2), args.top_k
+            )
+            rows.append(
+                {
+                    "queries": count,
+                    "sequential_s": sequential_seconds,
+                    "batch_s": batch_seconds,
+                    "sequential_qps": count / sequential_seconds,
+                    "batch_qps": count / batch_seconds,
+                    "speedup": sequential_seconds / batch_seconds,
+                }
+            )
+
+    print(f"top_k={args.top_k}, seed={seed}")
+    print_table(
+        rows,
+        [
+            "queries",
+            "sequential_s",
+            "batch_s",
+            "sequential_qps",
+            "batch_qps",
+            "speedup",
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# KONSPECTO/backend/benchmarks/chunker_eval.py
+"""
+Compares node parser configurations by node count, embedded tokens, ingestion
+time and retrieval recall on a fixed query set.
+
+The query set is a JSONL file with one {"query": ..., "answer": ...} object per
+line; a query is a hit when one of its top-k chunks contains the answer text.
+Without --corpus-dir a synthetic corpus of structured lecture notes is generated
+and answers are sentences taken from it.
+
+Usage:
+    python -m benchmarks.chunker_eval --corpus-dir ./notes --queries queries.jsonl \\
+        --configs sentence:600:400 structure:600:0 --k 5
+"""
+
+import argparse
+import json
+import random
+import time
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from llama_index.core import Document
+from llama_index.core.schema import MetadataMode
+from llama_index.core.utils import get_tokenizer
+
+from app.core.config import get_settings
+from app.services.document_sources import LocalDirectorySource
+from app.services.embeddings import build_embed_model
+from app.services.node_parsers import build_node_parser
+
+from .common import print_table, synthetic_corpus
+
+
+def synthetic_documents(
+    num_documents: int, sections_per_document: int = 6, seed: int = 0
+) -> List[Document]:
+    """
+    Generates lecture notes with headings, paragraphs and lists.
+    """
+    rng = random.Random(seed)
+    paragraphs = iter(
+        synthetic_corpus(num_documents * sections_per_document * 3, 60, seed)
+    )
+    documents = []
+    for doc_index in range(num_documents):
+        lines = [f"Лекция {doc_index + 1}"]
+        for section in range(sections_per_document):
+            lines.append(f"{doc_index + 1}.{section + 1} Раздел {section + 1}")
+            lines.append(next(paragraphs))
+            if rng.random() < 0.5:
+                lines.extend(
+                    f"- {sentence.strip()}."
+                    for sentence in next(paragraphs).split(".")[:3]
+                )
+            lines.append(next(paragraphs))
+        documents.append(
+            Document(text="\n".join(lines), metadata={"file_name": f"{doc_index}.txt"})
+        )
+    return documents
+
+
+def synthetic_queries(
+    documents: List[Document], num_queries: int, seed: int = 0
+) -> List[Dict[str, str]]:
+    """
+    Picks sentences of the documents as answers and their first words as queries.
+    """
+    rng = random.Random(seed)
+    sentences = [
+        sentence.strip()
+        for document in documents
+        for sentence in document.text.split(".")
+        if len(sentence.split()) >= 10
+    ]
+    return [
+        {"query": " ".join(sentence.split()[:6]), "answer": sentence}
+        for sentence in rng.sample(sentences, min(num_queries, len(sentences)))
+    ]
+
+
+def parse_config(value: str) -> Tuple[str, int, int]:
+    name, chunk_size, chunk_overlap = value.split(":")
+    return name, int(chunk_size), int(chunk_overlap)
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus-dir", type=Path, default=None)
+    parser.add_argument("--queries", type=Path, default=None)
+    parser.add_argument(
+        "--configs",
+        nargs="+",
+        default=["sentence:600:400", "structure:600:0"],
+        help="Node parser configurations as parser:chunk_size:chunk_overlap.",
+    )
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--num-documents", type=int, default=50)
+    parser.add_argument("--num-queries", type=int, default=100)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    if args.corpus_dir:
+        source = LocalDirectorySource(args.corpus_dir)
+        documents = source.load_files([f.file_id for f in source.list_files()])
+    else:
+        documents = synthetic_documents(args.num_documents)
+
+    if args.queries:
+        lines = args.queries.read_text(encoding="utf-8").splitlines()
+        queries = [json.loads(line) for line in lines if line.strip()]
+    else:
+        queries = synthetic_queries(documents, args.num_queries)
+
+    tokenizer = get_tokenizer()
+    corpus_tokens = sum(len(tokenizer(document.text)) for document in documents)
+    print(
+        f"Corpus: {len(documents)} documents, {corpus_tokens} tokens, "
+        f"queries: {len(queries)}, k={args.k}"
+    )
+
+    embed_model = build_embed_model(settings)
+    query_vectors = np.array(
+        [embed_model.get_query_embedding(item["query"]) for item in queries]
+    )
+    query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+    answers = [normalize_text(item["answer"]) for item in queries]
+
+    rows = []
+    for config in args.configs:
+        name, chunk_size, chunk_overlap = parse_config(config)
+        node_parser = build_node_parser(
+            settings.model_copy(
+                update={
+                    "NODE_PARSER": name,
+                    "CHUNK_SIZE": chunk_size,
+                    "CHUNK_OVERLAP": chunk_overlap,
+                }
+            )
+        )
+
+        started = time.perf_counter()
+        nodes = node_parser.get_nodes_from_documents(documents)
+        parse_seconds = time.perf_counter() - started
+
+        texts = [node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes]
+        embedded_tokens = sum(len(tokenizer(text)) for text in texts)
+
+        started = time.perf_counter()
+        doc_vectors = np.array(embed_model.get_text_embedding_batch(texts))
+        embed_seconds = time.perf_counter() - started
+        doc_vectors /= np.linalg.norm(doc_vectors, axis=1, keepdims=True)
+
+        chunk_texts = [normalize_text(node.get_content()) for node in nodes]
+        neighbours = np.argsort(-(query_vectors @ doc_vectors.T), axis=1)[:, : args.k]
+        hits = [
+            any(answer in chunk_texts[index] for index in found)
+            for answer, found in zip(answers, neighbours)
+        ]
+
+        rows.append(
+            {
+                "config": config,
+                "nodes": len(nodes),
+                "embedded_tokens": embedded_tokens,
+                "amplification": embedded_tokens / max(1, corpus_tokens),
+                "parse_s": parse_seconds,
+                "embed_s": embed_seconds,
+                f"recall@{args.k}": float(np.mean(hits)) if hits else 0.0,
+            }
+        )
+
+    print_table(
+        rows,
+        [
+            "config",
+            "nodes",
+            "embedded_tokens",
+            "amplification",
+            "parse_s",
+            "embed_s",
+            f"recall@{args.k}",
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
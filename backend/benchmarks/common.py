@@ -0,0 +1,108 @@
+# KONSPECTO/backend/benchmarks/common.py
+
+import random
+import statistics
+
+from typing import Dict, List, Sequence
+
+# Vocabulary of the synthetic lecture-notes corpus
+VOCABULARY = [
+    "градиентный",
+    "спуск",
+    "преобразование",
+    "Фурье",
+    "функция",
+    "потерь",
+    "производная",
+    "матрица",
+    "вектор",
+    "нейронная",
+    "сеть",
+    "свёртка",
+    "оптимизация",
+    "сходимость",
+    "ряд",
+    "интеграл",
+    "спектр",
+    "частота",
+    "обучение",
+    "модель",
+    "выборка",
+    "регуляризация",
+    "шаг",
+    "итерация",
+    "теорема",
+    "доказательство",
+    "определение",
+    "пример",
+    "задача",
+    "решение",
+]
+
+
+def synthetic_corpus(
+    num_texts: int, words_per_text: int = 120, seed: int = 0
+) -> List[str]:
+    """
+    Generates a deterministic corpus of pseudo lecture-note paragraphs.
+
+    :param num_texts: Number of texts.
+    :param words_per_text: Number of words per text.
+    :param seed: Random seed.
+    :return: List of texts.
+    """
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(num_texts):
+        words = [rng.choice(VOCABULARY) for _ in range(words_per_text)]
+        sentences = [
+            " ".join(words[start : start + 12]).capitalize() + "."
+            for start in range(0, len(words), 12)
+        ]
+        texts.append(" ".join(sentences))
+    return texts
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Returns the q-th percentile (0..100) of the values using linear interpolation.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize_latencies(latencies: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarizes latencies given in seconds as milliseconds.
+    """
+    return {
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def print_table(rows: List[Dict], columns: List[str]) -> None:
+    """
+    Prints rows as a plain-text table.
+    """
+    formatted = [
+        [
+            f"{row[column]:.2f}" if isinstance(row[column], float) else str(row[column])
+            for column in columns
+        ]
+        for row in rows
+    ]
+    widths = [
+        max(len(column), *(len(values[index]) for values in formatted))
+        for index, column in enumerate(columns)
+    ]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for values in formatted:
+        print("  ".join(value.ljust(width) for value, width in zip(values, widths)))
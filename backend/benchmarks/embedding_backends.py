@@ -0,0 +1,135 @@
+# KONSPECTO/backend/benchmarks/embedding_backends.py
+"""
+Recall@k and latency comparison of the embedding backends.
+
+The fp32 torch backend is the reference: for each query, its top-k documents are
+the ground truth, and every backend is scored by how many of them it retrieves.
+
+Usage:
+    python -m benchmarks.embedding_backends --corpus-dir ./notes \\
+        --queries queries.txt --backends torch onnx onnx-int8 --k 5
+"""
+
+import argparse
+import time
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.document_sources import LocalDirectorySource
+from app.services.embeddings import EMBEDDING_BACKENDS, build_embed_model
+from app.services.node_parsers import build_node_parser
+
+from .common import print_table, summarize_latencies, synthetic_corpus
+
+
+def load_corpus(corpus_dir: Path, limit: int) -> List[str]:
+    source = LocalDirectorySource(corpus_dir)
+    documents = source.load_files([f.file_id for f in source.list_files()])
+    nodes = build_node_parser(get_settings()).get_nodes_from_documents(documents)
+    return [node.get_content() for node in nodes][:limit]
+
+
+def load_queries(queries_file: Path, corpus: List[str], limit: int) -> List[str]:
+    if queries_file is not None:
+        lines = queries_file.read_text(encoding="utf-8").splitlines()
+        return [line.strip() for line in lines if line.strip()][:limit]
+    # Without a query set, use the first sentence of some corpus texts
+    return [text.split(".")[0] for text in corpus[:: max(1, len(corpus) // limit)]][
+        :limit
+    ]
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def top_k(query_vectors: np.ndarray, doc_vectors: np.ndarray, k: int) -> np.ndarray:
+    scores = query_vectors @ doc_vectors.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus-dir", type=Path, default=None)
+    parser.add_argument("--queries", type=Path, default=None)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=list(EMBEDDING_BACKENDS),
+        choices=EMBEDDING_BACKENDS,
+    )
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--max-docs", type=int, default=2000)
+    parser.add_argument("--max-queries", type=int, default=100)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    corpus = (
+        load_corpus(args.corpus_dir, args.max_docs)
+        if args.corpus_dir
+        else synthetic_corpus(args.max_docs)
+    )
+    queries = load_queries(args.queries, corpus, args.max_queries)
+    print(f"Corpus: {len(corpus)} texts, queries: {len(queries)}, k={args.k}")
+
+    reference = None
+    rows = []
+    for backend in ["torch"] + [b for b in args.backends if b != "torch"]:
+        embed_model = build_embed_model(
+            settings.model_copy(update={"EMBEDDING_BACKEND": backend}), device="cpu"
+        )
+        embed_model.get_query_embedding("warm up")
+
+        started = time.perf_counter()
+        doc_vectors = normalize(np.array(embed_model.get_text_embedding_batch(corpus)))
+        corpus_seconds = time.perf_counter() - started
+
+        latencies = []
+        query_vectors = []
+        for query in queries:
+            started = time.perf_counter()
+            query_vectors.append(embed_model.get_query_embedding(query))
+            latencies.append(time.perf_counter() - started)
+        query_vectors = normalize(np.array(query_vectors))
+
+        neighbours = top_k(query_vectors, doc_vectors, args.k)
+        if reference is None:
+            reference = (query_vectors, neighbours)
+        recall = np.mean(
+            [
+                len(set(found) & set(expected)) / args.k
+                for found, expected in zip(neighbours, reference[1])
+            ]
+        )
+        query_cosine = float(np.mean(np.sum(query_vectors * reference[0], axis=1)))
+
+        rows.append(
+            {
+                "backend": backend,
+                f"recall@{args.k}": float(recall),
+                "query_cosine": query_cosine,
+                "docs_per_s": len(corpus) / corpus_seconds,
+                **summarize_latencies(latencies),
+            }
+        )
+
+    print_table(
+        rows,
+        [
+            "backend",
+            f"recall@{args.k}",
+            "query_cosine",
+            "docs_per_s",
+            "p50_ms",
+            "p95_ms",
+            "p99_ms",
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
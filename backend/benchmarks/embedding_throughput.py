@@ -0,0 +1,87 @@
+# KONSPECTO/backend/benchmarks/embedding_throughput.py
+"""
+Throughput benchmark of ingestion embedding with 1..N worker processes.
+
+Usage:
+    python -m benchmarks.embedding_throughput --workers 1 2 4 8 --nodes 2000
+"""
+
+import argparse
+import os
+import time
+
+from llama_index.core.schema import TextNode
+
+from app.core.config import get_settings
+from app.services.embeddings import build_embed_model
+from app.services.parallel_embedding import ParallelEmbedding
+
+from .common import print_table, synthetic_corpus
+
+
+def run_single_process(settings, nodes):
+    embed_model = build_embed_model(settings, device="cpu")
+    # Warm up so model loading is not measured
+    embed_model(nodes[:1])
+    started = time.perf_counter()
+    embed_model(nodes)
+    return time.perf_counter() - started
+
+
+def run_parallel(settings, nodes, num_workers):
+    settings = settings.model_copy(update={"EMBEDDING_NUM_WORKERS": num_workers})
+    embedding = ParallelEmbedding(settings)
+    try:
+        # Warm up every worker so model loading is not measured
+        shard_size = embedding.shard_size
+        embedding.shard_size = 1
+        embedding([TextNode(text=node.text) for node in nodes[:num_workers]])
+        embedding.shard_size = shard_size
+        started = time.perf_counter()
+        embedding(nodes)
+        return time.perf_counter() - started
+    finally:
+        embedding.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, os.cpu_count() or 1],
+        help="Worker counts to compare.",
+    )
+    parser.add_argument("--nodes", type=int, default=1000, help="Number of nodes.")
+    parser.add_argument("--words", type=int, default=120, help="Words per node.")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    texts = synthetic_corpus(args.nodes, words_per_text=args.words)
+
+    rows = []
+    baseline = None
+    for num_workers in sorted(set(args.workers)):
+        nodes = [TextNode(text=text) for text in texts]
+        if num_workers == 1:
+            elapsed = run_single_process(settings, nodes)
+        else:
+            elapsed = run_parallel(settings, nodes, num_workers)
+        throughput = len(nodes) / elapsed
+        baseline = baseline or throughput
+        rows.append(
+            {
+                "workers": num_workers,
+                "seconds": elapsed,
+                "nodes_per_s": throughput,
+                "speedup": throughput / baseline,
+            }
+        )
+
+    print(f"Model: {settings.EMBEDDING_MODEL_NAME}, nodes: {args.nodes}")
+    print_table(rows, ["workers", "seconds", "nodes_per_s", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# KONSPECTO/backend/benchmarks/hybrid_latency.py
+"""
+Latency of hybrid (vector + BM25 with RRF) retrieval against the pure vector path
+on the configured Redis index.
+
+Query embeddings are warmed up first, so both paths are measured with cached
+query vectors and the difference is the cost of the full-text query and fusion.
+
+Usage:
+    python -m benchmarks.hybrid_latency --queries queries.txt --top-k 3
+"""
+
+import argparse
+import time
+
+from pathlib import Path
+
+from app.services.index_service import get_retriever
+
+from .common import print_table, summarize_latencies, synthetic_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=Path, default=None)
+    parser.add_argument("--num-queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.queries:
+        lines = args.queries.read_text(encoding="utf-8").splitlines()
+        queries = [line.strip() for line in lines if line.strip()]
+    else:
+        queries = [
+            text.split(".")[0]
+            for text in synthetic_corpus(args.num_queries, words_per_text=6, seed=2)
+        ]
+
+    rows = []
+    for mode in ("vector", "hybrid"):
+        retriever = get_retriever(similarity_top_k=args.top_k, mode=mode)
+        for query in queries:
+            retriever.retrieve(query)
+
+        latencies = []
+        for _ in range(args.repeat):
+            for query in queries:
+                started = time.perf_counter()
+                retriever.retrieve(query)
+                latencies.append(time.perf_counter() - started)
+        rows.append({"mode": mode, **summarize_latencies(latencies)})
+
+    print(f"Queries: {len(queries)} x {args.repeat}, top_k={args.top_k}")
+    print_table(rows, ["mode", "mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
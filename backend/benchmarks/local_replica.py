@@ -0,0 +1,153 @@
+# KONSPECTO/backend/benchmarks/local_replica.py
+"""
+Latency and recall of vector retrieval served by the in-process local replica
+against the Redis HNSW path on the configured index.
+
+Query embeddings are computed once up front, so both paths are measured without
+the embedding model. Recall@k of both paths is measured against exact float32
+nearest neighbours computed with NumPy over all vectors stored in Redis.
+
+Usage:
+    python -m benchmarks.local_replica --queries queries.txt --top-k 3
+"""
+
+import argparse
+import time
+
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from llama_index.core.schema import QueryBundle
+
+from app.core.config import get_settings
+from app.services.index_service import get_query_embeddings
+from app.services.local_replica import LocalReplicaRetriever, LocalVectorReplica
+from app.services.vector_db import IndexManager, VECTOR_INDEX_PREFIX, get_index
+
+from .common import print_table, summarize_latencies, synthetic_corpus
+
+
+def load_exact_vectors(redis_client, dtype: str, batch_size: int = 500):
+    """
+    Reads all stored vectors as float32, normalized, with their node ids.
+    """
+    node_ids: List[str] = []
+    vectors = []
+    keys = list(redis_client.scan_iter(match=f"{VECTOR_INDEX_PREFIX}:*", count=1000))
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start : start + batch_size]
+        pipe = redis_client.pipeline(transaction=False)
+        for key in batch:
+            pipe.hget(key, "vector")
+        for key, raw in zip(batch, pipe.execute()):
+            if raw is None:
+                continue
+            node_ids.append(key.decode("utf-8").split(":", 1)[-1])
+            vectors.append(np.frombuffer(raw, dtype=dtype).astype(np.float32))
+    matrix = np.stack(vectors)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    return node_ids, matrix
+
+
+def measure(retriever, bundles: List[QueryBundle], repeat: int):
+    latencies = []
+    found = []
+    for _ in range(repeat):
+        found = []
+        for bundle in bundles:
+            started = time.perf_counter()
+            results = retriever.retrieve(bundle)
+            latencies.append(time.perf_counter() - started)
+            found.append([result.node.node_id for result in results])
+    return latencies, found
+
+
+def recall(found: List[List[str]], expected: List[List[str]]) -> float:
+    hits = [
+        len(set(ids) & set(truth)) / max(1, len(truth))
+        for ids, truth in zip(found, expected)
+    ]
+    return float(np.mean(hits)) if hits else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=Path, default=None)
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.queries:
+        lines = args.queries.read_text(encoding="utf-8").splitlines()
+        queries = [line.strip() for line in lines if line.strip()]
+    else:
+        queries = [
+            text.split(".")[0]
+            for text in synthetic_corpus(args.num_queries, words_per_text=6, seed=4)
+        ]
+
+    settings = get_settings()
+    index = get_index()
+    manager = IndexManager()
+    embeddings = get_query_embeddings(queries)
+    bundles = [
+        QueryBundle(query_str=query, embedding=embedding)
+        for query, embedding in zip(queries, embeddings)
+    ]
+
+    started = time.perf_counter()
+    replica = LocalVectorReplica(
+        manager.redis_client,
+        dims=settings.EMBEDDING_DIMENSION,
+        directory=settings.LOCAL_REPLICA_DIR,
+        source_datatype=settings.VECTOR_DATATYPE,
+    )
+    replica.refresh()
+    load_seconds = time.perf_counter() - started
+
+    node_ids, matrix = load_exact_vectors(
+        manager.redis_client, settings.VECTOR_DATATYPE
+    )
+    query_matrix = np.array(embeddings, dtype=np.float32)
+    query_matrix /= np.linalg.norm(query_matrix, axis=1, keepdims=True)
+    scores = query_matrix @ matrix.T
+    top = np.argsort(-scores, axis=1)[:, : args.top_k]
+    expected = [[node_ids[index] for index in row] for row in top]
+
+    retrievers: Dict[str, object] = {
+        "redis_hnsw": index.as_retriever(similarity_top_k=args.top_k),
+        "local_replica": LocalReplicaRetriever(
+            replica, embed_model=manager.query_embed_model, similarity_top_k=args.top_k
+        ),
+    }
+
+    rows = []
+    for name, retriever in retrievers.items():
+        # Warm up connections and page in the replica's vector file
+        measure(retriever, bundles[:5], 1)
+        latencies, found = measure(retriever, bundles, args.repeat)
+        rows.append(
+            {
+                "path": name,
+                **summarize_latencies(latencies),
+                f"recall@{args.top_k}": recall(found, expected),
+            }
+        )
+
+    stats = replica.get_stats()
+    print(
+        f"{len(queries)} queries x {args.repeat}, top_k={args.top_k}, "
+        f"{stats['nodes']} nodes; replica loaded in {load_seconds:.1f}s, "
+        f"vectors {stats['vectors_mb']:.1f} MB, payloads {stats['payloads_mb']:.1f} MB"
+    )
+    print_table(
+        rows,
+        ["path", "mean_ms", "p50_ms", "p95_ms", "p99_ms", f"recall@{args.top_k}"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# KONSPECTO/backend/benchmarks/search_load.py
+"""
+Load test of a running API: latency of /health while /search is under concurrent
+load.
+
+A number of search clients send queries back to back for the given duration,
+while a probe requests /health at a fixed interval. Reports p50/p95/p99 of both
+endpoints and the number of searches rejected with 503.
+
+Usage:
+    python -m benchmarks.search_load --base-url http://localhost:8000 \\
+        --concurrency 32 --duration 30
+"""
+
+import argparse
+import asyncio
+import time
+
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+
+from .common import print_table, summarize_latencies, synthetic_corpus
+
+
+async def search_client(
+    client: httpx.AsyncClient,
+    queries: List[str],
+    offset: int,
+    deadline: float,
+    latencies: List[float],
+    statuses: Counter,
+):
+    index = offset
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.post(
+                "/api/v1/search/", json={"query": queries[index % len(queries)]}
+            )
+            statuses[response.status_code] += 1
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - started)
+        except httpx.HTTPError:
+            statuses["error"] += 1
+        index += 1
+
+
+async def health_probe(
+    client: httpx.AsyncClient,
+    interval: float,
+    deadline: float,
+    latencies: List[float],
+):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get("/health")
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+
+
+async def run_load(args) -> Dict[str, object]:
+    queries = [
+        text.split(".")[0]
+        for text in synthetic_corpus(args.num_queries, words_per_text=8, seed=3)
+    ]
+    search_latencies: List[float] = []
+    health_latencies: List[float] = []
+    statuses: Counter = Counter()
+
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            health_probe(client, args.health_interval, deadline, health_latencies),
+            *(
+                search_client(
+                    client, queries, offset, deadline, search_latencies, statuses
+                )
+                for offset in range(args.concurrency)
+            ),
+        )
+
+    return {
+        "search": search_latencies,
+        "health": health_latencies,
+        "statuses": statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--health-interval", type=float, default=0.1)
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load(args))
+
+    rows = [
+        {
+            "endpoint": endpoint,
+            "requests": len(results[endpoint]),
+            **summarize_latencies(results[endpoint]),
+        }
+        for endpoint in ("health", "search")
+    ]
+    print(
+        f"{args.concurrency} concurrent search clients for {args.duration:.0f}s "
+        f"against {args.base_url}"
+    )
+    print_table(rows, ["endpoint", "requests", "p50_ms", "p95_ms", "p99_ms"])
+    print(f"Search responses by status: {dict(results['statuses'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# KONSPECTO/backend/benchmarks/search_paths.py
+"""
+Per-query latency and allocations of the query-engine path versus the
+retriever-only path used by SearchService and SearchTool.
+
+By default the benchmark runs on an in-memory index with a mock embedding, which
+isolates the LlamaIndex overhead; --redis runs it on the configured Redis index
+with the real embedding model (query embeddings are cached after the first run).
+
+Usage:
+    python -m benchmarks.search_paths --queries 200 --top-k 3 [--redis]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from llama_index.core import Settings as LlamaSettings, VectorStoreIndex
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.schema import TextNode
+
+from .common import print_table, summarize_latencies, synthetic_corpus
+
+
+def build_index(args):
+    if args.redis:
+        from app.services.vector_db import get_index
+
+        return get_index()
+
+    LlamaSettings.llm = None
+    nodes = [TextNode(text=text) for text in synthetic_corpus(args.nodes)]
+    return VectorStoreIndex(nodes, embed_model=MockEmbedding(embed_dim=args.dim))
+
+
+def measure(run_query, queries):
+    # Warm up
+    run_query(queries[0])
+
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        run_query(query)
+        latencies.append(time.perf_counter() - started)
+
+    # Peak memory allocated while serving a single query
+    peaks = []
+    tracemalloc.start()
+    for query in queries:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        run_query(query)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    return {
+        **summarize_latencies(latencies),
+        "alloc_peak_kb": sum(peaks) / len(peaks) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--redis", action="store_true")
+    args = parser.parse_args()
+
+    index = build_index(args)
+    queries = [text.split(".")[0] for text in synthetic_corpus(args.queries, seed=1)]
+
+    query_engine = index.as_query_engine(similarity_top_k=args.top_k)
+    retriever = index.as_retriever(similarity_top_k=args.top_k)
+
+    rows = [
+        {"path": "query_engine", **measure(query_engine.query, queries)},
+        {"path": "retriever", **measure(retriever.retrieve, queries)},
+    ]
+    print_table(
+        rows,
+        ["path", "mean_ms", "p50_ms", "p99_ms", "alloc_peak_kb"],
+    )
+
+
+if __name__ == "__main__":
+    main()
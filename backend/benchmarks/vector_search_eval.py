@@ -0,0 +1,283 @@
+# KONSPECTO/backend/benchmarks/vector_search_eval.py
+"""
+Recall and latency of the Redis HNSW index across a grid of index parameters,
+measured against exact nearest neighbours computed with NumPy.
+
+A fixed corpus is loaded into a separate index (by default 'bench_gdrive' with
+the 'bench_doc' key prefix) of a Redis Stack instance, which is dropped at the
+end. For every combination of M, EF_CONSTRUCTION and EF_RUNTIME the index is
+rebuilt over the loaded vectors, and the queries run through the LlamaIndex
+retriever over RedisVectorStore, the path used by SearchService and SearchTool.
+Recall@k is the share of the exact top-k neighbours among the returned nodes.
+
+The corpus is synthetic by default: unit vectors drawn around random cluster
+centres, with queries drawn from the same distribution. An exported corpus is an
+.npz file with a "vectors" array and an optional "queries" array; --export
+writes one from the configured production index.
+
+Use a local instance, e.g. `docker run -p 6380:6379 redis/redis-stack-server`.
+
+Usage:
+    python -m benchmarks.vector_search_eval --redis-url redis://localhost:6380 \\
+        --num-vectors 20000 --m 8 16 32 --ef-runtime 10 50 100 --top-k 1 5 10
+    python -m benchmarks.vector_search_eval --export corpus.npz
+    python -m benchmarks.vector_search_eval --corpus corpus.npz
+"""
+
+import argparse
+import itertools
+import time
+
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from llama_index.core import Settings as LlamaSettings, VectorStoreIndex
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.schema import QueryBundle, TextNode
+from llama_index.core.vector_stores.utils import node_to_metadata_dict
+from redis import Redis
+from redisvl.index import SearchIndex
+
+from app.core.config import get_settings
+from app.services.index_migration import get_index_memory_report, wait_for_indexing
+from app.services.vector_db import TypedRedisVectorStore, build_index_schema
+
+from .common import print_table, summarize_latencies
+
+
+def synthetic_vectors(
+    num_vectors: int,
+    num_queries: int,
+    dims: int,
+    num_clusters: int = 100,
+    spread: float = 0.3,
+    seed: int = 0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draws corpus and query vectors around shared random cluster centres.
+    """
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(num_clusters, dims))
+    centres /= np.linalg.norm(centres, axis=1, keepdims=True)
+
+    def draw(count: int) -> np.ndarray:
+        points = centres[rng.integers(num_clusters, size=count)]
+        points = points + rng.normal(scale=spread / np.sqrt(dims), size=points.shape)
+        return (points / np.linalg.norm(points, axis=1, keepdims=True)).astype(
+            np.float32
+        )
+
+    return draw(num_vectors), draw(num_queries)
+
+
+def load_corpus(path: Path, num_queries: int, seed: int = 0):
+    data = np.load(path)
+    vectors = data["vectors"].astype(np.float32)
+    if "queries" in data:
+        queries = data["queries"].astype(np.float32)
+    else:
+        rng = np.random.default_rng(seed)
+        picked = vectors[rng.choice(len(vectors), size=num_queries, replace=False)]
+        queries = picked + rng.normal(scale=0.01, size=picked.shape)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return vectors, queries.astype(np.float32)
+
+
+def export_corpus(path: Path):
+    """
+    Saves the vectors of the configured index as an .npz corpus.
+    """
+    from .local_replica import load_exact_vectors
+
+    settings = get_settings()
+    redis_client = Redis.from_url(settings.REDIS_URL)
+    _, vectors = load_exact_vectors(redis_client, settings.VECTOR_DATATYPE)
+    np.savez_compressed(path, vectors=vectors)
+    print(f"Exported {len(vectors)} vectors to {path}.")
+
+
+def exact_neighbours(
+    vectors: np.ndarray, queries: np.ndarray, k: int, block: int = 256
+) -> np.ndarray:
+    """
+    Returns the row indices of the exact top-k cosine neighbours of each query.
+    """
+    neighbours = []
+    for start in range(0, len(queries), block):
+        scores = queries[start : start + block] @ vectors.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(scores, top, axis=1).argsort(axis=1)[:, ::-1]
+        neighbours.append(np.take_along_axis(top, order, axis=1))
+    return np.concatenate(neighbours)
+
+
+def load_vectors(
+    redis_client: Redis, prefix: str, vectors: np.ndarray, datatype: str
+) -> None:
+    """
+    Writes the corpus as index documents in the layout of RedisVectorStore.
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    for index, vector in enumerate(vectors):
+        node = TextNode(id_=str(index), text=f"node {index}")
+        metadata = node_to_metadata_dict(node, remove_text=True, flat_metadata=True)
+        pipe.hset(
+            f"{prefix}:{index}",
+            mapping={
+                "id": str(index),
+                "doc_id": str(index),
+                "text": node.text,
+                "vector": vector.astype(datatype).tobytes(),
+                "_node_content": metadata["_node_content"],
+                "_node_type": metadata["_node_type"],
+            },
+        )
+        if index % 1000 == 999:
+            pipe.execute()
+    pipe.execute()
+
+
+def build_schema(settings, index_name: str, prefix: str, **hnsw):
+    schema = build_index_schema(settings.model_copy(update=hnsw))
+    schema.index.name = index_name
+    schema.index.prefix = prefix
+    return schema
+
+
+def drop_index(redis_client: Redis, index_name: str):
+    try:
+        redis_client.ft(index_name).dropindex(delete_documents=False)
+    except Exception:
+        pass
+
+
+def clear_corpus(redis_client: Redis, index_name: str, prefix: str):
+    drop_index(redis_client, index_name)
+    keys = list(redis_client.scan_iter(match=f"{prefix}:*", count=1000))
+    for start in range(0, len(keys), 1000):
+        redis_client.delete(*keys[start : start + 1000])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--redis-url", default="redis://localhost:6380")
+    parser.add_argument("--index-name", default="bench_gdrive")
+    parser.add_argument("--prefix", default="bench_doc")
+    parser.add_argument("--corpus", type=Path, default=None)
+    parser.add_argument("--export", type=Path, default=None)
+    parser.add_argument("--num-vectors", type=int, default=20000)
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--num-clusters", type=int, default=100)
+    parser.add_argument("--m", type=int, nargs="+", default=[16])
+    parser.add_argument("--ef-construction", type=int, nargs="+", default=[200])
+    parser.add_argument("--ef-runtime", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--top-k", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.export:
+        export_corpus(args.export)
+        return
+
+    settings = get_settings()
+    if args.corpus:
+        vectors, queries = load_corpus(args.corpus, args.num_queries, args.seed)
+    else:
+        vectors, queries = synthetic_vectors(
+            args.num_vectors,
+            args.num_queries,
+            settings.EMBEDDING_DIMENSION,
+            num_clusters=args.num_clusters,
+            seed=args.seed,
+        )
+    dims = vectors.shape[1]
+    settings = settings.model_copy(update={"EMBEDDING_DIMENSION": dims})
+
+    max_k = max(args.top_k)
+    expected = exact_neighbours(vectors, queries, max_k)
+    bundles = [QueryBundle(query_str="", embedding=q.tolist()) for q in queries]
+
+    redis_client = Redis.from_url(args.redis_url)
+    clear_corpus(redis_client, args.index_name, args.prefix)
+    started = time.perf_counter()
+    load_vectors(redis_client, args.prefix, vectors, settings.VECTOR_DATATYPE)
+    print(
+        f"Loaded {len(vectors)} vectors ({dims} dims, {settings.VECTOR_DATATYPE}) "
+        f"in {time.perf_counter() - started:.1f}s; {len(queries)} queries."
+    )
+
+    LlamaSettings.llm = None
+    rows = []
+    try:
+        for m, ef_construction, ef_runtime in itertools.product(
+            args.m, args.ef_construction, args.ef_runtime
+        ):
+            schema = build_schema(
+                settings,
+                args.index_name,
+                args.prefix,
+                HNSW_M=m,
+                HNSW_EF_CONSTRUCTION=ef_construction,
+                HNSW_EF_RUNTIME=ef_runtime,
+            )
+            drop_index(redis_client, args.index_name)
+            started = time.perf_counter()
+            SearchIndex(schema, redis_client=redis_client).create()
+            wait_for_indexing(redis_client, index_name=args.index_name)
+            build_seconds = time.perf_counter() - started
+            memory = get_index_memory_report(redis_client, args.index_name) or {}
+
+            index = VectorStoreIndex.from_vector_store(
+                TypedRedisVectorStore(schema=schema, redis_client=redis_client),
+                embed_model=MockEmbedding(embed_dim=dims),
+            )
+            for top_k in args.top_k:
+                retriever = index.as_retriever(similarity_top_k=top_k)
+                retriever.retrieve(bundles[0])
+
+                latencies: List[float] = []
+                recalls: List[float] = []
+                for bundle, truth in zip(bundles, expected):
+                    started = time.perf_counter()
+                    results = retriever.retrieve(bundle)
+                    latencies.append(time.perf_counter() - started)
+                    found = {int(result.node.node_id) for result in results}
+                    recalls.append(len(found & set(truth[:top_k].tolist())) / top_k)
+
+                rows.append(
+                    {
+                        "m": m,
+                        "ef_construction": ef_construction,
+                        "ef_runtime": ef_runtime,
+                        "top_k": top_k,
+                        "build_s": build_seconds,
+                        "index_mb": float(memory.get("vector_index_sz_mb", 0.0)),
+                        "recall": float(np.mean(recalls)),
+                        **summarize_latencies(latencies),
+                    }
+                )
+    finally:
+        clear_corpus(redis_client, args.index_name, args.prefix)
+
+    print_table(
+        rows,
+        [
+            "m",
+            "ef_construction",
+            "ef_runtime",
+            "top_k",
+            "build_s",
+            "index_mb",
+            "recall",
+            "p50_ms",
+            "p95_ms",
+            "p99_ms",
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
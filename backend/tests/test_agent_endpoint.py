@@ -1,6 +1,6 @@
 # KONSPECTO/backend/tests/test_agent_endpoint.py
 
-from unittest.mock import ANY, AsyncMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -23,6 +23,14 @@ def mock_youtube_to_docx():
         yield mock_convert
 
 
+@pytest.fixture(autouse=True)
+def mock_answer_cache():
+    with patch(
+        "app.api.v1.endpoints.agent.lookup_answer", return_value=None
+    ) as mock_lookup:
+        yield mock_lookup
+
+
 @pytest.fixture
 def mock_agent_executor():
     with patch("agent.react_agent.AgentExecutor.ainvoke") as mock_executor:
@@ -70,3 +78,82 @@ async def test_agent_unknown_request(mock_agent_executor, async_client):
     data = response.json()
     assert "response" in data
     assert "Извините, я не могу помочь с этим запросом." in data["response"]
+
+
+@pytest.mark.asyncio
+async def test_agent_stream_emits_sse_events(async_client):
+    async def fake_astream(query):
+        yield "action", {"tool": "RAGSearch", "tool_input": "свёртка"}
+        yield "token", {"text": "Свёртка"}
+        yield "final", {"response": "Свёртка"}
+
+    with patch("app.api.v1.endpoints.agent.agent_service.agent.astream", fake_astream):
+        response = await async_client.post(
+            "/api/v1/agent/stream", json={"query": "Что такое свёртка?"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.split("\n\n")[:3] == [
+        'event: action\ndata: {"tool": "RAGSearch", "tool_input": "свёртка"}',
+        'event: token\ndata: {"text": "Свёртка"}',
+        'event: final\ndata: {"response": "Свёртка"}',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_agent_answer_served_from_cache(
+    mock_answer_cache, mock_agent_executor, async_client
+):
+    from app.services.answer_cache import AnswerLookup
+
+    mock_answer_cache.return_value = AnswerLookup(
+        query="что такое градиентный спуск",
+        embedding=[0.1],
+        generation=3,
+        answer="Градиентный спуск - метод оптимизации.",
+        similarity=0.97,
+    )
+
+    query = {"query": "Что такое градиентный спуск?"}
+    response = await async_client.post("/api/v1/agent/", json=query)
+
+    assert response.status_code == 200
+    assert response.json()["response"] == "Градиентный спуск - метод оптимизации."
+    mock_agent_executor.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "tool, tool_input, stored",
+    [
+        ("RAGSearch", "градиентный спуск", True),
+        ("YouTubeToDocx", "https://youtu.be/AAA", False),
+    ],
+)
+async def test_agent_answer_cached_only_for_knowledge_base_runs(
+    mock_answer_cache, async_client, tool, tool_input, stored
+):
+    from langchain_core.agents import AgentAction
+
+    from app.services.answer_cache import AnswerLookup
+
+    mock_answer_cache.return_value = AnswerLookup(
+        query="сделай документ", embedding=[0.1], generation=3
+    )
+    cache = MagicMock()
+
+    async def fake_ainvoke(query, callbacks=()):
+        for callback in callbacks:
+            await callback.on_agent_action(AgentAction(tool, tool_input, ""))
+        return "Ответ агента"
+
+    with patch(
+        "app.api.v1.endpoints.agent.get_answer_cache", return_value=cache
+    ), patch("app.api.v1.endpoints.agent.agent_service.agent.ainvoke", fake_ainvoke):
+        response = await async_client.post(
+            "/api/v1/agent/", json={"query": "Сделай документ"}
+        )
+
+    assert response.status_code == 200
+    assert cache.store.called is stored
@@ -1,5 +1,8 @@
 # KONSPECTO/backend/tests/test_agent_search.py
 
+import asyncio
+import time
+
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -8,7 +11,7 @@ from agent.tools.search import SearchTool
 
 
 @pytest.fixture
-def mock_query_engine_response():
+def mock_retriever_nodes():
     class MockNode:
         def __init__(self, text):
             self.text = text
@@ -17,21 +20,20 @@ def mock_query_engine_response():
         def __init__(self, node):
             self.node = node
 
-    class MockResponse:
-        def __init__(self, texts):
-            self.source_nodes = [MockNodeWithScore(MockNode(text)) for text in texts]
+    def make_nodes(texts):
+        return [MockNodeWithScore(MockNode(text)) for text in texts]
 
-    return MockResponse
+    return make_nodes
 
 
-@patch("agent.tools.search.get_query_engine")  # Обновленный путь патча
-def test_search_success(mock_get_query_engine, mock_query_engine_response):
-    # Настройка мокового query engine
-    mock_query_engine_instance = MagicMock()
-    mock_query_engine_instance.query.return_value = mock_query_engine_response(
+@patch("agent.tools.search.get_retriever")
+def test_search_success(mock_get_retriever, mock_retriever_nodes):
+    # Настройка мокового ретривера
+    mock_retriever_instance = MagicMock()
+    mock_retriever_instance.retrieve.return_value = mock_retriever_nodes(
         ["Text of the first document.", "Text of the second document."]
     )
-    mock_get_query_engine.return_value = mock_query_engine_instance
+    mock_get_retriever.return_value = mock_retriever_instance
 
     query = "test query"
     results = SearchTool.search(query)
@@ -42,12 +44,12 @@ def test_search_success(mock_get_query_engine, mock_query_engine_response):
     assert results[1] == "Text of the second document."
 
 
-@patch("agent.tools.search.get_query_engine")  # Обновленный путь патча
-def test_search_exception(mock_get_query_engine):
-    # Настройка мокового query engine для генерации исключения
-    mock_query_engine_instance = MagicMock()
-    mock_query_engine_instance.query.side_effect = Exception("Test Exception")
-    mock_get_query_engine.return_value = mock_query_engine_instance
+@patch("agent.tools.search.get_retriever")
+def test_search_exception(mock_get_retriever):
+    # Настройка мокового ретривера для генерации исключения
+    mock_retriever_instance = MagicMock()
+    mock_retriever_instance.retrieve.side_effect = Exception("Test Exception")
+    mock_get_retriever.return_value = mock_retriever_instance
 
     query = "query causing error"
 
@@ -55,3 +57,59 @@ def test_search_exception(mock_get_query_engine):
         SearchTool.search(query)
 
     assert "Test Exception" in str(exc_info.value)
+
+
+@patch("agent.tools.search.get_retriever")
+@patch("agent.tools.search.get_query_embeddings")
+def test_search_many_embeds_queries_once(
+    mock_get_query_embeddings, mock_get_retriever, mock_retriever_nodes
+):
+    mock_get_query_embeddings.return_value = [[0.1], [0.2]]
+    texts = {0.1: ["Градиентный спуск - метод оптимизации."], 0.2: []}
+    mock_retriever_instance = MagicMock()
+    mock_retriever_instance.retrieve.side_effect = lambda bundle: mock_retriever_nodes(
+        texts[bundle.embedding[0]]
+    )
+    mock_get_retriever.return_value = mock_retriever_instance
+
+    results = SearchTool.search_many(["градиентный спуск", "преобразование Фурье"])
+
+    mock_get_query_embeddings.assert_called_once_with(
+        ["градиентный спуск", "преобразование Фурье"]
+    )
+    assert results == {
+        "градиентный спуск": ["Градиентный спуск - метод оптимизации."],
+        "преобразование Фурье": [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_asearch_runs_off_the_event_loop():
+    def search(query, top_k, mode):
+        assert query == "свёртка"
+        return ["Свёртка - операция над функциями."]
+
+    with patch("agent.tools.search.SearchTool.search", side_effect=search):
+        results = await SearchTool.asearch("свёртка", timeout=5)
+
+    assert results == ["Свёртка - операция над функциями."]
+
+
+@pytest.mark.asyncio
+async def test_asearch_timeout():
+    with patch(
+        "agent.tools.search.SearchTool.search", side_effect=lambda *_: time.sleep(0.5)
+    ):
+        with pytest.raises(asyncio.TimeoutError):
+            await SearchTool.asearch("свёртка", timeout=0.05)
+
+
+def test_parse_search_terms():
+    from agent.react_agent import parse_search_terms
+
+    assert parse_search_terms(
+        '"gradient descent"; Fourier transform\n;gradient descent'
+    ) == [
+        "gradient descent",
+        "Fourier transform",
+    ]
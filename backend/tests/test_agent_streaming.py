@@ -0,0 +1,71 @@
+# KONSPECTO/backend/tests/test_agent_streaming.py
+
+import pytest
+
+from langchain_core.agents import AgentAction
+from langchain_core.outputs import LLMResult
+
+from agent.streaming import AgentEventStream
+
+
+async def feed(stream, tokens):
+    await stream.on_chat_model_start({}, [[]])
+    for token in tokens:
+        await stream.on_llm_new_token(token)
+    await stream.on_llm_end(LLMResult(generations=[]))
+
+
+def drain(stream):
+    events = []
+    while not stream.queue.empty():
+        events.append(stream.queue.get_nowait())
+    return events
+
+
+def joined(events, name):
+    return "".join(data["text"] for event, data in events if event == name)
+
+
+@pytest.mark.asyncio
+async def test_tokens_after_final_answer_marker_are_answer_tokens():
+    stream = AgentEventStream()
+
+    await feed(
+        stream,
+        [
+            "Thought: I now know",
+            " the final answer.\nFinal ",
+            "Answ",
+            "er: Ряд",
+            " Фурье",
+        ],
+    )
+    events = drain(stream)
+
+    assert joined(events, "thought") == "Thought: I now know the final answer.\n"
+    assert [data["text"] for event, data in events if event == "token"] == [
+        "Ряд",
+        " Фурье",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_tool_steps_and_end_of_stream():
+    stream = AgentEventStream()
+
+    await feed(stream, ["Action: RAGSearch\nAction Input: свёртка"])
+    await stream.on_agent_action(AgentAction("RAGSearch", "свёртка", ""))
+    await stream.on_tool_end("свёртка - операция над функциями")
+    await feed(stream, ["Final Answer:", " Свёртка"])
+    stream.finish("final", {"response": "Свёртка"})
+
+    events = drain(stream)
+    assert events[-1] is None
+    assert [event for event, _ in events[:-1] if event != "thought"] == [
+        "action",
+        "observation",
+        "token",
+        "final",
+    ]
+    assert events[-2] == ("final", {"response": "Свёртка"})
+    assert joined(events[:-1], "thought") == "Action: RAGSearch\nAction Input: свёртка"
@@ -0,0 +1,102 @@
+# KONSPECTO/backend/tests/test_answer_cache.py
+
+from unittest.mock import MagicMock
+
+import fakeredis
+import numpy as np
+import pytest
+
+from app.services.answer_cache import ANSWER_CACHE_PREFIX, SemanticAnswerCache
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    # fakeredis has no RediSearch; entries are matched by a brute-force scan
+    redis_client = fakeredis.FakeRedis()
+    cache = SemanticAnswerCache(redis_client, dims=3, threshold=0.9, ttl=60)
+    monkeypatch.setattr(cache, "_ensure_index", lambda: None)
+
+    def nearest(embedding, generation):
+        best = None
+        query = np.asarray(embedding, dtype=np.float32)
+        for key in redis_client.scan_iter(match=f"{ANSWER_CACHE_PREFIX}:*"):
+            entry = redis_client.hgetall(key)
+            if int(entry[b"generation"]) != generation:
+                continue
+            vector = np.frombuffer(entry[b"vector"], dtype=np.float32)
+            similarity = float(
+                query @ vector / np.linalg.norm(query) / np.linalg.norm(vector)
+            )
+            if best is None or 1.0 - similarity < best["vector_distance"]:
+                best = {
+                    "answer": entry[b"answer"].decode("utf-8"),
+                    "elapsed": entry[b"elapsed"].decode("utf-8"),
+                    "vector_distance": 1.0 - similarity,
+                }
+        return best
+
+    monkeypatch.setattr(cache, "_nearest", nearest)
+    return cache
+
+
+def test_similar_question_is_served_from_cache(cache):
+    lookup = cache.lookup("что такое градиентный спуск", [1.0, 0.0, 0.0], 1)
+    assert lookup.answer is None
+    cache.store(lookup, "Градиентный спуск - метод оптимизации.", elapsed=30.0)
+
+    hit = cache.lookup("Что такое градиентный спуск?", [0.99, 0.05, 0.0], 1)
+    miss = cache.lookup("что такое ряд Фурье", [0.0, 1.0, 0.0], 1)
+
+    assert hit.answer == "Градиентный спуск - метод оптимизации."
+    assert hit.similarity == pytest.approx(0.9987, abs=1e-3)
+    assert miss.answer is None
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["stores"] == 1
+    assert 29.0 < stats["seconds_saved"] <= 30.0
+
+
+def test_new_generation_does_not_reuse_answers(cache):
+    lookup = cache.lookup("свёртка", [1.0, 0.0, 0.0], 1)
+    cache.store(lookup, "Свёртка - операция над функциями.", elapsed=10.0)
+
+    assert cache.lookup("свёртка", [1.0, 0.0, 0.0], 2).answer is None
+
+
+def test_entries_expire(cache):
+    lookup = cache.lookup("свёртка", [1.0, 0.0, 0.0], 1)
+    cache.store(lookup, "Свёртка - операция над функциями.", elapsed=10.0)
+
+    (key,) = cache.redis_client.keys(f"{ANSWER_CACHE_PREFIX}:*")
+    assert 0 < cache.redis_client.ttl(key) <= 60
+
+
+def test_lookup_errors_are_misses(cache, monkeypatch):
+    def fail(embedding, generation):
+        raise ConnectionError("Redis is down")
+
+    monkeypatch.setattr(cache, "_nearest", fail)
+
+    assert cache.lookup("свёртка", [1.0, 0.0, 0.0], 1).answer is None
+    assert cache.get_stats()["errors"] == 1
+
+
+def test_nearest_queries_the_closest_entry_of_the_generation(monkeypatch):
+    cache = SemanticAnswerCache(fakeredis.FakeRedis(), dims=3)
+    index = MagicMock()
+    index.query.return_value = [{"answer": "Ответ", "vector_distance": "0.01"}]
+    monkeypatch.setattr(cache, "_ensure_index", lambda: index)
+
+    entry = cache._nearest([1.0, 0.0, 0.0], 5)
+
+    (query,) = index.query.call_args.args
+    assert str(query).startswith(
+        "@generation:[5 5]=>[KNN 1 @vector $vector AS vector_distance] "
+        "RETURN 3 answer elapsed vector_distance"
+    )
+    assert query.params == {
+        "vector": np.asarray([1.0, 0.0, 0.0], dtype=np.float32).tobytes()
+    }
+    assert entry["answer"] == "Ответ"
@@ -0,0 +1,102 @@
+# KONSPECTO/backend/tests/test_chunk_merger.py
+
+from llama_index.core.schema import (
+    NodeRelationship,
+    NodeWithScore,
+    RelatedNodeInfo,
+    TextNode,
+)
+
+from app.services.chunk_merger import ChunkMerger
+
+DOCUMENT = (
+    "Ряд Фурье раскладывает периодическую функцию по гармоникам. "
+    "Коэффициенты вычисляются интегрированием по периоду.\n"
+    "Преобразование Фурье обобщает ряд на непериодические функции."
+)
+
+
+def make_node(start, end, score, file_id="f1", doc_id="d1", node_id=None):
+    node = TextNode(
+        id_=node_id or f"{file_id}-{start}",
+        text=DOCUMENT[start:end],
+        metadata={"file_id": file_id, "file_name": f"{file_id}.docx"},
+        start_char_idx=start,
+        end_char_idx=end,
+    )
+    node.relationships = {
+        NodeRelationship.SOURCE: RelatedNodeInfo(node_id=doc_id),
+    }
+    return NodeWithScore(node=node, score=score)
+
+
+def make_merger():
+    return ChunkMerger(max_gap=2, tokenizer=str.split)
+
+
+def test_overlapping_chunks_are_stitched():
+    merger = make_merger()
+    nodes = [make_node(40, 120, 0.9), make_node(0, 60, 0.7)]
+
+    merged = merger.merge(nodes)
+
+    assert len(merged) == 1
+    assert merged[0].node.text == DOCUMENT[0:120]
+    assert merged[0].node.start_char_idx == 0
+    assert merged[0].node.end_char_idx == 120
+    assert merged[0].score == 0.9
+    assert merged[0].node.node_id == "f1-40"
+
+
+def test_adjacent_chunks_are_joined_across_stripped_whitespace():
+    merger = make_merger()
+    split = DOCUMENT.index("\n")
+    nodes = [make_node(0, split, 0.8), make_node(split + 1, len(DOCUMENT), 0.6)]
+
+    merged = merger.merge(nodes)
+
+    assert [item.node.text for item in merged] == [DOCUMENT]
+
+
+def test_distant_and_foreign_chunks_keep_their_rank():
+    merger = make_merger()
+    nodes = [
+        make_node(130, 170, 0.9),
+        make_node(0, 30, 0.8, file_id="f2"),
+        make_node(10, 40, 0.75, doc_id="d2"),
+        make_node(0, 30, 0.7),
+        make_node(25, 60, 0.6),
+    ]
+
+    merged = merger.merge(nodes)
+
+    assert [(item.node.metadata["file_id"], item.score) for item in merged] == [
+        ("f1", 0.9),
+        ("f2", 0.8),
+        ("f1", 0.75),
+        ("f1", 0.7),
+    ]
+    assert merged[3].node.text == DOCUMENT[0:60]
+
+
+def test_nodes_without_offsets_pass_through():
+    merger = make_merger()
+    node = TextNode(text="без смещений", metadata={"file_id": "f1"})
+    nodes = [NodeWithScore(node=node, score=0.5), make_node(0, 30, 0.4)]
+
+    assert merger.merge(nodes) == nodes
+
+
+def test_tokens_saved_are_counted():
+    merger = make_merger()
+    nodes = [make_node(0, 60, 0.9), make_node(0, 120, 0.8)]
+
+    merger.merge(nodes)
+    merger.merge([make_node(0, 30, 0.5)])
+
+    stats = merger.get_stats()
+    assert stats["requests"] == 2
+    assert stats["chunks_in"] == 3
+    assert stats["chunks_merged"] == 1
+    assert stats["tokens_saved"] == len(DOCUMENT[0:60].split())
+    assert stats["tokens_saved_per_request"]["count"] == 2
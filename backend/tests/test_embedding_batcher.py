@@ -0,0 +1,69 @@
+# KONSPECTO/backend/tests/test_embedding_batcher.py
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from app.core.metrics import Histogram
+from app.services.embedding_batcher import MicroBatchingEmbedding
+from app.services.embeddings import BatchedQueryEmbedding
+
+
+def make_inner_model():
+    inner = MagicMock()
+    inner.model_name = "test-model"
+    inner.embed_batch_size = 16
+    inner.get_query_embedding.side_effect = lambda query: [float(len(query))]
+    inner.get_query_embedding_batch.side_effect = lambda queries: [
+        [float(len(query))] for query in queries
+    ]
+    return inner
+
+
+def test_histogram_snapshot():
+    histogram = Histogram([1, 5])
+    for value in (0.5, 3, 3, 10):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["count"] == 4
+    assert snapshot["buckets"] == {"le_1": 1, "le_5": 3, "le_inf": 4}
+
+
+def test_concurrent_queries_are_embedded_in_one_batch():
+    inner = make_inner_model()
+    embed_model = MicroBatchingEmbedding(inner, max_batch_size=8, max_wait_ms=200)
+    queries = ["а" * length for length in range(1, 9)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        embeddings = list(pool.map(embed_model.get_query_embedding, queries))
+    embed_model.close()
+
+    assert embeddings == [[float(length)] for length in range(1, 9)]
+    assert inner.get_query_embedding_batch.call_count == 1
+    stats = embed_model.get_stats()
+    assert stats["batch_size"]["count"] == 1
+    assert stats["wait_ms"]["count"] == 8
+
+
+def test_single_query_is_not_delayed_beyond_max_wait():
+    inner = make_inner_model()
+    embed_model = MicroBatchingEmbedding(inner, max_batch_size=8, max_wait_ms=1)
+
+    assert embed_model.get_query_embedding("ряд") == [3.0]
+    embed_model.close()
+
+    inner.get_query_embedding_batch.assert_called_once_with(["ряд"])
+
+
+def test_batched_query_embedding_uses_query_prompt():
+    embed_model = BatchedQueryEmbedding.model_construct()
+    queries = ["ряд", "свёртка"]
+
+    with patch.object(
+        BatchedQueryEmbedding, "_embed", return_value=[[3.0], [7.0]]
+    ) as embed:
+        assert embed_model.get_query_embedding_batch(queries) == [[3.0], [7.0]]
+        assert embed_model.get_query_embedding_batch([]) == []
+
+    embed.assert_called_once_with(queries, prompt_name="query")
@@ -0,0 +1,83 @@
+# KONSPECTO/backend/tests/test_embedding_cache.py
+
+from unittest.mock import MagicMock
+
+import fakeredis
+
+from app.services.embedding_cache import (
+    CachedQueryEmbedding,
+    QueryEmbeddingCache,
+    normalize_query,
+)
+
+
+def make_inner_model():
+    inner = MagicMock()
+    inner.model_name = "test-model"
+    inner.embed_batch_size = 16
+    inner.get_query_embedding.side_effect = lambda query: [float(len(query)), 0.5]
+    inner.get_query_embedding_batch.side_effect = lambda queries: [
+        [float(len(query)), 0.5] for query in queries
+    ]
+    return inner
+
+
+def test_normalize_query():
+    assert normalize_query("  Градиентный \n  спуск ") == "Градиентный спуск"
+
+
+def test_cached_query_embedding_local_hit():
+    inner = make_inner_model()
+    cache = QueryEmbeddingCache(redis_client=None, max_size=8)
+    embed_model = CachedQueryEmbedding(inner, cache=cache, cache_namespace="test")
+
+    first = embed_model.get_query_embedding("преобразование Фурье")
+    second = embed_model.get_query_embedding("  преобразование   Фурье ")
+
+    assert first == second
+    assert inner.get_query_embedding.call_count == 1
+    stats = cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["local_hits"] == 1
+
+
+def test_cached_query_embedding_shared_through_redis():
+    redis_client = fakeredis.FakeRedis()
+    inner = make_inner_model()
+    first_worker = CachedQueryEmbedding(
+        inner, cache=QueryEmbeddingCache(redis_client), cache_namespace="test"
+    )
+    second_cache = QueryEmbeddingCache(redis_client)
+    second_worker = CachedQueryEmbedding(
+        inner, cache=second_cache, cache_namespace="test"
+    )
+
+    first_worker.get_query_embedding("градиентный спуск")
+    embedding = second_worker.get_query_embedding("градиентный спуск")
+
+    assert embedding == [17.0, 0.5]
+    assert inner.get_query_embedding.call_count == 1
+    assert second_cache.get_stats()["redis_hits"] == 1
+
+
+def test_query_embedding_cache_evicts_least_recently_used():
+    cache = QueryEmbeddingCache(redis_client=None, max_size=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    cache.get("a")
+    cache.put("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+
+
+def test_query_embedding_batch_only_embeds_misses():
+    inner = make_inner_model()
+    cache = QueryEmbeddingCache(redis_client=None, max_size=8)
+    embed_model = CachedQueryEmbedding(inner, cache=cache, cache_namespace="test")
+    embed_model.get_query_embedding("ряд")
+
+    embeddings = embed_model.get_query_embedding_batch(["ряд", " свёртка ", "БПФ"])
+
+    assert embeddings == [[3.0, 0.5], [7.0, 0.5], [3.0, 0.5]]
+    inner.get_query_embedding_batch.assert_called_once_with(["свёртка", "БПФ"])
@@ -0,0 +1,143 @@
+# KONSPECTO/backend/tests/test_hybrid_search.py
+
+import threading
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from llama_index.core.schema import NodeWithScore, TextNode
+from llama_index.core.vector_stores import (
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+
+from app.services.hybrid_search import (
+    HybridRetriever,
+    build_filter_expression,
+    build_full_text_query,
+    reciprocal_rank_fusion,
+)
+
+
+def make_nodes(*node_ids):
+    return [
+        NodeWithScore(node=TextNode(id_=node_id, text=node_id), score=1.0)
+        for node_id in node_ids
+    ]
+
+
+def test_build_full_text_query():
+    assert build_full_text_query("БПФ и ряд Фурье?") == "@text:(БПФ | ряд | Фурье)"
+    assert build_full_text_query("?! a") == ""
+
+
+def test_reciprocal_rank_fusion_prefers_nodes_in_both_lists():
+    fused = reciprocal_rank_fusion([make_nodes("a", "b"), make_nodes("c", "b")], k=60)
+
+    assert [node.node.node_id for node in fused] == ["b", "a", "c"]
+    assert fused[0].score == 1 / 62 + 1 / 62
+
+
+def test_hybrid_retriever_fuses_vector_and_full_text_results():
+    vector_retriever = MagicMock()
+    vector_retriever.retrieve.return_value = make_nodes("a", "b")
+    retriever = HybridRetriever(
+        vector_retriever=vector_retriever,
+        redis_client=MagicMock(),
+        similarity_top_k=2,
+    )
+
+    with patch.object(
+        HybridRetriever, "full_text_search", return_value=make_nodes("b", "c")
+    ):
+        results = retriever.retrieve("преобразование Фурье")
+
+    assert [node.node.node_id for node in results] == ["b", "a"]
+
+
+def test_hybrid_retriever_applies_threshold_to_vector_candidates():
+    vector_retriever = MagicMock()
+    vector_retriever.retrieve.return_value = [
+        NodeWithScore(node=TextNode(id_="a", text="a"), score=0.9),
+        NodeWithScore(node=TextNode(id_="b", text="b"), score=0.5),
+    ]
+    retriever = HybridRetriever(
+        vector_retriever=vector_retriever,
+        redis_client=MagicMock(),
+        similarity_top_k=3,
+        score_threshold=0.8,
+    )
+
+    with patch.object(
+        HybridRetriever, "full_text_search", return_value=make_nodes("c")
+    ):
+        results = retriever.retrieve("преобразование Фурье")
+
+    assert [node.node.node_id for node in results] == ["a", "c"]
+
+
+def test_hybrid_retriever_runs_both_queries_in_the_calling_thread():
+    threads = []
+    vector_retriever = MagicMock()
+    vector_retriever.retrieve.side_effect = lambda query_bundle: (
+        threads.append(threading.current_thread()) or make_nodes("a")
+    )
+    retriever = HybridRetriever(
+        vector_retriever=vector_retriever, redis_client=MagicMock()
+    )
+
+    with patch.object(
+        HybridRetriever,
+        "full_text_search",
+        side_effect=lambda query_str: (
+            threads.append(threading.current_thread()) or make_nodes("b")
+        ),
+    ):
+        retriever.retrieve("преобразование Фурье")
+
+    assert threads == [threading.current_thread()] * 2
+
+
+def test_build_filter_expression():
+    filters = MetadataFilters(
+        filters=[
+            MetadataFilter(
+                key="file_name",
+                value=["lecture 1.docx", "lecture_2.docx"],
+                operator=FilterOperator.IN,
+            ),
+            MetadataFilter(
+                key="modified_at_ts", value=1700000000.0, operator=FilterOperator.GTE
+            ),
+        ]
+    )
+
+    assert build_filter_expression(filters) == (
+        "(@file_name:{lecture\\ 1\\.docx|lecture_2\\.docx} "
+        "@modified_at_ts:[1700000000.0 +inf])"
+    )
+    assert build_filter_expression(None) == ""
+
+
+def test_build_filter_expression_rejects_unindexed_fields():
+    filters = MetadataFilters(filters=[MetadataFilter(key="author", value="x")])
+
+    with pytest.raises(ValueError):
+        build_filter_expression(filters)
+
+
+def test_full_text_search_applies_filters():
+    redis_client = MagicMock()
+    redis_client.ft.return_value.search.return_value.docs = []
+    retriever = HybridRetriever(
+        vector_retriever=MagicMock(),
+        redis_client=redis_client,
+        filters=MetadataFilters(filters=[MetadataFilter(key="file_id", value="a1")]),
+    )
+
+    retriever.full_text_search("ряд Фурье")
+
+    query = redis_client.ft.return_value.search.call_args.args[0]
+    assert query.query_string() == "@text:(ряд | Фурье) @file_id:{a1}"
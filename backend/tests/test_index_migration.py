@@ -0,0 +1,65 @@
+# KONSPECTO/backend/tests/test_index_migration.py
+
+import fakeredis
+import numpy as np
+
+from app.services.index_migration import (
+    convert_vectors,
+    estimate_vector_memory,
+    reset_sync_state,
+)
+from app.services.index_sync import CursorEntry, DocumentFingerprintStore, SyncCursor
+
+
+def test_estimate_vector_memory_float16_halves_vector_data():
+    float32 = estimate_vector_memory(1_000_000, 1024, "float32", 16)
+    float16 = estimate_vector_memory(1_000_000, 1024, "float16", 16)
+
+    assert float16["vectors_mb"] == float32["vectors_mb"] / 2
+    assert float16["graph_mb"] == float32["graph_mb"]
+    assert round(float32["vectors_mb"]) == 3906
+
+
+def test_convert_vectors_to_float16():
+    redis_client = fakeredis.FakeRedis()
+    vector = np.array([0.25, -0.5, 1.0], dtype=np.float32)
+    redis_client.hset("doc:1", mapping={"vector": vector.tobytes(), "text": "t"})
+    redis_client.hset("other:1", mapping={"vector": vector.tobytes()})
+
+    converted = convert_vectors(redis_client, "float32", "float16", dims=3)
+
+    assert converted == 1
+    stored = np.frombuffer(redis_client.hget("doc:1", "vector"), dtype=np.float16)
+    assert stored.tolist() == [0.25, -0.5, 1.0]
+    assert len(redis_client.hget("other:1", "vector")) == vector.nbytes
+
+
+def test_convert_vectors_can_be_rerun():
+    redis_client = fakeredis.FakeRedis()
+    vector = np.array([0.25, -0.5, 1.0, 2.0], dtype=np.float32)
+    redis_client.hset("doc:1", mapping={"vector": vector.tobytes()})
+    # Converted by an interrupted earlier run
+    redis_client.hset("doc:2", mapping={"vector": vector.astype(np.float16).tobytes()})
+
+    assert convert_vectors(redis_client, "float32", "float16", dims=4) == 1
+    assert convert_vectors(redis_client, "float32", "float16", dims=4) == 0
+
+    for key in ("doc:1", "doc:2"):
+        stored = np.frombuffer(redis_client.hget(key, "vector"), dtype=np.float16)
+        assert stored.tolist() == [0.25, -0.5, 1.0, 2.0]
+
+
+def test_reset_sync_state_clears_cursor_and_fingerprints():
+    redis_client = fakeredis.FakeRedis()
+    cursor = SyncCursor(redis_client, "local:/notes")
+    fingerprints = DocumentFingerprintStore(redis_client, "local:/notes")
+    other_cursor = SyncCursor(redis_client, "local:/other")
+    cursor.update({"a.txt": CursorEntry(modified_at="1")})
+    other_cursor.update({"b.txt": CursorEntry(modified_at="1")})
+    fingerprints.update({"a.txt": "x"})
+
+    reset_sync_state(redis_client, "local:/notes")
+
+    assert cursor.load() == {}
+    assert fingerprints.get_many(["a.txt"]) == {}
+    assert list(other_cursor.load()) == ["b.txt"]
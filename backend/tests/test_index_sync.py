@@ -0,0 +1,234 @@
+# KONSPECTO/backend/tests/test_index_sync.py
+
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import pytest
+
+from llama_index.core import Document
+
+from app.services.document_sources import (
+    LocalDirectorySource,
+    SourceFile,
+    get_document_file_id,
+    normalize_document_metadata,
+)
+from app.services.index_sync import (
+    CursorEntry,
+    DocumentFingerprintStore,
+    IndexGeneration,
+    IndexSynchronizer,
+    SyncCursor,
+    compute_delta,
+)
+
+
+@pytest.fixture
+def documents_dir(tmp_path):
+    (tmp_path / "lecture_1.txt").write_text("Градиентный спуск.", encoding="utf-8")
+    (tmp_path / "lecture_2.txt").write_text("Преобразование Фурье.", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def mock_pipeline():
+    pipeline = MagicMock()
+    pipeline.run.side_effect = lambda documents: [MagicMock() for _ in documents]
+    return pipeline
+
+
+def make_synchronizer(source, pipeline):
+    cursor = SyncCursor(fakeredis.FakeRedis(), source.source_key)
+    return IndexSynchronizer(source=source, pipeline=pipeline, cursor=cursor)
+
+
+def test_compute_delta():
+    files = [
+        SourceFile(file_id="a", file_name="a", modified_at="1", checksum="x"),
+        SourceFile(file_id="b", file_name="b", modified_at="2", checksum="y"),
+        SourceFile(file_id="c", file_name="c", modified_at="3"),
+        SourceFile(file_id="d", file_name="d", modified_at="4"),
+    ]
+    cursor_entries = {
+        "a": CursorEntry(modified_at="0", checksum="x"),
+        "b": CursorEntry(modified_at="2", checksum="old"),
+        "c": CursorEntry(modified_at="2"),
+        "gone": CursorEntry(modified_at="1"),
+    }
+
+    delta = compute_delta(files, cursor_entries)
+
+    assert delta.added == ["d"]
+    assert delta.changed == ["b", "c"]
+    assert delta.removed == ["gone"]
+    assert delta.unchanged == 1
+
+
+def test_delta_sync_only_ingests_changed_files(documents_dir, mock_pipeline):
+    synchronizer = make_synchronizer(LocalDirectorySource(documents_dir), mock_pipeline)
+
+    first = synchronizer.sync(mode="delta")
+    assert first.files_added == 2
+    assert first.documents_loaded == 2
+
+    second = synchronizer.sync(mode="delta")
+    assert second.files_unchanged == 2
+    assert second.documents_loaded == 0
+
+    (documents_dir / "lecture_2.txt").write_text("Ряд Фурье.", encoding="utf-8")
+    third = synchronizer.sync(mode="delta")
+    assert third.files_changed == 1
+    assert third.documents_loaded == 1
+    ingested = mock_pipeline.run.call_args.kwargs["documents"]
+    assert ingested[0].metadata["file_id"] == "lecture_2.txt"
+
+
+def test_delta_sync_deletes_removed_files(documents_dir, mock_pipeline):
+    synchronizer = make_synchronizer(LocalDirectorySource(documents_dir), mock_pipeline)
+    synchronizer.sync(mode="delta")
+
+    (documents_dir / "lecture_1.txt").unlink()
+    stats = synchronizer.sync(mode="delta")
+
+    assert stats.files_removed == 1
+    mock_pipeline.vector_store.delete.assert_called_once()
+    assert "lecture_1.txt" not in synchronizer.cursor.load()
+
+
+def test_node_parser_change_reingests_files(documents_dir, mock_pipeline):
+    source = LocalDirectorySource(documents_dir)
+    cursor = SyncCursor(fakeredis.FakeRedis(), source.source_key)
+
+    IndexSynchronizer(
+        source=source,
+        pipeline=mock_pipeline,
+        cursor=cursor,
+        node_parser_key="sentence:600:400",
+    ).sync(mode="delta")
+    stats = IndexSynchronizer(
+        source=source,
+        pipeline=mock_pipeline,
+        cursor=cursor,
+        node_parser_key="structure:600:0",
+    ).sync(mode="delta")
+
+    assert stats.files_changed == 2
+    assert mock_pipeline.vector_store.delete.call_count == 2
+    assert all(
+        entry.node_parser == "structure:600:0" for entry in cursor.load().values()
+    )
+
+
+def test_full_sync_skips_unchanged_documents(documents_dir, mock_pipeline):
+    source = LocalDirectorySource(documents_dir)
+    redis_client = fakeredis.FakeRedis()
+    synchronizer = IndexSynchronizer(
+        source=source,
+        pipeline=mock_pipeline,
+        cursor=SyncCursor(redis_client, source.source_key),
+        fingerprints=DocumentFingerprintStore(redis_client, source.source_key),
+    )
+
+    first = synchronizer.sync(mode="full")
+    assert first.documents_skipped == 0
+
+    second = synchronizer.sync(mode="full")
+    assert second.documents_loaded == 2
+    assert second.documents_skipped == 2
+    assert second.nodes_ingested == 0
+    assert mock_pipeline.run.call_count == 1
+
+    (documents_dir / "lecture_2.txt").write_text("Ряд Фурье.", encoding="utf-8")
+    third = synchronizer.sync(mode="full")
+    assert third.documents_skipped == 1
+    ingested = mock_pipeline.run.call_args.kwargs["documents"]
+    assert [document.metadata["file_id"] for document in ingested] == ["lecture_2.txt"]
+
+
+def test_index_writes_bump_generation(documents_dir, mock_pipeline):
+    source = LocalDirectorySource(documents_dir)
+    redis_client = fakeredis.FakeRedis()
+    generation = IndexGeneration(redis_client)
+    synchronizer = IndexSynchronizer(
+        source=source,
+        pipeline=mock_pipeline,
+        cursor=SyncCursor(redis_client, source.source_key),
+        generation=generation,
+    )
+
+    synchronizer.sync(mode="delta")
+    assert generation.get() == 1
+
+    synchronizer.sync(mode="delta")
+    assert generation.get() == 1
+
+    ingested = set(generation.changes_since(0))
+    assert len(ingested) == 2
+
+    (documents_dir / "lecture_1.txt").unlink()
+    synchronizer.sync(mode="delta")
+    assert generation.get() == 2
+    removed = generation.changes_since(1)
+    assert len(removed) == 1 and removed[0] in ingested
+
+
+def test_generation_bump_without_documents_requests_full_reload():
+    generation = IndexGeneration(fakeredis.FakeRedis())
+    generation.bump(["a", "b"])
+    generation.bump(["a"])
+    generation.bump()
+
+    assert generation.get() == 3
+    assert generation.changes_since(0) == ["b", "a", IndexGeneration.FULL_RELOAD]
+    assert generation.changes_since(2) == [IndexGeneration.FULL_RELOAD]
+    assert generation.changes_since(3) == []
+
+
+def test_generation_change_log_is_trimmed():
+    redis_client = fakeredis.FakeRedis()
+    generation = IndexGeneration(redis_client, retention=2)
+    for doc_id in ("a", "b", "c", "d"):
+        generation.bump([doc_id])
+
+    assert redis_client.zcard(IndexGeneration.CHANGES_KEY) == 2
+    assert generation.changes_since(2) == ["c", "d"]
+    assert generation.changes_since(3) == ["d"]
+    # Changes after generation 1 were trimmed
+    assert generation.changes_since(1) == [IndexGeneration.FULL_RELOAD]
+
+
+def test_local_source_normalizes_metadata(documents_dir):
+    source = LocalDirectorySource(documents_dir)
+
+    with patch.object(LocalDirectorySource, "list_files") as list_files:
+        documents = source.load_files(["lecture_1.txt"])
+
+    list_files.assert_not_called()
+    metadata = documents[0].metadata
+    assert metadata["file_id"] == "lecture_1.txt"
+    assert metadata["file_name"] == "lecture_1.txt"
+    assert metadata["modified_at_ts"] == pytest.approx(
+        (documents_dir / "lecture_1.txt").stat().st_mtime, abs=1e-3
+    )
+    assert "modified_at_ts" in documents[0].excluded_embed_metadata_keys
+
+
+def test_normalize_document_metadata_renames_google_drive_keys():
+    document = Document(
+        text="Ряд Фурье.",
+        metadata={
+            "file id": "1a2B",
+            "file name": "lecture.docx",
+            "modified at": "2024-09-01T00:00:00.000Z",
+        },
+    )
+
+    normalize_document_metadata([document])
+
+    assert document.metadata == {
+        "file_id": "1a2B",
+        "file_name": "lecture.docx",
+        "modified_at": "2024-09-01T00:00:00.000Z",
+        "modified_at_ts": 1725148800.0,
+    }
+    assert get_document_file_id(document) == "1a2B"
@@ -0,0 +1,58 @@
+# KONSPECTO/backend/tests/test_ingestion_worker.py
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services import ingestion_worker
+from app.services.ingestion_worker import IngestionWorker
+
+
+@pytest.fixture(autouse=True)
+def no_local_replica(monkeypatch):
+    monkeypatch.setattr(ingestion_worker, "start_local_replica", lambda: None)
+
+
+def make_worker(index_manager, max_retries=3):
+    return IngestionWorker(
+        index_manager=index_manager,
+        max_retries=max_retries,
+        retry_backoff=0.01,
+        retry_max_backoff=0.02,
+    )
+
+
+@pytest.mark.asyncio
+async def test_failed_index_load_is_retried():
+    index_manager = MagicMock()
+    index_manager.get_index.side_effect = [
+        ConnectionError("Redis is down"),
+        ConnectionError("Redis is down"),
+        MagicMock(),
+    ]
+    index_manager.is_ready.return_value = True
+    worker = make_worker(index_manager)
+
+    await worker.start()
+
+    assert index_manager.get_index.call_count == 3
+    index_manager.sync_documents.assert_called_once()
+    assert worker.status.state == "completed"
+    assert worker.status.retries == 2
+    assert worker.status.error is None
+
+
+@pytest.mark.asyncio
+async def test_worker_fails_after_exhausting_retries():
+    index_manager = MagicMock()
+    index_manager.is_ready.return_value = True
+    index_manager.sync_documents.side_effect = RuntimeError("Drive is unavailable")
+    worker = make_worker(index_manager, max_retries=2)
+
+    await worker.start()
+
+    assert index_manager.sync_documents.call_count == 3
+    assert worker.status.state == "failed"
+    assert worker.status.retries == 2
+    assert worker.status.error == "Drive is unavailable"
+    assert worker.status.index_ready
@@ -0,0 +1,92 @@
+# KONSPECTO/backend/tests/test_llm_http_client.py
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import get_settings
+from app.services.llm import http_client
+from app.services.llm.http_client import InstrumentedTransport, get_llm_http_client
+from app.services.llm.llm_studio_client import LLMStudioClient
+
+RESPONSE = (
+    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+    b"Content-Length: 2\r\n\r\n{}"
+)
+
+
+async def start_server(respond: bool):
+    """Local HTTP/1.1 server answering every request on a kept-alive connection."""
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                if respond:
+                    writer.write(RESPONSE)
+                    await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}", connections
+
+
+def make_client(timeout: float = 5.0):
+    transport = InstrumentedTransport(
+        httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=2)),
+        max_connections=2,
+    )
+    return transport, httpx.AsyncClient(transport=transport, timeout=timeout)
+
+
+@pytest.mark.asyncio
+async def test_connections_are_kept_alive_and_reused():
+    server, url, connections = await start_server(respond=True)
+    transport, client = make_client()
+    async with server, client:
+        for _ in range(3):
+            response = await client.get(url)
+            assert response.status_code == 200
+
+        stats = transport.get_stats()
+
+    assert len(connections) == 1
+    assert stats["requests"] == 3
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == 2
+    assert stats["open_connections"] == 1
+    assert stats["idle_connections"] == 1
+    assert stats["waiting"] == 0
+    assert stats["connection_wait_ms"]["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_stuck_server_times_out():
+    server, url, _ = await start_server(respond=False)
+    transport, client = make_client(timeout=0.2)
+    async with server, client:
+        with pytest.raises(httpx.ReadTimeout):
+            await client.get(url)
+
+    stats = transport.get_stats()
+    assert stats["failed"] == 1
+    assert stats["waiting"] == 0
+
+
+def test_llm_clients_share_the_pooled_http_client():
+    settings = get_settings()
+
+    first = LLMStudioClient()
+    second = LLMStudioClient()
+
+    shared = get_llm_http_client()
+    assert first.http_async_client is shared
+    assert second.http_async_client is shared
+    assert first.max_retries == settings.LLM_MAX_RETRIES
+    assert first.request_timeout.read == settings.LLM_HTTP_READ_TIMEOUT
+    assert first.request_timeout.connect == settings.LLM_HTTP_CONNECT_TIMEOUT
+    asyncio.run(http_client.close_llm_http_client())
@@ -0,0 +1,171 @@
+# KONSPECTO/backend/tests/test_local_replica.py
+
+import fakeredis
+import numpy as np
+import pytest
+
+from llama_index.core.schema import QueryBundle, TextNode
+from llama_index.core.vector_stores.utils import node_to_metadata_dict
+
+from app.services.index_sync import IndexGeneration
+from app.services.local_replica import LocalReplicaRetriever, LocalVectorReplica
+
+DIMS = 4
+
+
+def add_node(redis_client, node_id, doc_id, vector, text, dtype=np.float32):
+    node = TextNode(id_=node_id, text=text, metadata={"file_name": f"{doc_id}.txt"})
+    node.relationships = {}
+    metadata = node_to_metadata_dict(node, remove_text=True, flat_metadata=False)
+    redis_client.hset(
+        f"doc:{node_id}",
+        mapping={
+            "id": node_id,
+            "doc_id": doc_id,
+            "text": text,
+            "vector": np.array(vector, dtype=dtype).tobytes(),
+            "_node_content": metadata["_node_content"],
+            "_node_type": metadata["_node_type"],
+        },
+    )
+
+
+def find_document_keys(redis_client):
+    # fakeredis has no RediSearch; match the doc_id field of the hashes instead
+    def find(doc_id):
+        return [
+            key.decode("utf-8")
+            for key in redis_client.scan_iter(match="doc:*")
+            if redis_client.hget(key, "doc_id") == doc_id.encode("utf-8")
+        ]
+
+    return find
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture
+def replica(redis_client, tmp_path, monkeypatch):
+    replica = LocalVectorReplica(redis_client, dims=DIMS, directory=tmp_path)
+    monkeypatch.setattr(
+        replica, "_find_document_keys", find_document_keys(redis_client)
+    )
+    return replica
+
+
+def test_full_load_and_search(redis_client, replica):
+    add_node(redis_client, "n1", "a", [1, 0, 0, 0], "Градиентный спуск")
+    add_node(redis_client, "n2", "b", [0, 1, 0, 0], "Преобразование Фурье")
+    add_node(redis_client, "n3", "b", [0, 0.9, 0.1, 0], "Ряд Фурье")
+
+    assert not replica.is_ready
+    assert replica.refresh() is True
+    assert replica.is_ready
+    assert len(replica) == 3
+
+    results = replica.search([0, 2, 0, 0], top_k=2)
+    assert [result.node.node_id for result in results] == ["n2", "n3"]
+    assert results[0].node.text == "Преобразование Фурье"
+    assert results[0].node.metadata["file_name"] == "b.txt"
+    assert results[0].score == pytest.approx(1.0, abs=1e-3)
+
+    # Nothing changed since the last refresh
+    assert replica.refresh() is False
+
+
+def test_vector_datatype_is_detected_from_blob_size(
+    redis_client, tmp_path, monkeypatch
+):
+    replica = LocalVectorReplica(
+        redis_client, dims=DIMS, directory=tmp_path, source_datatype="float16"
+    )
+    monkeypatch.setattr(
+        replica, "_find_document_keys", find_document_keys(redis_client)
+    )
+    add_node(redis_client, "n1", "a", [1, 0, 0, 0], "Градиентный спуск", np.float16)
+    # Written as float32 before the index was migrated to float16
+    add_node(redis_client, "n2", "b", [0, 1, 0, 0], "Ряд Фурье", np.float32)
+    redis_client.hset("doc:n3", mapping={"vector": b"\x00" * 6, "_node_content": "{}"})
+
+    replica.refresh()
+
+    assert len(replica) == 2
+    assert replica.get_stats()["skipped_vectors"] == 1
+    results = replica.search([0, 1, 0, 0], top_k=1)
+    assert results[0].node.node_id == "n2"
+    assert results[0].score == pytest.approx(1.0, abs=1e-3)
+
+
+def test_incremental_refresh_applies_changed_documents(redis_client, replica):
+    generation = IndexGeneration(redis_client)
+    add_node(redis_client, "n1", "a", [1, 0, 0, 0], "old a")
+    add_node(redis_client, "n2", "b", [0, 1, 0, 0], "b")
+    replica.refresh()
+
+    # Document "a" is re-ingested with another node, document "c" is added
+    redis_client.delete("doc:n1")
+    add_node(redis_client, "n4", "a", [1, 0, 0, 0], "new a")
+    add_node(redis_client, "n5", "c", [0, 0, 1, 0], "c")
+    generation.bump(["a", "c"])
+
+    assert replica.refresh() is True
+    assert len(replica) == 3
+    assert replica.search([1, 0, 0, 0])[0].node.text == "new a"
+    assert replica.search([0, 0, 1, 0])[0].node.node_id == "n5"
+
+    # Document "b" is deleted
+    redis_client.delete("doc:n2")
+    generation.bump(["b"])
+    replica.refresh()
+
+    assert len(replica) == 2
+    assert "n2" not in {r.node.node_id for r in replica.search([0, 1, 0, 0], 3)}
+
+    stats = replica.get_stats()
+    assert stats["full_loads"] == 1
+    assert stats["incremental_refreshes"] == 2
+    assert stats["documents_refreshed"] == 3
+    assert stats["generation"] == generation.get()
+
+
+def test_untracked_write_triggers_full_load(redis_client, replica):
+    add_node(redis_client, "n1", "a", [1, 0, 0, 0], "a")
+    replica.refresh()
+
+    add_node(redis_client, "n2", "b", [0, 1, 0, 0], "b")
+    IndexGeneration(redis_client).bump()
+    replica.refresh()
+
+    assert len(replica) == 2
+    assert replica.get_stats()["full_loads"] == 2
+
+
+def test_replica_grows_past_its_capacity(redis_client, replica):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(1500, DIMS))
+    for index, vector in enumerate(vectors):
+        add_node(redis_client, f"n{index}", f"d{index % 10}", vector, f"text {index}")
+    replica.refresh()
+
+    # Re-reading a document masks its previous rows and appends them again
+    IndexGeneration(redis_client).bump(["d4"])
+    replica.refresh()
+
+    assert len(replica) == 1500
+    assert replica.get_stats()["deleted_rows"] == 150
+    results = replica.search(vectors[1234], top_k=1)
+    assert results[0].node.node_id == "n1234"
+
+
+def test_retriever_uses_query_bundle_embedding(redis_client, replica):
+    add_node(redis_client, "n1", "a", [1, 0, 0, 0], "a")
+    add_node(redis_client, "n2", "b", [0, 1, 0, 0], "b")
+    replica.refresh()
+
+    retriever = LocalReplicaRetriever(replica, embed_model=None, similarity_top_k=1)
+    results = retriever.retrieve(QueryBundle("b", embedding=[0.1, 1, 0, 0]))
+
+    assert [result.node.node_id for result in results] == ["n2"]
@@ -1,10 +1,13 @@
 # KONSPECTO/backend/tests/test_main.py
 
+from unittest.mock import MagicMock
+
 import pytest
 
 from httpx import AsyncClient
 
 from app.main import app
+from app.models.ingestion import IngestionStatus
 
 
 @pytest.mark.asyncio
@@ -27,3 +30,45 @@ async def test_health_check(async_client):
     assert "redis_connected" in data
     if data["status"] == "unhealthy":
         pass  # Further checks can be added if needed
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "state,index_ready,status_code",
+    [
+        ("idle", False, 503),
+        ("loading_index", False, 503),
+        ("retrying", False, 503),
+        ("syncing", True, 200),
+        ("retrying", True, 200),
+        ("completed", True, 200),
+        ("failed", False, 503),
+        ("failed", True, 200),
+    ],
+)
+async def test_readiness_check(
+    async_client, monkeypatch, state, index_ready, status_code
+):
+    worker = app.state.ingestion_worker
+    index_manager = MagicMock()
+    index_manager.is_ready.return_value = index_ready
+    monkeypatch.setattr(worker, "index_manager", index_manager)
+    monkeypatch.setattr(worker, "status", IngestionStatus(state=state))
+
+    response = await async_client.get("/ready")
+
+    assert response.status_code == status_code
+    data = response.json()
+    assert data["status"] == ("ready" if status_code == 200 else "not_ready")
+    assert data["ingestion"]["state"] == state
+
+
+@pytest.mark.asyncio
+async def test_ingestion_status(async_client):
+    response = await async_client.get("/api/v1/ingestion/status")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert "state" in data
+    assert "index_ready" in data
+    assert "files_processed" in data
@@ -0,0 +1,117 @@
+# KONSPECTO/backend/tests/test_node_parsers.py
+
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import Document
+
+from app.core.config import Settings, get_settings
+from app.services.node_parsers import (
+    StructureAwareNodeParser,
+    build_node_parser,
+    classify_line,
+    find_chunk_span,
+)
+
+TEXT = "\n".join(
+    [
+        "Лекция 1",
+        "1.1 Градиентный спуск",
+        "Градиентный спуск минимизирует функцию потерь шаг за шагом.",
+        "Шаг обучения задаёт длину шага.",
+        "- сходимость зависит от шага",
+        "- слишком большой шаг расходится",
+        "1.2 Преобразование Фурье",
+        "Преобразование Фурье раскладывает сигнал по частотам.",
+    ]
+)
+
+
+def make_parser(**kwargs):
+    return StructureAwareNodeParser(tokenizer=str.split, min_chunk_size=0, **kwargs)
+
+
+def test_classify_line():
+    assert classify_line("## Ряды Фурье") == "heading"
+    assert classify_line("2.3 Свёртка") == "heading"
+    assert classify_line("ОПРЕДЕЛЕНИЯ") == "heading"
+    assert classify_line("- первый пункт") == "list"
+    assert classify_line("1) первый пункт") == "list"
+    assert classify_line("Обычный абзац текста.") == "text"
+
+
+def test_headings_open_new_chunks():
+    chunks = make_parser(chunk_size=100).split_text(TEXT)
+
+    assert len(chunks) == 2
+    assert chunks[0].startswith("Лекция 1\n1.1 Градиентный спуск")
+    assert chunks[0].endswith("расходится")
+    assert chunks[1].startswith("1.2 Преобразование Фурье")
+
+
+def test_chunks_are_substrings_without_overlap():
+    chunks = make_parser(chunk_size=14).split_text(TEXT)
+
+    assert all(chunk in TEXT for chunk in chunks)
+    assert sum(len(chunk.split()) for chunk in chunks) == len(TEXT.split())
+    # A heading is never the last line of a chunk
+    assert all(classify_line(chunk.splitlines()[-1]) != "heading" for chunk in chunks)
+
+
+def test_overlap_repeats_whole_blocks():
+    text = "\n".join(f"Абзац номер {index} текста." for index in range(6))
+    chunks = make_parser(chunk_size=12, chunk_overlap=4).split_text(text)
+
+    assert chunks == [
+        "Абзац номер 0 текста.\nАбзац номер 1 текста.\nАбзац номер 2 текста.",
+        "Абзац номер 2 текста.\nАбзац номер 3 текста.\nАбзац номер 4 текста.",
+        "Абзац номер 4 текста.\nАбзац номер 5 текста.",
+    ]
+
+
+def test_oversized_block_is_split():
+    long_paragraph = " ".join(["Фурье."] * 50)
+    chunks = make_parser(chunk_size=20).split_text(long_paragraph)
+
+    assert len(chunks) > 1
+    assert all(len(chunk.split()) <= 20 for chunk in chunks)
+
+
+def test_find_chunk_span_tolerates_changed_whitespace():
+    text = "Ряд  Фурье\tраскладывает   сигнал.\nКонец."
+
+    assert find_chunk_span(text, "Фурье\tраскладывает", 0, len(text)) == (5, 23)
+    assert find_chunk_span(text, "Фурье раскладывает сигнал.", 0, len(text)) == (
+        5,
+        33,
+    )
+    assert find_chunk_span(text, "Фурье раскладывает", 6, len(text)) is None
+
+
+def test_oversized_block_spans_follow_collapsed_whitespace(monkeypatch):
+    words = [f"слово{i}" for i in range(60)]
+    text = "\t".join(words[:20]) + "    " + "   ".join(words[20:])
+
+    def split_text(self, text):
+        # Splitter collapsing whitespace runs to single spaces
+        tokens = text.split()
+        return [" ".join(tokens[i : i + 20]) for i in range(0, len(tokens), 15)]
+
+    monkeypatch.setattr(SentenceSplitter, "split_text", split_text)
+    parser = make_parser(chunk_size=20, chunk_overlap=5)
+    nodes = parser.get_nodes_from_documents([Document(text=text)])
+
+    assert [node.text.split() for node in nodes] == [
+        words[i : i + 20] for i in range(0, 60, 15)
+    ]
+    for node in nodes:
+        assert text[node.start_char_idx : node.end_char_idx] == node.text
+
+
+def test_default_node_parser_is_the_previous_sentence_splitter():
+    defaults = {
+        name: Settings.model_fields[name].default
+        for name in ("NODE_PARSER", "CHUNK_SIZE", "CHUNK_OVERLAP")
+    }
+    node_parser = build_node_parser(get_settings().model_copy(update=defaults))
+
+    assert isinstance(node_parser, SentenceSplitter)
+    assert (node_parser.chunk_size, node_parser.chunk_overlap) == (600, 400)
@@ -0,0 +1,59 @@
+# KONSPECTO/backend/tests/test_parallel_embedding.py
+
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from llama_index.core.schema import TextNode
+
+from app.core.config import get_settings
+from app.services import parallel_embedding
+from app.services.parallel_embedding import (
+    ParallelEmbedding,
+    resolve_threads_per_worker,
+    shard,
+)
+
+
+class StubWorkerModel:
+    def get_text_embedding_batch(self, texts):
+        # Earlier shards finish last, so completion order differs from input order
+        time.sleep(0.05 if texts[0] == "node 0" else 0)
+        return [[float(text.split()[1])] for text in texts]
+
+
+def test_shard_preserves_order():
+    items = list(range(10))
+    shards = shard(items, 4)
+
+    assert shards == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert [item for chunk in shards for item in chunk] == items
+
+
+def test_resolve_threads_per_worker():
+    assert resolve_threads_per_worker(4, 3) == 3
+    with patch("app.services.parallel_embedding.os.cpu_count", return_value=16):
+        assert resolve_threads_per_worker(4, 0) == 4
+        assert resolve_threads_per_worker(32, 0) == 1
+
+
+def test_parallel_embedding_preserves_node_order(monkeypatch):
+    settings = get_settings().model_copy(
+        update={"EMBEDDING_NUM_WORKERS": 3, "EMBEDDING_SHARD_SIZE": 2}
+    )
+    embedding = ParallelEmbedding(settings)
+    executor = ThreadPoolExecutor(max_workers=3)
+    monkeypatch.setattr(parallel_embedding, "_worker_embed_model", StubWorkerModel())
+    monkeypatch.setattr(ParallelEmbedding, "_get_executor", lambda self: executor)
+    nodes = [TextNode(text=f"node {i}", id_=f"node-{i}") for i in range(5)]
+
+    result = embedding(nodes)
+
+    assert [node.node_id for node in result] == [f"node-{i}" for i in range(5)]
+    assert [node.embedding for node in result] == [[float(i)] for i in range(5)]
+
+    embedding._executor = executor
+    embedding.close()
+    assert embedding._executor is None
+    assert executor._shutdown
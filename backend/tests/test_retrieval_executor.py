@@ -0,0 +1,43 @@
+# KONSPECTO/backend/tests/test_retrieval_executor.py
+
+import asyncio
+import threading
+
+import pytest
+
+from app.exceptions import SearchOverloadedError
+from app.services.retrieval_executor import RetrievalExecutor
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result():
+    executor = RetrievalExecutor(max_concurrency=2, max_queue_depth=0)
+
+    result = await executor.run(lambda x, y=0: x + y, 1, y=2)
+
+    assert result == 3
+    assert executor.get_stats()["completed"] == 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_rejects_when_queue_is_full():
+    executor = RetrievalExecutor(max_concurrency=1, max_queue_depth=1)
+    release = threading.Event()
+
+    running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(SearchOverloadedError) as exc_info:
+        await executor.run(release.wait)
+    assert exc_info.value.status_code == 503
+
+    stats = executor.get_stats()
+    assert stats["active"] == 1
+    assert stats["queued"] == 1
+    assert stats["rejected"] == 1
+
+    release.set()
+    await asyncio.gather(*running)
+    assert executor.get_stats()["completed"] == 2
+    executor.shutdown()
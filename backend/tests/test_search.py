@@ -1,9 +1,13 @@
 # KONSPECTO/backend/tests/test_search.py
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from llama_index.core.vector_stores import FilterOperator
+
+from app.models.search import SearchFilters
+
 
 @pytest.mark.asyncio
 async def test_search(async_client):
@@ -27,3 +31,235 @@ async def test_search_invalid_payload(async_client):
     assert response.status_code == 422
     data = response.json()
     assert "detail" in data
+
+
+@pytest.mark.asyncio
+async def test_search_passes_parameters(async_client):
+    with patch(
+        "app.api.v1.endpoints.search.SearchService.process_search"
+    ) as mock_process_search:
+        mock_process_search.return_value = []
+
+        response = await async_client.post(
+            "/api/v1/search/",
+            json={
+                "query": "тестовый запрос",
+                "top_k": 5,
+                "score_threshold": 0.5,
+                "filters": {"file_name": "lecture.docx"},
+            },
+        )
+        assert response.status_code == 200
+        mock_process_search.assert_called_once_with(
+            "тестовый запрос",
+            top_k=5,
+            score_threshold=0.5,
+            filters=SearchFilters(file_name="lecture.docx"),
+            mode="vector",
+        )
+
+
+@pytest.mark.asyncio
+async def test_search_rejects_unknown_filters(async_client):
+    response = await async_client.post(
+        "/api/v1/search/",
+        json={"query": "тест", "filters": {"author": "Иванов"}},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_search_rejects_inverted_date_range(async_client):
+    response = await async_client.post(
+        "/api/v1/search/",
+        json={
+            "query": "тест",
+            "filters": {
+                "modified_after": "2025-01-01T00:00:00Z",
+                "modified_before": "2024-01-01T00:00:00Z",
+            },
+        },
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_search_invalid_top_k(async_client):
+    response = await async_client.post(
+        "/api/v1/search/", json={"query": "тест", "top_k": 0}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_batch_search(async_client):
+    with patch(
+        "app.api.v1.endpoints.search.SearchService.process_batch_search"
+    ) as mock_process_batch_search:
+        mock_process_batch_search.return_value = [
+            {"query": "ряд Фурье", "results": []},
+            {"query": "свёртка", "results": []},
+        ]
+
+        response = await async_client.post(
+            "/api/v1/search/batch",
+            json={"queries": ["ряд Фурье", "свёртка"], "top_k": 3},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["query"] for item in data["results"]] == ["ряд Фурье", "свёртка"]
+        mock_process_batch_search.assert_called_once_with(
+            ["ряд Фурье", "свёртка"],
+            top_k=3,
+            score_threshold=None,
+            filters=None,
+            mode="vector",
+        )
+
+
+@pytest.mark.asyncio
+async def test_batch_search_requires_queries(async_client):
+    response = await async_client.post("/api/v1/search/batch", json={"queries": []})
+    assert response.status_code == 422
+
+
+def test_process_batch_search_embeds_queries_once():
+    from app.api.v1.endpoints.search import SearchService
+
+    retriever = MagicMock()
+    retriever.retrieve.return_value = []
+    with patch(
+        "app.api.v1.endpoints.search.get_search_cache", return_value=None
+    ), patch(
+        "app.api.v1.endpoints.search.get_query_embeddings",
+        return_value=[[0.1], [0.2]],
+    ) as mock_get_query_embeddings, patch(
+        "app.api.v1.endpoints.search.get_retriever", return_value=retriever
+    ):
+        results = SearchService.process_batch_search(["ряд Фурье", "свёртка"])
+
+    mock_get_query_embeddings.assert_called_once_with(["ряд Фурье", "свёртка"])
+    bundles = [call.args[0] for call in retriever.retrieve.call_args_list]
+    assert sorted(bundle.embedding[0] for bundle in bundles) == [0.1, 0.2]
+    assert [result.query for result in results] == ["ряд Фурье", "свёртка"]
+
+
+def test_process_search_pushes_filters_down():
+    from app.api.v1.endpoints.search import SearchService
+
+    retriever = MagicMock()
+    retriever.retrieve.return_value = []
+    filters = SearchFilters(
+        file_name=["lecture_1.docx", "lecture_2.docx"],
+        modified_after="2024-09-01T00:00:00Z",
+    )
+    with patch(
+        "app.api.v1.endpoints.search.get_search_cache", return_value=None
+    ), patch(
+        "app.api.v1.endpoints.search.get_retriever", return_value=retriever
+    ) as mock_get_retriever:
+        SearchService.process_search("ряд Фурье", top_k=3, filters=filters)
+
+    metadata_filters = mock_get_retriever.call_args.kwargs["filters"].filters
+    assert [(f.key, f.operator, f.value) for f in metadata_filters] == [
+        ("file_name", FilterOperator.IN, ["lecture_1.docx", "lecture_2.docx"]),
+        ("modified_at_ts", FilterOperator.GTE, 1725148800.0),
+    ]
+
+
+def test_process_search_applies_threshold_before_fusion_in_hybrid_mode():
+    from llama_index.core.schema import NodeWithScore, TextNode
+
+    from app.api.v1.endpoints.search import SearchService
+
+    node = TextNode(
+        text="Ряд Фурье",
+        start_char_idx=0,
+        end_char_idx=9,
+        metadata={
+            "file_id": "1",
+            "file_name": "lecture_1.docx",
+            "modified_at": "2024-09-01T00:00:00Z",
+        },
+    )
+    retriever = MagicMock()
+    # Оценка RRF не сравнима с косинусным порогом
+    retriever.retrieve.return_value = [NodeWithScore(node=node, score=2 / 61)]
+    with patch(
+        "app.api.v1.endpoints.search.get_search_cache", return_value=None
+    ), patch(
+        "app.api.v1.endpoints.search.get_retriever", return_value=retriever
+    ) as mock_get_retriever:
+        results = SearchService.process_search(
+            "ряд Фурье", score_threshold=0.8, mode="hybrid"
+        )
+
+    assert mock_get_retriever.call_args.kwargs["score_threshold"] == 0.8
+    assert [result.text for result in results] == ["Ряд Фурье"]
+
+
+@pytest.mark.parametrize("replica_generation,cached", [(4, False), (5, True)])
+def test_process_search_does_not_cache_results_of_a_lagging_replica(
+    replica_generation, cached
+):
+    from app.api.v1.endpoints.search import SearchService
+    from app.services.local_replica import LocalReplicaRetriever
+
+    replica = MagicMock()
+    replica.generation = replica_generation
+    replica.search.return_value = []
+    retriever = LocalReplicaRetriever(replica, embed_model=MagicMock())
+    cache = MagicMock()
+    cache.get.return_value = None
+    with patch(
+        "app.api.v1.endpoints.search.get_search_cache", return_value=cache
+    ), patch("app.api.v1.endpoints.search.IndexManager") as mock_index_manager, patch(
+        "app.api.v1.endpoints.search.get_retriever", return_value=retriever
+    ), patch(
+        "app.api.v1.endpoints.search.get_query_embeddings", return_value=[[0.1]]
+    ):
+        mock_index_manager.return_value.get_generation.return_value = 5
+        SearchService.process_search("ряд Фурье", top_k=3)
+        SearchService.process_batch_search(["свёртка"], top_k=3)
+
+    assert cache.put.call_count == (2 if cached else 0)
+
+
+def test_process_search_fills_top_k_after_dropping_and_merging():
+    from llama_index.core.schema import NodeWithScore, TextNode
+
+    from app.api.v1.endpoints.search import SearchService
+
+    def make_node(file_id, start, metadata=True):
+        return TextNode(
+            text=f"{file_id}:{start}".ljust(10, "."),
+            start_char_idx=start,
+            end_char_idx=start + 10,
+            metadata=(
+                {
+                    "file_id": file_id,
+                    "file_name": f"{file_id}.docx",
+                    "modified_at": "2024-09-01T00:00:00Z",
+                }
+                if metadata
+                else {}
+            ),
+        )
+
+    retriever = MagicMock()
+    retriever.retrieve.return_value = [
+        NodeWithScore(node=make_node("a", 0), score=0.9),
+        NodeWithScore(node=make_node("a", 5), score=0.8),
+        NodeWithScore(node=make_node("b", 0, metadata=False), score=0.7),
+        NodeWithScore(node=make_node("c", 0), score=0.6),
+        NodeWithScore(node=make_node("d", 0), score=0.5),
+    ]
+    with patch(
+        "app.api.v1.endpoints.search.get_search_cache", return_value=None
+    ), patch(
+        "app.api.v1.endpoints.search.get_retriever", return_value=retriever
+    ) as mock_get_retriever:
+        results = SearchService.process_search("ряд Фурье", top_k=2)
+
+    assert mock_get_retriever.call_args.kwargs["similarity_top_k"] == 6
+    assert [result.file_id for result in results] == ["a", "c"]
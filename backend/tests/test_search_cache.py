@@ -0,0 +1,43 @@
+# KONSPECTO/backend/tests/test_search_cache.py
+
+from app.services.search_cache import SearchResultCache
+
+
+def test_cache_hit_with_normalized_query():
+    cache = SearchResultCache(max_size=8)
+    key = cache.make_key("Ряд  Фурье", 1, top_k=3, mode="vector")
+    cache.put(key, 1, ["result"])
+
+    same_key = cache.make_key(" Ряд Фурье ", 1, top_k=3, mode="vector")
+    other_key = cache.make_key("Ряд Фурье", 1, top_k=5, mode="vector")
+
+    assert cache.get(same_key, 1) == ["result"]
+    assert cache.get(other_key, 1) is None
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_new_generation_invalidates_entries():
+    cache = SearchResultCache(max_size=8)
+    key = cache.make_key("свёртка", 1)
+    cache.put(key, 1, ["old"])
+
+    assert cache.get(cache.make_key("свёртка", 2), 2) is None
+    assert cache.get(key, 2) is None
+    assert cache.get_stats()["invalidations"] == 1
+
+    # Results computed before the index changed are not stored
+    cache.put(key, 1, ["stale"])
+    assert cache.get_stats()["size"] == 0
+
+
+def test_lru_eviction():
+    cache = SearchResultCache(max_size=2)
+    keys = [cache.make_key(query, 1) for query in ("а", "б", "в")]
+    cache.put(keys[0], 1, [0])
+    cache.put(keys[1], 1, [1])
+    cache.get(keys[0], 1)
+    cache.put(keys[2], 1, [2])
+
+    assert cache.get(keys[0], 1) == [0]
+    assert cache.get(keys[1], 1) is None
+    assert cache.get(keys[2], 1) == [2]
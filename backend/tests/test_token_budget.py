@@ -0,0 +1,84 @@
+# KONSPECTO/backend/tests/test_token_budget.py
+
+import pytest
+
+from langchain.tools import Tool
+from langchain_core.agents import AgentAction
+from langchain_core.language_models import FakeListLLM
+from langchain_core.outputs import Generation, LLMResult
+
+from agent.token_budget import (
+    OMITTED_OBSERVATION,
+    TRUNCATION_MARKER,
+    BudgetedZeroShotAgent,
+    TokenUsageHandler,
+    count_tokens,
+)
+
+
+def make_agent(max_observation_tokens, max_scratchpad_tokens):
+    tool = Tool(name="RAGSearch", func=lambda query: query, description="Search.")
+    return BudgetedZeroShotAgent.from_llm_and_tools(
+        FakeListLLM(responses=[]),
+        [tool],
+        max_observation_tokens=max_observation_tokens,
+        max_scratchpad_tokens=max_scratchpad_tokens,
+    )
+
+
+def make_step(term, observation):
+    log = f"Thought: search {term}\nAction: RAGSearch\nAction Input: {term}"
+    return AgentAction("RAGSearch", term, log), observation
+
+
+def test_long_observation_is_truncated_the_same_way_every_iteration():
+    agent = make_agent(max_observation_tokens=20, max_scratchpad_tokens=10000)
+    long_observation = "свёртка - операция над функциями. " * 50
+    steps = [make_step("свёртка", long_observation)]
+
+    first = agent._construct_scratchpad(steps)
+    second = agent._construct_scratchpad(steps + [make_step("ряд", "ряд Фурье")])
+
+    assert TRUNCATION_MARKER in first
+    assert second.startswith(first)
+    observation = first.split("Observation: ")[1].split("\nThought:")[0]
+    assert count_tokens(observation.replace(TRUNCATION_MARKER, "")) <= 20
+
+
+def test_oldest_observations_are_omitted_to_fit_the_budget():
+    agent = make_agent(max_observation_tokens=200, max_scratchpad_tokens=250)
+    steps = [
+        make_step(term, f"{term} - " + "определение термина. " * 20)
+        for term in ("свёртка", "ряд Фурье", "градиентный спуск")
+    ]
+
+    scratchpad = agent._construct_scratchpad(steps)
+
+    assert scratchpad.count(OMITTED_OBSERVATION) == 2
+    assert "градиентный спуск - определение" in scratchpad
+    assert "Action Input: свёртка" in scratchpad
+
+
+@pytest.mark.asyncio
+async def test_usage_prefers_server_token_counts():
+    usage = TokenUsageHandler()
+
+    await usage.on_llm_start({}, ["Question: что такое свёртка?"], run_id="a")
+    await usage.on_llm_end(
+        LLMResult(
+            generations=[[Generation(text="Final Answer: ...")]],
+            llm_output={"token_usage": {"prompt_tokens": 500, "completion_tokens": 40}},
+        ),
+        run_id="a",
+    )
+    await usage.on_llm_start({}, ["Question: что такое свёртка?"], run_id="b")
+    await usage.on_llm_end(
+        LLMResult(generations=[[Generation(text="Final Answer: свёртка")]]),
+        run_id="b",
+    )
+
+    assert usage.as_dict() == {
+        "llm_calls": 2,
+        "prompt_tokens": 500 + count_tokens("Question: что такое свёртка?"),
+        "completion_tokens": 40 + count_tokens("Final Answer: свёртка"),
+    }
@@ -0,0 +1,85 @@
+# KONSPECTO/backend/tests/test_tool_memo.py
+
+import fakeredis
+import pytest
+
+from agent.tool_memo import ToolObservationCache, request_scope
+from app.services.index_sync import IndexGeneration
+
+
+def make_search(observations):
+    calls = []
+
+    async def search(query):
+        calls.append(query)
+        if isinstance(observations, Exception):
+            raise observations
+        return observations
+
+    return search, calls
+
+
+@pytest.mark.asyncio
+async def test_repeated_call_within_run_is_memoized():
+    memo = ToolObservationCache()
+    search, calls = make_search("свёртка - операция над функциями")
+
+    with request_scope():
+        first = await memo.call("RAGSearch", "свёртка", lambda: search("свёртка"))
+        second = await memo.call("RAGSearch", " свёртка ", lambda: search("свёртка"))
+        other_tool = await memo.call("RAGMultiSearch", "свёртка", lambda: search("x"))
+
+    assert first == second == other_tool
+    assert calls == ["свёртка", "x"]
+    stats = memo.get_stats()
+    assert stats["calls"] == 3
+    assert stats["request_hits"] == 1
+    assert stats["short_circuited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_runs_do_not_share_observations_without_redis():
+    memo = ToolObservationCache()
+    search, calls = make_search("свёртка")
+
+    for _ in range(2):
+        with request_scope():
+            await memo.call("RAGSearch", "свёртка", lambda: search("свёртка"))
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_calls_are_not_memoized():
+    memo = ToolObservationCache()
+    search, calls = make_search(TimeoutError())
+
+    with request_scope():
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                await memo.call("RAGSearch", "свёртка", lambda: search("свёртка"))
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_observations_are_keyed_by_generation():
+    redis_client = fakeredis.FakeRedis()
+    memo = ToolObservationCache(redis_client, ttl=60)
+    search, calls = make_search("свёртка - операция над функциями")
+
+    for _ in range(2):
+        with request_scope():
+            observation = await memo.call(
+                "RAGSearch", "свёртка", lambda: search("свёртка"), shared=True
+            )
+
+    assert observation == "свёртка - операция над функциями"
+    assert len(calls) == 1
+    assert memo.get_stats()["shared_hits"] == 1
+    (key,) = redis_client.keys(f"{ToolObservationCache.KEY_PREFIX}:*")
+    assert 0 < redis_client.ttl(key) <= 60
+
+    IndexGeneration(redis_client).bump()
+    await memo.call("RAGSearch", "свёртка", lambda: search("свёртка"), shared=True)
+    assert len(calls) == 2
@@ -0,0 +1,84 @@
+# KONSPECTO/backend/tests/test_vector_db.py
+
+from unittest.mock import MagicMock
+
+import fakeredis
+import numpy as np
+import pytest
+
+from llama_index.core.schema import TextNode
+from llama_index.core.vector_stores.types import VectorStoreQuery
+
+from redisvl.redis.connection import RedisConnectionFactory
+
+from app.core.config import get_settings
+from app.services.vector_db import (
+    IndexManager,
+    TypedRedisVectorStore,
+    build_index_schema,
+)
+
+DIMS = 8
+
+
+def make_store(monkeypatch, datatype):
+    # fakeredis has no RediSearch: skip the module check and the index creation
+    monkeypatch.setattr(
+        RedisConnectionFactory, "validate_sync_redis", lambda *args, **kwargs: None
+    )
+    monkeypatch.setattr(TypedRedisVectorStore, "create_index", lambda self: None)
+    settings = get_settings().model_copy(
+        update={"EMBEDDING_DIMENSION": DIMS, "VECTOR_DATATYPE": datatype}
+    )
+    redis_client = fakeredis.FakeRedis()
+    store = TypedRedisVectorStore(
+        schema=build_index_schema(settings), redis_client=redis_client
+    )
+    return store, redis_client
+
+
+@pytest.mark.parametrize("datatype, itemsize", [("float32", 4), ("float16", 2)])
+def test_vectors_are_written_in_the_schema_datatype(monkeypatch, datatype, itemsize):
+    store, redis_client = make_store(monkeypatch, datatype)
+    embedding = np.linspace(-1, 1, DIMS).tolist()
+
+    store.add([TextNode(id_="n1", text="свёртка", embedding=embedding)])
+
+    raw = redis_client.hget("doc:n1", "vector")
+    assert len(raw) == itemsize * DIMS
+    np.testing.assert_allclose(np.frombuffer(raw, dtype=datatype), embedding, atol=1e-3)
+
+
+def test_queries_are_built_in_the_schema_datatype(monkeypatch):
+    store, _ = make_store(monkeypatch, "float16")
+
+    redis_query = store._to_redis_query(
+        VectorStoreQuery(query_embedding=[0.5] * DIMS, similarity_top_k=3)
+    )
+
+    assert len(redis_query.params["vector"]) == 2 * DIMS
+
+
+def test_shutdown_stops_the_query_embedding_batcher():
+    settings = get_settings().model_copy(
+        update={
+            "QUERY_EMBEDDING_MAX_BATCH_SIZE": 8,
+            "QUERY_EMBEDDING_CACHE_ENABLED": False,
+        }
+    )
+    embed_model = MagicMock()
+    embed_model.model_name = "test-model"
+    embed_model.embed_batch_size = 16
+    embed_model.get_query_embedding_batch.return_value = [[1.0]]
+    # A fresh manager rather than the process-wide singleton
+    index_manager = object.__new__(IndexManager)
+    index_manager.__init__()
+    query_embed_model = index_manager._build_query_embed_model(settings, embed_model)
+
+    assert query_embed_model.get_query_embedding("свёртка") == [1.0]
+    batching_thread = query_embed_model._thread
+    assert batching_thread.is_alive()
+
+    index_manager.shutdown()
+
+    assert not batching_thread.is_alive()